@@ -11,6 +11,8 @@ import undetected_chromedriver as uc
 from dotenv import load_dotenv
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
+from scrapy_project.job_store import JobStore
+from scrapy_project.sheets_sync import SheetsSync, open_worksheet, sheet_record
 
 load_dotenv()
 
@@ -19,6 +21,7 @@ class JobAutoApplier:
         self.max_applications_per_day = int(os.getenv('MAX_APPLICATIONS_PER_DAY', '10'))
         self.applications_today = 0
         self.email = os.getenv('EMAIL_ADDRESS')
+        self.store = JobStore()
         self.setup_google_sheets()
         
     def setup_google_sheets(self):
@@ -35,34 +38,14 @@ class JobAutoApplier:
             self.client = None
     
     def get_jobs_to_apply(self):
-        """Get jobs eligible for auto-application from Google Sheets"""
-        if not self.client:
-            return []
-        
+        """Get jobs eligible for auto-application from the local job store"""
         try:
-            sheet = self.client.open_by_key(self.sheet_id)
-            worksheet = sheet.worksheet("Job Pipeline")
-            
-            # Get all records
-            records = worksheet.get_all_records()
-            
-            # Filter for auto-apply eligible jobs
-            eligible_jobs = []
-            for i, record in enumerate(records, start=2):  # Start at row 2 (after header)
-                if (record.get('Auto Apply Eligible') == 'Yes' and
-                    record.get('Application Status') == 'Not Applied' and
-                    record.get('Priority Score', 0) >= 25):
-                    
-                    record['row_number'] = i
-                    eligible_jobs.append(record)
-            
-            # Sort by priority score
-            eligible_jobs.sort(key=lambda x: x.get('Priority Score', 0), reverse=True)
-            
-            return eligible_jobs[:self.max_applications_per_day - self.applications_today]
+            # Indexed query, highest priority first
+            limit = self.max_applications_per_day - self.applications_today
+            return [sheet_record(job) for job in self.store.jobs_to_apply(25, max(limit, 0))]
             
         except Exception as e:
-            print(f"Error getting jobs from sheets: {e}")
+            print(f"Error getting jobs from the job store: {e}")
             return []
     
     def apply_to_indeed_job(self, job):
@@ -265,26 +248,23 @@ Best regards,
             return False
     
     def update_application_status(self, job, status, notes=""):
-        """Update job application status in Google Sheets"""
-        if not self.client:
+        """Record an application outcome in the job store; sync_sheet sends it to Google Sheets"""
+        applied_date = datetime.now().strftime("%Y-%m-%d")
+        next_action = 'Follow up in 1 week' if status == 'Auto Applied' else None
+        self.store.update_status(job['unique_id'], status, notes, applied_date, next_action)
+    
+    def sync_sheet(self):
+        """Send the changed cells of every job updated this session in one batch"""
+        if not self.client or not self.sheet_id:
             return
         
         try:
-            sheet = self.client.open_by_key(self.sheet_id)
-            worksheet = sheet.worksheet("Job Pipeline")
-            
-            row = job['row_number']
-            
-            # Update status and notes
-            worksheet.update(f'R{row}', status)  # Application Status column
-            worksheet.update(f'S{row}', notes)  # Notes column
-            worksheet.update(f'W{row}', datetime.now().strftime("%Y-%m-%d"))  # Applied Date column
-            
-            if status == 'Auto Applied':
-                worksheet.update(f'Y{row}', 'Follow up in 1 week')  # Next Action
-                
+            sync = SheetsSync(self.store, open_worksheet(self.client, self.sheet_id))
+            sync.push()
+            print(f"📊 Updated {sync.cells_updated} cells for {sync.rows_updated} jobs in Google Sheets")
         except Exception as e:
-            print(f"Error updating application status: {e}")
+            # Unsent changes stay unsynced in the job store for the next sync
+            print(f"Error syncing Google Sheets: {e}")
     
     def run_auto_applications(self):
         """Run auto-application process"""
@@ -334,6 +314,7 @@ Best regards,
                 print(f"❌ Error processing job: {e}")
                 self.update_application_status(job, 'Auto Apply Error', str(e))
         
+        self.sync_sheet()
         print(f"\nAuto-application session complete. Applied to {self.applications_today} jobs today.")
 
 def run_daily_auto_apply():
@@ -1,92 +1,94 @@
 import os
-import subprocess
+import sys
 import schedule
 import time
 from datetime import datetime
 import json
 from dotenv import load_dotenv
+from twisted.internet import defer
+from scrapy.crawler import Crawler, CrawlerProcess
+from scrapy.utils.project import get_project_settings
+from scrapy.utils.reactor import install_reactor
 
 load_dotenv()
 
+# Spiders run in every session, with the politeness limits each one crawls under
+SPIDERS = {
+    'indeed': ('indeed_jobs', {'DOWNLOAD_DELAY': 3, 'CONCURRENT_REQUESTS': 2}),
+    'company': ('company_spider', {}),
+    'linkedin': ('linkedin_jobs', {'DOWNLOAD_DELAY': 8, 'CONCURRENT_REQUESTS': 1}),
+}
+
 class JobScrapingOrchestrator:
-    def __init__(self):
+    """Run every enabled spider of a session concurrently in this process's reactor.
+
+    The spiders hit different domains, so a session takes about as long as its
+    slowest spider. Each crawler keeps its own DOWNLOAD_DELAY and per-domain
+    concurrency, and the pipelines share one seen-ID store, job store and set of
+    indexes across crawlers.
+    """
+
+    def __init__(self, process=None):
         self.scraped_today = 0
         self.max_daily_scraping = 3  # Max scraping sessions per day
-        
-    def run_indeed_scraper(self):
-        """Run Indeed spider"""
-        print(f"🕷️  Starting Indeed scraper at {datetime.now()}")
-        
-        try:
-            result = subprocess.run([
-                'scrapy', 'crawl', 'indeed_jobs',
-                '-s', 'DOWNLOAD_DELAY=3',
-                '-s', 'CONCURRENT_REQUESTS=2'
-            ], cwd='scrapy_project', capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                print("✅ Indeed scraping completed successfully")
-                return True
-            else:
-                print(f"❌ Indeed scraping failed: {result.stderr}")
-                return False
-                
-        except Exception as e:
-            print(f"❌ Indeed scraper error: {e}")
-            return False
-    
-    def run_linkedin_scraper(self):
-        """Run LinkedIn spider (HIGH RISK - disabled by default)"""
+        if process is None:
+            settings = get_project_settings()
+            # Every crawler checks that it runs in the configured reactor, so install
+            # that one before anything imports Twisted's default
+            if settings.get('TWISTED_REACTOR') and 'twisted.internet.reactor' not in sys.modules:
+                install_reactor(settings['TWISTED_REACTOR'], settings.get('ASYNCIO_EVENT_LOOP'))
+            process = CrawlerProcess(settings)
+        self.process = process
+        self.session = None  # Deferred of the session in progress
+
+    def enabled_spiders(self):
+        """Keys of SPIDERS to run this session"""
+        spiders = ['indeed', 'company']
         linkedin_enabled = os.getenv('ENABLE_LINKEDIN_SCRAPING', 'false').lower() == 'true'
-        
         if not linkedin_enabled:
             print("⚠️  LinkedIn scraping disabled (set ENABLE_LINKEDIN_SCRAPING=true to enable)")
-            print("⚠️  WARNING: LinkedIn scraping has very high risk of account suspension!")
-            return False
-        
-        print(f"🕷️  Starting LinkedIn scraper at {datetime.now()}")
-        print("⚠️  HIGH RISK: LinkedIn may suspend your account!")
-        
+        elif self.scraped_today < 1:  # Only once per day max
+            print("⚠️  HIGH RISK: LinkedIn may suspend your account!")
+            spiders.append('linkedin')
+        return spiders
+
+    def start_spider(self, key):
+        """Start one spider; returns a Deferred firing with (key, succeeded, items scraped)"""
+        name, overrides = SPIDERS[key]
+        settings = self.process.settings.copy()
+        settings.setdict(overrides, priority='cmdline')
+        print(f"🕷️  Starting {key} scraper at {datetime.now()}")
         try:
-            result = subprocess.run([
-                'scrapy', 'crawl', 'linkedin_jobs',
-                '-s', 'DOWNLOAD_DELAY=8',
-                '-s', 'CONCURRENT_REQUESTS=1'
-            ], cwd='scrapy_project', capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                print("✅ LinkedIn scraping completed")
-                return True
-            else:
-                print(f"❌ LinkedIn scraping failed: {result.stderr}")
-                return False
-                
+            crawler = Crawler(self.process.spider_loader.load(name), settings)
+            d = self.process.crawl(crawler)
         except Exception as e:
-            print(f"❌ LinkedIn scraper error: {e}")
-            return False
-    
-    def run_company_scraper(self):
-        """Run company website scraper"""
-        print(f"🕷️  Starting company website scraper at {datetime.now()}")
-        
-        # Add company URLs to scrape
-        company_urls = [
-            "https://careers.google.com/jobs/results/",
-            "https://www.amazon.jobs/en/search.json?base_query=engineer",
-            "https://jobs.netflix.com/search?q=engineer",
-            "https://careers.microsoft.com/professionals/us/en/search-results"
-        ]
-        
-        # This would need a separate spider implementation
-        # For now, return True as placeholder
-        print("🏢 Company scraper placeholder - implement company_spider.py")
-        return True
-    
+            print(f"❌ {key} scraper error: {e}")
+            return defer.succeed((key, False, 0))
+
+        def finished(_):
+            stats = crawler.stats.get_stats()
+            items = stats.get('item_scraped_count', 0)
+            if stats.get('finish_reason') == 'finished':
+                print(f"✅ {key} scraping completed: {items} jobs in "
+                      f"{stats.get('elapsed_time_seconds', 0):.0f}s")
+                return key, True, items
+            print(f"❌ {key} scraping stopped: {stats.get('finish_reason')}")
+            return key, False, items
+
+        def failed(failure):
+            print(f"❌ {key} scraper error: {failure.getErrorMessage()}")
+            return key, False, 0
+
+        return d.addCallbacks(finished, failed)
+
     def run_daily_scraping(self):
-        """Run daily scraping routine"""
+        """Run a scraping session; returns a Deferred firing when every spider is done"""
         if self.scraped_today >= self.max_daily_scraping:
             print(f"📊 Daily scraping limit reached ({self.scraped_today}/{self.max_daily_scraping})")
-            return
+            return defer.succeed(None)
+        if self.session is not None:
+            print("⏳ Previous scraping session still running, skipping this one")
+            return defer.succeed(None)
         
         print(f"\n🚀 Starting scraping session {self.scraped_today + 1}/{self.max_daily_scraping}")
         print(f"⏰ Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -98,32 +100,29 @@ class JobScrapingOrchestrator:
             'success_count': 0,
             'total_jobs': 0
         }
-        
-        # Run Indeed scraper (safest)
-        if self.run_indeed_scraper():
-            results['scrapers_run'].append('indeed')
-            results['success_count'] += 1
-        
-        # Run company scraper
-        if self.run_company_scraper():
-            results['scrapers_run'].append('company')
-            results['success_count'] += 1
-        
-        # Optionally run LinkedIn (very risky)
-        linkedin_enabled = os.getenv('ENABLE_LINKEDIN_SCRAPING', 'false').lower() == 'true'
-        if linkedin_enabled and self.scraped_today < 1:  # Only once per day max
-            if self.run_linkedin_scraper():
-                results['scrapers_run'].append('linkedin')
-                results['success_count'] += 1
-        
+        started = time.monotonic()
+        spiders = self.enabled_spiders()
         self.scraped_today += 1
         
-        # Save session results
-        self.save_session_results(results)
+        def finished(outcomes):
+            for _, (key, succeeded, items) in outcomes:
+                results['scrapers_run'].append(key)
+                results['success_count'] += int(succeeded)
+                results['total_jobs'] += items
+            results['duration_seconds'] = round(time.monotonic() - started, 1)
+            self.session = None
+            
+            # Save session results
+            self.save_session_results(results)
+            
+            print(f"📈 Scraping session complete in {results['duration_seconds']:.0f}s:")
+            print(f"   Scrapers run: {', '.join(results['scrapers_run'])}")
+            print(f"   Success rate: {results['success_count']}/{len(results['scrapers_run'])}")
+            print(f"   Jobs scraped: {results['total_jobs']}")
         
-        print(f"📈 Scraping session complete:")
-        print(f"   Scrapers run: {', '.join(results['scrapers_run'])}")
-        print(f"   Success rate: {results['success_count']}/{len(results['scrapers_run'])}")
+        # Every spider starts now and crawls alongside the others
+        self.session = defer.DeferredList([self.start_spider(key) for key in spiders])
+        return self.session.addCallback(finished)
     
     def save_session_results(self, results):
         """Save scraping session results"""
@@ -170,17 +169,19 @@ def main():
     print("🔄 Daily reset: 12:01 AM")
     print("⏹️  Press Ctrl+C to stop")
     
+    # Imported once the orchestrator has installed the reactor Scrapy is configured for
+    from twisted.internet import reactor, task
+    
     # Run immediate test if requested
     if os.getenv('RUN_IMMEDIATE_TEST', 'false').lower() == 'true':
         print("\n🧪 Running immediate test...")
-        orchestrator.run_daily_scraping()
+        reactor.callWhenRunning(orchestrator.run_daily_scraping)
     
-    try:
-        while True:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
-    except KeyboardInterrupt:
-        print("\n👋 Job Scraping Orchestrator stopped.")
+    # The spiders crawl in this process's reactor, so the schedule is checked from it too
+    task.LoopingCall(schedule.run_pending).start(60, now=False)  # Check every minute
+    # Runs until Ctrl+C, which lets running crawls finish cleanly (press twice to force)
+    orchestrator.process.start(stop_after_crawl=False)
+    print("\n👋 Job Scraping Orchestrator stopped.")
 
 if __name__ == "__main__":
     main()
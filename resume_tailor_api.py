@@ -9,6 +9,7 @@ import re
 import requests
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
+from scrapy_project.keyword_matcher import get_matcher
 
 load_dotenv()
 
@@ -97,58 +98,12 @@ class ResumeTailorer:
     
     def analyze_job_with_keywords(self, job_description):
         """Analyze job using keyword matching (free alternative)"""
-        text = job_description.lower()
-        
-        # Technical skills mapping
-        tech_skills_map = {
-            'Python': ['python', 'py', 'pandas', 'numpy', 'scipy'],
-            'SQL': ['sql', 'mysql', 'postgresql', 'database', 'queries'],
-            'AWS': ['aws', 'amazon web services', 's3', 'ec2', 'lambda'],
-            'Docker': ['docker', 'container', 'containerization'],
-            'Kubernetes': ['kubernetes', 'k8s', 'orchestration'],
-            'Machine Learning': ['machine learning', 'ml', 'ai', 'artificial intelligence'],
-            'TensorFlow': ['tensorflow', 'tf', 'keras'],
-            'PyTorch': ['pytorch', 'torch'],
-            'Apache Spark': ['spark', 'apache spark', 'pyspark'],
-            'Airflow': ['airflow', 'workflow', 'pipeline'],
-            'Git': ['git', 'github', 'version control', 'gitlab'],
-            'Linux': ['linux', 'unix', 'bash', 'shell'],
-            'Java': ['java', 'jvm', 'spring'],
-            'Scala': ['scala'],
-            'R': [' r ', 'r programming', 'rstudio'],
-            'Tableau': ['tableau', 'data visualization'],
-            'Power BI': ['power bi', 'powerbi'],
-            'Excel': ['excel', 'spreadsheet'],
-            'NoSQL': ['nosql', 'mongodb', 'cassandra'],
-            'Elasticsearch': ['elasticsearch', 'elk', 'kibana']
-        }
-        
-        # Soft skills mapping
-        soft_skills_map = {
-            'Communication': ['communication', 'collaborate', 'teamwork'],
-            'Leadership': ['leadership', 'lead', 'mentor', 'manage'],
-            'Problem Solving': ['problem solving', 'analytical', 'critical thinking'],
-            'Project Management': ['project management', 'agile', 'scrum']
-        }
-        
-        # Find technical skills
-        found_tech_skills = []
-        for skill, keywords in tech_skills_map.items():
-            if any(keyword in text for keyword in keywords):
-                found_tech_skills.append(skill)
-        
-        # Find soft skills
-        found_soft_skills = []
-        for skill, keywords in soft_skills_map.items():
-            if any(keyword in text for keyword in keywords):
-                found_soft_skills.append(skill)
-        
-        # Determine experience level
-        experience_level = 'mid'
-        if any(term in text for term in ['senior', 'lead', 'principal', '5+ years', '6+ years']):
-            experience_level = 'senior'
-        elif any(term in text for term in ['junior', 'entry', 'graduate', '0-2 years']):
-            experience_level = 'junior'
+        # One pass of the shared keyword matcher finds skills, synonyms and level phrases
+        matches = get_matcher().scan(job_description)
+        found_tech_skills = matches['skills']
+        found_soft_skills = matches['soft_skills']
+        experience_level = {'Senior': 'senior', 'Junior': 'junior'}.get(
+            get_matcher().experience_level(matches['levels']), 'mid')
         
         # Extract key requirements
         sentences = job_description.split('.')
@@ -5,6 +5,9 @@ import subprocess
 from dotenv import load_dotenv
 
 load_dotenv()
+# Crawls run from scrapy_project/, so a relative data directory must not be resolved there
+if os.getenv('JOB_DATA_DIR'):
+    os.environ['JOB_DATA_DIR'] = os.path.abspath(os.environ['JOB_DATA_DIR'])
 
 def show_menu():
     print("\n🤖 Job Scraper & Auto-Applier")
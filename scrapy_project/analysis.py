@@ -0,0 +1,85 @@
+"""
+Analyze-once view of a job posting.
+
+Spider heuristics (experience level, remote work, application complexity,
+auto-apply eligibility) and the auto-application pipeline all used to
+lowercase and scan the full description on their own. AnalyzedJob does the
+lowercasing, tokenizing, keyword matching and email extraction once per item;
+every heuristic reads from it.
+"""
+import re
+
+from scrapy_project.keyword_matcher import get_matcher, tokenize
+
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+
+
+def find_emails(text):
+    """Distinct email addresses in text, in order of appearance"""
+    if not text or '@' not in text:
+        return []
+    # Running the regex over the whole description backtracks on every word;
+    # only the few words holding an '@' can contain an address
+    found = []
+    for word in text.split():
+        if '@' in word:
+            found.extend(EMAIL_RE.findall(word))
+    return list(dict.fromkeys(found))
+
+
+class AnalyzedJob:
+    __slots__ = ('title', 'description', 'location', 'text', 'location_lower',
+                 'tokens', '_token_set', 'matches', 'title_matches', 'emails')
+
+    def __init__(self, title='', description='', location=''):
+        self.title = title or ''
+        self.description = description or ''
+        self.location = location or ''
+        self.text = self.description.lower()
+        self.location_lower = self.location.lower()
+        self.tokens = tokenize(self.text)
+        self._token_set = None
+
+        matcher = get_matcher()
+        self.matches = matcher.scan_tokens(self.tokens)
+        self.title_matches = matcher.scan(self.title)
+        self.emails = find_emails(self.description)
+
+    @classmethod
+    def from_item(cls, item):
+        return cls(item.get('title'), item.get('description'), item.get('location'))
+
+    @property
+    def token_set(self):
+        if self._token_set is None:
+            self._token_set = frozenset(self.tokens)
+        return self._token_set
+
+    def mentions(self, *phrases):
+        """True if the description contains any of the phrases as whole words"""
+        for phrase in phrases:
+            if ' ' in phrase:
+                if phrase in self.text:
+                    return True
+            elif phrase in self.token_set:
+                return True
+        return False
+
+    @property
+    def skills(self):
+        return self.matches['skills']
+
+    @property
+    def experience_level(self):
+        return get_matcher().experience_level(self.title_matches['levels'], self.matches['levels'])
+
+    @property
+    def contact_email(self):
+        return self.emails[0] if self.emails else ''
+
+    def apply_to(self, item):
+        """Copy the fields derived from the text onto an item"""
+        item['keywords'] = self.skills
+        item['experience_level'] = self.experience_level
+        item['contact_email'] = self.contact_email
+        item['email_found'] = bool(self.emails)
@@ -0,0 +1,180 @@
+"""
+Partitioned Parquet archive of every scraped job.
+
+Items are streamed into Parquet files laid out as
+archive/scrape_date=YYYY-MM-DD/source=<source>/part-<run>.parquet, one file
+per partition per crawl. Each partition buffers at most ROW_GROUP_SIZE compact
+JobRecords before writing them out as a row group, so memory stays bounded
+however long the crawl runs. Low-cardinality text columns (company, location,
+status...) are dictionary-encoded.
+
+The reader side scans months of history through pyarrow.dataset: partitions
+outside the requested dates and sources are never opened, only the requested
+columns are read, and other predicates are pushed down to the row-group
+statistics.
+"""
+import itertools
+import os
+import time
+from datetime import datetime
+from urllib.parse import quote
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from scrapy_project.job_store import BOOL_COLUMNS, ITEM_COLUMNS, JSON_COLUMNS
+from scrapy_project.paths import data_path
+from scrapy_project.records import JobRecord
+
+ROW_GROUP_SIZE = 1000
+PARTITION_COLUMNS = ('scrape_date', 'source')
+DICTIONARY_COLUMNS = ['company', 'location', 'job_type', 'salary_currency', 'salary_period', 'change_type',
+                      'experience_level', 'application_status', 'application_method', 'application_complexity']
+
+# Numbers the writers of this process, so concurrent crawls never share a file name
+_writer_ids = itertools.count(1)
+
+_ARROW_TYPES = {'TEXT': pa.string(), 'REAL': pa.float64(), 'INTEGER': pa.int64()}
+
+
+def arrow_type(name, sql_type):
+    """Arrow type of a job store column"""
+    if name in JSON_COLUMNS:
+        return pa.list_(pa.string())
+    if name in BOOL_COLUMNS:
+        return pa.bool_()
+    return _ARROW_TYPES[sql_type.split()[0]]
+
+
+# Columns stored in each file; source lives in the partition path instead
+FILE_SCHEMA = pa.schema([(name, arrow_type(name, sql_type)) for name, sql_type in ITEM_COLUMNS
+                         if name != 'source'])
+PARTITIONING = ds.partitioning(pa.schema([('scrape_date', pa.string()), ('source', pa.string())]),
+                               flavor='hive')
+ARCHIVE_SCHEMA = pa.schema(list(FILE_SCHEMA) + [pa.field(name, pa.string()) for name in PARTITION_COLUMNS])
+
+
+def archive_root():
+    return data_path('archive')
+
+
+def partition_key(record):
+    """(scrape_date, source) partition a record belongs to"""
+    scraped = record.get('scraped_date') or datetime.now().isoformat()
+    return str(scraped)[:10], record.get('source') or 'unknown'
+
+
+def coerce(name, value, schema=FILE_SCHEMA):
+    """A job store value as the Python value of its column in an Arrow schema"""
+    if value is None:
+        return None
+    if name in JSON_COLUMNS:
+        return [value] if isinstance(value, str) else [str(v) for v in value]
+    if name in BOOL_COLUMNS:
+        return bool(value)
+    field_type = schema.field(name).type
+    if field_type == pa.string():
+        return str(value)
+    try:
+        return int(value) if field_type == pa.int64() else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ArchiveWriter:
+    def __init__(self, root=None, row_group_size=ROW_GROUP_SIZE, run_id=None):
+        self.root = root or archive_root()
+        self.row_group_size = row_group_size
+        self.run_id = run_id or f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}_{next(_writer_ids)}"
+        self.buffers = {}
+        self.writers = {}
+        self.rows_written = 0
+        self.row_groups = 0
+        self.last_write_ms = 0.0
+
+    def add(self, record):
+        """Buffer one item; returns True when that completed and wrote a row group"""
+        key = partition_key(record)
+        buffer = self.buffers.setdefault(key, [])
+        buffer.append(JobRecord.from_item(record))
+        if len(buffer) >= self.row_group_size:
+            self.write(key)
+            return True
+        return False
+
+    def write(self, key):
+        """Write a partition's buffered rows as one row group"""
+        records = self.buffers.pop(key, None)
+        if not records:
+            return
+        rows = [{name: coerce(name, record.get(name)) for name in FILE_SCHEMA.names} for record in records]
+        started = time.perf_counter()
+        writer = self.writers.get(key)
+        if writer is None:
+            scrape_date, source = key
+            directory = os.path.join(self.root, f'scrape_date={scrape_date}', f'source={quote(source, safe="")}')
+            os.makedirs(directory, exist_ok=True)
+            writer = self.writers[key] = pq.ParquetWriter(
+                os.path.join(directory, f'part-{self.run_id}.parquet'), FILE_SCHEMA,
+                compression='zstd', use_dictionary=DICTIONARY_COLUMNS)
+        writer.write_table(pa.Table.from_pylist(rows, schema=FILE_SCHEMA), row_group_size=len(rows))
+        self.rows_written += len(rows)
+        self.row_groups += 1
+        self.last_write_ms = (time.perf_counter() - started) * 1000
+
+    def flush(self):
+        """Write every partially filled row group"""
+        for key in list(self.buffers):
+            self.write(key)
+
+    def close(self):
+        self.flush()
+        for writer in self.writers.values():
+            writer.close()
+        self.writers = {}
+
+
+def open_archive(root=None):
+    """pyarrow Dataset over the whole archive, or None if nothing has been archived yet"""
+    root = root or archive_root()
+    if not os.path.isdir(root) or not any(os.scandir(root)):
+        return None
+    return ds.dataset(root, schema=ARCHIVE_SCHEMA, format='parquet', partitioning=PARTITIONING)
+
+
+def archive_filter(start=None, end=None, sources=None, filters=None):
+    """Dataset expression for a scrape date range (inclusive ISO dates), sources and
+    extra [(column, op, value)] predicates, or None for no filter"""
+    conditions = []
+    if start:
+        conditions.append(ds.field('scrape_date') >= str(start)[:10])
+    if end:
+        conditions.append(ds.field('scrape_date') <= str(end)[:10])
+    if sources:
+        conditions.append(ds.field('source').isin(list(sources)))
+    if filters:
+        conditions.append(pq.filters_to_expression(filters))
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def scan_archive(columns=None, start=None, end=None, sources=None, filters=None, root=None,
+                 batch_size=ROW_GROUP_SIZE):
+    """Yield RecordBatches of the requested columns for archived jobs matching the filters"""
+    dataset = open_archive(root)
+    if dataset is None:
+        return
+    yield from dataset.to_batches(columns=columns, filter=archive_filter(start, end, sources, filters),
+                                  batch_size=batch_size)
+
+
+def read_archive(columns=None, start=None, end=None, sources=None, filters=None, root=None):
+    """Archived jobs matching the filters as a pandas DataFrame"""
+    dataset = open_archive(root)
+    if dataset is None:
+        schema = ARCHIVE_SCHEMA if columns is None else pa.schema([ARCHIVE_SCHEMA.field(c) for c in columns])
+        return schema.empty_table().to_pandas()
+    return dataset.to_table(columns=columns, filter=archive_filter(start, end, sources, filters)).to_pandas()
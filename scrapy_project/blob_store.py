@@ -0,0 +1,219 @@
+"""
+Content-addressed, compressed storage for description text.
+
+Descriptions are most of the bytes of every item, and reposts and postings of
+the same company repeat them word for word. Each distinct text is stored once
+in data/blobs.db under the SHA-256 of its content; items carry only that
+description_hash, and the job store, archive and exports stay small.
+
+Blobs are zstd-compressed with a dictionary trained on the first
+DICTIONARY_SAMPLES descriptions. Postings share so much boilerplate (benefits,
+equal-opportunity statements, "about us" paragraphs) that a dictionary
+compresses a single description several times better than zstd alone, which
+has too little text to learn from. Until the dictionary exists blobs are
+compressed without one; training recompresses them. Every blob records the
+dictionary it was written with, so retraining later never breaks old blobs.
+
+Training and recompression take seconds on a full sample, so they hold the
+lock only around database reads and writes; put(train=False) leaves training
+to the caller, which DescriptionBlobPipeline runs in a worker thread.
+
+Text is only decompressed when it is read, one blob at a time.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+
+import zstandard
+
+from scrapy_project.paths import data_path
+
+COMPRESSION_LEVEL = 9
+DICTIONARY_SIZE = 112 * 1024
+# Descriptions collected before the first dictionary is trained
+DICTIONARY_SAMPLES = 1000
+# Dictionary id of blobs compressed without one
+NO_DICTIONARY = 0
+
+
+class BlobStore:
+    def __init__(self, path=None, level=COMPRESSION_LEVEL, dictionary_samples=DICTIONARY_SAMPLES,
+                 dictionary_size=DICTIONARY_SIZE):
+        self.path = path or data_path('blobs.db')
+        self.level = level
+        self.dictionary_samples = dictionary_samples
+        self.dictionary_size = dictionary_size
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS blobs (
+                hash TEXT PRIMARY KEY,
+                dictionary INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                data BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS blobs_dictionary ON blobs (dictionary);
+            CREATE TABLE IF NOT EXISTS dictionaries (
+                id INTEGER PRIMARY KEY,
+                data BLOB NOT NULL,
+                samples INTEGER,
+                created_at REAL
+            );
+        ''')
+        self.conn.commit()
+        self._compressors = {}
+        self._decompressors = {}
+        row = self.conn.execute('SELECT MAX(id) FROM dictionaries').fetchone()
+        self.dictionary_id = row[0] or NO_DICTIONARY
+        self.untrained = 0 if self.dictionary_id else self.conn.execute(
+            'SELECT COUNT(*) FROM blobs WHERE dictionary = ?', (NO_DICTIONARY,)).fetchone()[0]
+        self.training = False
+        self.stored = 0
+        self.duplicates = 0
+        self.bytes_in = 0
+        self.bytes_stored = 0
+
+    def _dictionary(self, dictionary_id):
+        data = self.conn.execute('SELECT data FROM dictionaries WHERE id = ?', (dictionary_id,)).fetchone()
+        if data is None:
+            raise KeyError(f"Unknown compression dictionary {dictionary_id}")
+        return zstandard.ZstdCompressionDict(data[0])
+
+    def _compressor(self, dictionary_id):
+        compressor = self._compressors.get(dictionary_id)
+        if compressor is None:
+            dictionary = self._dictionary(dictionary_id) if dictionary_id else None
+            compressor = self._compressors[dictionary_id] = zstandard.ZstdCompressor(
+                level=self.level, dict_data=dictionary, write_checksum=True)
+        return compressor
+
+    def _decompressor(self, dictionary_id):
+        decompressor = self._decompressors.get(dictionary_id)
+        if decompressor is None:
+            dictionary = self._dictionary(dictionary_id) if dictionary_id else None
+            decompressor = self._decompressors[dictionary_id] = zstandard.ZstdDecompressor(dict_data=dictionary)
+        return decompressor
+
+    def put(self, text, train=True):
+        """Store a text if it is new; returns its content hash. With train=False, check needs_training instead"""
+        raw = text.encode('utf-8')
+        digest = hashlib.sha256(raw).hexdigest()
+        with self._lock:
+            if self.conn.execute('SELECT 1 FROM blobs WHERE hash = ?', (digest,)).fetchone():
+                self.duplicates += 1
+                return digest
+            data = self._compressor(self.dictionary_id).compress(raw)
+            self.conn.execute('INSERT INTO blobs (hash, dictionary, size, data) VALUES (?, ?, ?, ?)',
+                              (digest, self.dictionary_id, len(raw), data))
+            self.stored += 1
+            self.bytes_in += len(raw)
+            self.bytes_stored += len(data)
+            if not self.dictionary_id:
+                self.untrained += 1
+        if train and self.needs_training:
+            self.train()
+        return digest
+
+    @property
+    def needs_training(self):
+        """True once enough blobs were stored without a dictionary to train the first one"""
+        return not self.dictionary_id and not self.training and self.untrained >= self.dictionary_samples
+
+    def get(self, digest):
+        """Text stored under a content hash, or None if there is none"""
+        if not digest:
+            return None
+        with self._lock:
+            row = self.conn.execute('SELECT dictionary, data FROM blobs WHERE hash = ?', (digest,)).fetchone()
+            if row is None:
+                return None
+            return self._decompressor(row[0]).decompress(row[1]).decode('utf-8')
+
+    def text(self, record, field='description'):
+        """A record's text field: the text if it still carries it, otherwise read from its blob"""
+        return record.get(field) or self.get(record.get(f'{field}_hash'))
+
+    def __contains__(self, digest):
+        with self._lock:
+            return self.conn.execute('SELECT 1 FROM blobs WHERE hash = ?', (digest,)).fetchone() is not None
+
+    def train(self, samples=None):
+        """Train a new dictionary on the latest blobs and recompress every blob with it.
+
+        Returns the new dictionary id, or None if there were too few distinct samples to train on.
+        """
+        samples = samples or self.dictionary_samples
+        with self._lock:
+            self.training = True
+            rows = self.conn.execute('SELECT dictionary, data FROM blobs ORDER BY rowid DESC LIMIT ?',
+                                     (samples,)).fetchall()
+            texts = [self._decompressor(dictionary).decompress(data) for dictionary, data in rows]
+        try:
+            try:
+                trained = zstandard.train_dictionary(self.dictionary_size, texts, level=self.level)
+            except zstandard.ZstdError:
+                with self._lock:
+                    # Try again once as many new descriptions have come in
+                    self.untrained = 0
+                return None
+            with self._lock:
+                self.conn.execute('INSERT INTO dictionaries (data, samples, created_at) VALUES (?, ?, ?)',
+                                  (trained.as_bytes(), len(texts), time.time()))
+                self.dictionary_id = self.conn.execute('SELECT MAX(id) FROM dictionaries').fetchone()[0]
+                self.untrained = 0
+                self.conn.commit()
+            self.recompress()
+            return self.dictionary_id
+        finally:
+            self.training = False
+
+    def recompress(self, batch=500):
+        """Rewrite blobs written with an older dictionary (or none) using the current one"""
+        with self._lock:
+            dictionary_id = self.dictionary_id
+            dictionary = self._dictionary(dictionary_id) if dictionary_id else None
+        # zstd contexts are not thread-safe, so this one is not shared with put() and get()
+        compressor = zstandard.ZstdCompressor(level=self.level, dict_data=dictionary, write_checksum=True)
+        decompressors = {}
+        last = ''
+        while True:
+            with self._lock:
+                rows = self.conn.execute('SELECT hash, dictionary, data FROM blobs WHERE dictionary != ? '
+                                         'AND hash > ? ORDER BY hash LIMIT ?',
+                                         (dictionary_id, last, batch)).fetchall()
+                for old_id in {old_id for _, old_id, _ in rows} - decompressors.keys():
+                    decompressors[old_id] = zstandard.ZstdDecompressor(
+                        dict_data=self._dictionary(old_id) if old_id else None)
+            if not rows:
+                break
+            updates = [(dictionary_id, compressor.compress(decompressors[old_id].decompress(data)), digest, old_id)
+                       for digest, old_id, data in rows]
+            with self._lock:
+                self.conn.executemany('UPDATE blobs SET dictionary = ?, data = ? WHERE hash = ? AND dictionary = ?',
+                                      updates)
+                self.conn.commit()
+            last = rows[-1][0]
+
+    def stats(self):
+        """(blobs, uncompressed bytes, stored bytes) over the whole store"""
+        with self._lock:
+            count, size, stored = self.conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM blobs').fetchone()
+            return count, size, stored
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute('SELECT COUNT(*) FROM blobs').fetchone()[0]
+
+    def commit(self):
+        with self._lock:
+            self.conn.commit()
+
+    def close(self):
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
+
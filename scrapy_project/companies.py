@@ -0,0 +1,164 @@
+"""
+Company names, normalized once and looked up by hash.
+
+Scraped names vary ("Amazon.com, Inc.", "Amazon Web Services", "AMAZON")
+and substring checks mis-tier names like "Metadata Inc". A name is normalized
+by folding case and accents, dropping punctuation and trailing legal suffixes,
+then mapped through the alias table in config/companies.json to a canonical
+key. Tier, blacklist status and notes come from one dict keyed by that
+canonical key; blacklisted companies and their reasons are read from
+config/company_blacklist.json.
+
+Normalized names are memoized in memory and saved to the data directory at
+exit, so recurring company names are normalized once across runs. The memo is
+a least-recently-used cache of MEMO_SIZE names, so one-off names from years of
+crawls do not pile up in memory or in the saved file. The saved cache is
+discarded whenever either config file changes.
+"""
+import atexit
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from collections import namedtuple
+
+from scrapy_project.paths import config_path, data_path
+
+CompanyInfo = namedtuple('CompanyInfo', 'name tier blacklisted notes')
+
+_NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+
+MEMO_SIZE = 50000   # distinct raw names kept in memory and in the saved cache
+
+
+class CompanyIndex:
+    def __init__(self, companies=None, blacklist=None, legal_suffixes=(), cache_path=None, version='',
+                 memo_size=MEMO_SIZE):
+        self.suffixes = frozenset(legal_suffixes)
+        self.version = version
+        self.cache_path = cache_path
+        self.memo_size = memo_size
+        self.memo = {}
+        self.dirty = False
+        self.aliases = {}
+        self.entries = {}
+
+        for name, config in (companies or {}).items():
+            self.add(name, tier=config.get('tier'), notes=config.get('notes', ''),
+                     aliases=config.get('aliases', ()))
+        for name, reason in (blacklist or {}).items():
+            key = self.canonical(name)
+            current = self.entries.get(key)
+            self.entries[key] = CompanyInfo(current.name if current else name,
+                                            current.tier if current else None, True, reason or '')
+        self.load_cache()
+
+    @classmethod
+    def from_config(cls, path=None, blacklist_path=None, cache_path=None):
+        path = path or config_path('companies.json')
+        blacklist_path = blacklist_path or config_path('company_blacklist.json')
+        with open(path, 'rb') as f:
+            raw_config = f.read()
+        with open(blacklist_path, 'rb') as f:
+            raw_blacklist = f.read()
+        config = json.loads(raw_config)
+        blacklist_config = json.loads(raw_blacklist)
+        reasons = blacklist_config.get('reasons', {})
+        blacklist = {name: reasons.get(name, '') for name in blacklist_config.get('blacklisted_companies', [])}
+        return cls(config.get('companies'), blacklist, config.get('legal_suffixes', ()),
+                   cache_path=data_path('company_names.json') if cache_path is None else cache_path,
+                   version=hashlib.sha1(raw_config + raw_blacklist).hexdigest())
+
+    def add(self, name, tier=None, blacklisted=False, notes='', aliases=()):
+        key = self.normalize(name)
+        self.entries[key] = CompanyInfo(name, tier, blacklisted, notes)
+        for alias in aliases:
+            alias_key = self.normalize(alias)
+            if alias_key and alias_key != key:
+                self.aliases[alias_key] = key
+
+    def normalize(self, name):
+        """Lowercase, accent-free, punctuation-free name without trailing legal suffixes"""
+        if not name:
+            return ''
+        # Re-inserting on every hit keeps the dict in least-recently-used order
+        key = self.memo.pop(name, None)
+        if key is None:
+            folded = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode().lower()
+            words = []
+            initials = False
+            for word in _NON_ALNUM_RE.sub(' ', folded.replace('&', ' and ')).split():
+                # Dotted abbreviations split into single letters: "S.A." becomes "sa"
+                if len(word) == 1 and word.isalpha():
+                    if initials:
+                        words[-1] += word
+                    else:
+                        words.append(word)
+                    initials = True
+                else:
+                    words.append(word)
+                    initials = False
+            # "& Co." leaves a dangling "and" once the suffix goes
+            while len(words) > 1 and (words[-1] in self.suffixes or words[-1] == 'and'):
+                words.pop()
+            if len(words) > 1 and words[0] == 'the':
+                words.pop(0)
+            key = ' '.join(words)
+            if len(self.memo) >= self.memo_size:
+                del self.memo[next(iter(self.memo))]
+            self.dirty = True
+        self.memo[name] = key
+        return key
+
+    def canonical(self, name):
+        """Normalized name with aliases resolved to the company they belong to"""
+        key = self.normalize(name)
+        return self.aliases.get(key, key)
+
+    def lookup(self, name):
+        """CompanyInfo for a configured company, or None"""
+        return self.entries.get(self.canonical(name))
+
+    def tier(self, name):
+        info = self.lookup(name)
+        return info.tier if info else None
+
+    def is_blacklisted(self, name):
+        info = self.lookup(name)
+        return bool(info and info.blacklisted)
+
+    def load_cache(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, 'r') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return
+        if cached.get('version') == self.version:
+            names = list(cached.get('names', {}).items())
+            # Caches saved before the memo was bounded can be larger than memo_size
+            self.memo.update(names[-self.memo_size:])
+
+    def save(self):
+        """Write the memoized names for the next run (atomic, so concurrent writers are safe)"""
+        if not self.cache_path or not self.dirty:
+            return
+        tmp_path = f'{self.cache_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': self.version, 'names': self.memo}, f)
+        os.replace(tmp_path, self.cache_path)
+        self.dirty = False
+
+
+_index = None
+
+
+def get_company_index():
+    """Shared index, built from the config files on first use and saved at exit"""
+    global _index
+    if _index is None:
+        _index = CompanyIndex.from_config()
+        atexit.register(_index.save)
+    return _index
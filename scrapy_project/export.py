@@ -0,0 +1,244 @@
+"""
+Streaming export of the job store to CSV, JSON lines or Parquet.
+
+Jobs matching a scrape date range, sources and a minimum priority score are
+read in the order they were first stored, CHUNK_ROWS at a time, and written out as they are
+read, so memory stays flat however large the store is. Parquet output gets
+one row group per chunk.
+
+After every chunk the position reached is saved to <output>.cursor. An
+interrupted export started again with resume=True carries on after the last
+saved chunk: CSV and JSON lines files are cut back to the end of that chunk
+and appended to, and a Parquet file closed by the interruption is copied
+forward row group by row group. A Parquet file from a killed process has no
+footer and cannot be resumed. The cursor is removed once the export
+completes.
+"""
+import csv
+import json
+import os
+import time
+from collections import namedtuple
+from datetime import date, timedelta
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from scrapy_project.archive import arrow_type, coerce
+from scrapy_project.blob_store import BlobStore
+from scrapy_project.job_store import ITEM_COLUMNS, STORE_COLUMNS, JobStore
+
+EXPORT_FORMATS = ('csv', 'jsonl', 'parquet')
+CHUNK_ROWS = 1000
+# Every item field plus the application tracking kept only in the store
+EXPORT_SCHEMA = pa.schema([(name, arrow_type(name, sql_type)) for name, sql_type in ITEM_COLUMNS + STORE_COLUMNS
+                           if name not in ('updated_at', 'sheets_synced_at', 'sheet_row', 'sheet_values')])
+EXPORT_COLUMNS = EXPORT_SCHEMA.names
+
+_EXTENSIONS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.parquet': 'parquet'}
+
+ExportProgress = namedtuple('ExportProgress', 'rows total seconds')
+
+
+def export_format(path, fmt=None):
+    """Export format named, or implied by the output file's extension"""
+    fmt = fmt or _EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format for {path!r}; use one of {', '.join(EXPORT_FORMATS)}")
+    return fmt
+
+
+def export_filter(start=None, end=None, sources=None, min_score=None):
+    """(SQL condition, params) for a scrape date range (inclusive ISO dates), sources and minimum score"""
+    where, params = [], []
+    if start:
+        where.append('scraped_date >= ?')
+        params.append(str(start)[:10])
+    if end:
+        where.append('scraped_date < ?')
+        params.append((date.fromisoformat(str(end)[:10]) + timedelta(days=1)).isoformat())
+    if sources:
+        where.append(f"source IN ({', '.join('?' * len(sources))})")
+        params.extend(sources)
+    if min_score is not None:
+        where.append('priority_score >= ?')
+        params.append(min_score)
+    return ' AND '.join(where), params
+
+
+def cursor_path(path):
+    return f'{path}.cursor'
+
+
+def _load_cursor(path):
+    try:
+        with open(cursor_path(path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _save_cursor(path, cursor):
+    temp = cursor_path(path) + '.tmp'
+    with open(temp, 'w', encoding='utf-8') as f:
+        json.dump(cursor, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp, cursor_path(path))
+
+
+class _TextWriter:
+    """Line-oriented output that can be cut back to a saved offset and appended to"""
+
+    def __init__(self, path, offset=0):
+        if offset:
+            with open(path, 'r+b') as f:
+                f.truncate(offset)
+        self.file = open(path, 'a' if offset else 'w', encoding='utf-8', newline='')
+        if not offset:
+            self.start()
+
+    def start(self):
+        pass
+
+    def checkpoint(self):
+        """Make everything written so far durable; returns the offset to resume from"""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+class _CsvWriter(_TextWriter):
+    def __init__(self, path, offset=0):
+        super().__init__(path, offset)
+        self.writer = csv.writer(self.file)
+
+    def start(self):
+        csv.writer(self.file).writerow(EXPORT_COLUMNS)
+
+    def write(self, records):
+        self.writer.writerows([', '.join(value) if isinstance(value, list) else value
+                               for value in (record.get(name) for name in EXPORT_COLUMNS)]
+                              for record in records)
+
+
+class _JsonlWriter(_TextWriter):
+    def write(self, records):
+        self.file.writelines(json.dumps({name: record.get(name) for name in EXPORT_COLUMNS},
+                                        ensure_ascii=False, default=str) + '\n' for record in records)
+
+
+class _ParquetWriter:
+    def __init__(self, path, offset=0):
+        self.rows = 0
+        previous = None
+        if offset:
+            # Parquet files cannot be appended to: copy the finished part into a new file
+            previous = f'{path}.resume'
+            os.replace(path, previous)
+        self.writer = pq.ParquetWriter(path, EXPORT_SCHEMA, compression='zstd')
+        if previous:
+            try:
+                source = pq.ParquetFile(previous)
+                for i in range(source.num_row_groups):
+                    table = source.read_row_group(i)
+                    self.writer.write_table(table, row_group_size=len(table))
+                    self.rows += len(table)
+            except (pa.ArrowInvalid, OSError) as e:
+                self.writer.close()
+                os.replace(previous, path)
+                raise ValueError(f"Cannot resume {path}: it was not closed cleanly ({e})") from e
+            os.remove(previous)
+            if self.rows != offset:
+                self.writer.close()
+                raise ValueError(f"Cannot resume {path}: it holds {self.rows} rows, the cursor expects {offset}")
+
+    def write(self, records):
+        rows = [{name: coerce(name, record.get(name), EXPORT_SCHEMA) for name in EXPORT_COLUMNS}
+                for record in records]
+        self.writer.write_table(pa.Table.from_pylist(rows, schema=EXPORT_SCHEMA), row_group_size=len(rows))
+        self.rows += len(rows)
+
+    def checkpoint(self):
+        return self.rows
+
+    def close(self):
+        self.writer.close()
+
+
+def _after(where, params, cursor, by_date):
+    """(condition, params) for the jobs after the cursor.
+
+    Keyset pagination along an index never sorts: (scraped_date, rowid) is the order of the
+    scraped_date index, used when dates are filtered, and rowid is table order. ORDER BY
+    anything else would sort every match again for each chunk.
+    """
+    if by_date and cursor['last_id']:
+        condition = 'scraped_date >= ? AND (scraped_date, rowid) > (?, ?)'
+        values = [cursor['last_date'], cursor['last_date'], cursor['last_rowid']]
+    else:
+        condition, values = 'rowid > ?', [cursor['last_rowid']]
+    return ' AND '.join(filter(None, [where, condition])), params + values
+
+
+_WRITERS = {'csv': _CsvWriter, 'jsonl': _JsonlWriter, 'parquet': _ParquetWriter}
+
+
+def export_jobs(path, fmt=None, start=None, end=None, sources=None, min_score=None, descriptions=False,
+                resume=False, chunk_rows=CHUNK_ROWS, store_path=None, blobs_path=None, progress=None):
+    """Stream the matching jobs to path; returns the final ExportProgress.
+
+    descriptions=True fills in description text from the blob store. progress is called with an
+    ExportProgress after every chunk.
+    """
+    fmt = export_format(path, fmt)
+    where, params = export_filter(start, end, sources, min_score)
+    cursor = {'format': fmt, 'where': where, 'params': params, 'descriptions': descriptions,
+              'last_date': None, 'last_rowid': 0, 'last_id': '', 'rows': 0, 'offset': 0}
+    saved = _load_cursor(path) if resume and os.path.exists(path) else None
+    if saved:
+        if any(saved.get(key) != cursor[key] for key in ('format', 'where', 'params', 'descriptions')):
+            raise ValueError(f"{cursor_path(path)} is for a different export; start over without resume")
+        cursor = saved
+
+    store = JobStore(store_path)
+    blobs = BlobStore(blobs_path) if descriptions else None
+    writer = None
+    started = time.perf_counter()
+    try:
+        if cursor['last_id'] and not store.query('rowid = ? AND unique_id = ?',
+                                                 (cursor['last_rowid'], cursor['last_id']), columns='unique_id'):
+            raise ValueError(f"The job store has been rebuilt since {cursor_path(path)} was saved; start over")
+        by_date = bool(start or end)
+        condition, values = _after(where, params, cursor, by_date)
+        total = cursor['rows'] + store.query(condition, values, columns='COUNT(*) AS n')[0]['n']
+        writer = _WRITERS[fmt](path, cursor['offset'])
+        columns = ', '.join(['rowid AS _rowid'] + EXPORT_COLUMNS)
+        while True:
+            condition, values = _after(where, params, cursor, by_date)
+            records = store.query(condition, values, order_by='scraped_date, rowid' if by_date else 'rowid',
+                                  limit=chunk_rows, columns=columns)
+            if not records:
+                break
+            if blobs:
+                for record in records:
+                    record['description'] = blobs.text(record)
+            writer.write(records)
+            last = records[-1]
+            cursor.update(last_date=last['scraped_date'], last_rowid=last['_rowid'], last_id=last['unique_id'],
+                          rows=cursor['rows'] + len(records), offset=writer.checkpoint())
+            _save_cursor(path, cursor)
+            if progress:
+                progress(ExportProgress(cursor['rows'], total, time.perf_counter() - started))
+    finally:
+        if writer:
+            writer.close()
+        if blobs:
+            blobs.close()
+        store.close()
+    if os.path.exists(cursor_path(path)):
+        os.remove(cursor_path(path))
+    return ExportProgress(cursor['rows'], total, time.perf_counter() - started)
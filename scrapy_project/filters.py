@@ -0,0 +1,138 @@
+"""
+Job filters from config/job_filters.json and config/company_blacklist.json.
+
+Both files are compiled once into predicates: excluded companies become a set
+of canonical names from the company index, which also holds the blacklist;
+excluded titles and warning phrases become one combined regex each; and the
+salary and age limits become plain numbers. The same JobFilter runs on search-card data before a detail
+page is requested and on full items in JobFiltersPipeline. A field that is
+not known yet (a card without a salary, say) never fails a rule.
+"""
+import json
+import re
+from datetime import datetime
+
+from scrapy_project.companies import get_company_index
+from scrapy_project.paths import config_path
+from scrapy_project.salary import parse_salary
+
+# Rules in the order they are checked, cheapest first
+RULES = ('excluded_company', 'excluded_title', 'max_days_old', 'salary_range',
+         'remote_only', 'warning_keyword')
+
+REMOTE_INDICATORS = ('remote', 'remotely', 'work from home', 'distributed', 'anywhere')
+
+
+def _phrase_regex(phrases):
+    """One case-insensitive regex matching any phrase as whole words, or None"""
+    parts = [r'\s+'.join(re.escape(word) for word in phrase.split())
+             for phrase in phrases if phrase and phrase.strip()]
+    if not parts:
+        return None
+    # Longest first so a phrase is never shadowed by one of its prefixes
+    parts.sort(key=len, reverse=True)
+    return re.compile(r'\b(?:' + '|'.join(parts) + r')\b', re.IGNORECASE)
+
+
+def _load_json(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+class JobFilter:
+    def __init__(self, excluded_companies=(), excluded_titles=(), warning_keywords=(),
+                 salary_min=None, salary_max=None, max_days_old=None, remote_only=False,
+                 company_index=None):
+        self.company_index = company_index or get_company_index()
+        self.companies = frozenset(filter(None, (self.company_index.canonical(c) for c in excluded_companies)))
+        self.title_re = _phrase_regex(excluded_titles)
+        self.warning_re = _phrase_regex(warning_keywords)
+        self.salary_min = salary_min
+        self.salary_max = salary_max
+        self.max_days_old = max_days_old
+        self.remote_only = remote_only
+
+    @classmethod
+    def from_config(cls, filters_path=None, blacklist_path=None):
+        filters = _load_json(filters_path or config_path('job_filters.json'))
+        blacklist = _load_json(blacklist_path or config_path('company_blacklist.json'))
+        salary_range = filters.get('salary_range') or {}
+        return cls(
+            excluded_companies=filters.get('excluded_companies', []),
+            excluded_titles=filters.get('excluded_titles', []),
+            warning_keywords=blacklist.get('warning_keywords', []),
+            salary_min=salary_range.get('min'),
+            salary_max=salary_range.get('max'),
+            max_days_old=filters.get('max_days_old'),
+            remote_only=filters.get('remote_only', False),
+        )
+
+    def check(self, title=None, company=None, location=None, salary=None, posted_date=None,
+              description=None, remote=None, salary_range=None):
+        """Name of the first rule the job fails, or None if it passes (unknown fields pass).
+
+        salary_range is an annualized (min, max); without it the salary text is parsed.
+        """
+        if company and self.is_excluded_company(company):
+            return 'excluded_company'
+        if title and self.title_re and self.title_re.search(title):
+            return 'excluded_title'
+        if posted_date and self.max_days_old is not None and self.is_too_old(posted_date):
+            return 'max_days_old'
+        if (self.salary_min or self.salary_max) and (salary_range or salary):
+            if self.is_outside_salary_range(salary_range or self.annual_range(salary)):
+                return 'salary_range'
+        if self.remote_only:
+            if remote is None and location:
+                remote = any(indicator in location.lower() for indicator in REMOTE_INDICATORS)
+            if remote is False:
+                return 'remote_only'
+        if self.warning_re and any(text and self.warning_re.search(text) for text in (title, description)):
+            return 'warning_keyword'
+        return None
+
+    def check_item(self, item):
+        """check() over the fields of a full JobItem"""
+        return self.check(title=item.get('title'), company=item.get('company'),
+                          location=item.get('location'), salary=item.get('salary'),
+                          posted_date=item.get('posted_date'), description=item.get('description'),
+                          remote=item.get('remote_friendly'),
+                          salary_range=(item.get('salary_min'), item.get('salary_max'))
+                          if item.get('salary_min') is not None else None)
+
+    def is_excluded_company(self, company):
+        index = self.company_index
+        key = index.canonical(company)
+        return key in self.companies or bool(key in index.entries and index.entries[key].blacklisted)
+
+    def is_too_old(self, posted_date):
+        if isinstance(posted_date, str):
+            try:
+                posted_date = datetime.fromisoformat(posted_date.replace('Z', '+00:00'))
+            except ValueError:
+                return False
+        return (datetime.now() - posted_date.replace(tzinfo=None)).days > self.max_days_old
+
+    @staticmethod
+    def annual_range(salary):
+        parsed = parse_salary(salary)
+        return (parsed.min, parsed.max) if parsed else None
+
+    def is_outside_salary_range(self, salary_range):
+        if salary_range is None:
+            return False
+        low, high = salary_range
+        if self.salary_min and high < self.salary_min:
+            return True
+        return bool(self.salary_max and low > self.salary_max)
+
+
+_filter = None
+
+
+def get_filter():
+    """Shared filter, compiled from the config files on first use"""
+    global _filter
+    if _filter is None:
+        _filter = JobFilter.from_config()
+    return _filter
@@ -3,10 +3,15 @@ import scrapy
 class JobItem(scrapy.Item):
     # Basic information
     job_id = scrapy.Field()
+    unique_id = scrapy.Field()
     title = scrapy.Field()
     company = scrapy.Field()
     location = scrapy.Field()
     salary = scrapy.Field()
+    salary_min = scrapy.Field()  # Annualized
+    salary_max = scrapy.Field()  # Annualized
+    salary_currency = scrapy.Field()
+    salary_period = scrapy.Field()  # Period the pay was quoted in
     job_type = scrapy.Field()
     
     # URLs
@@ -16,6 +21,7 @@ class JobItem(scrapy.Item):
     
     # Content
     description = scrapy.Field()
+    description_hash = scrapy.Field()  # Key of the text in the blob store
     requirements = scrapy.Field()
     responsibilities = scrapy.Field()
     benefits = scrapy.Field()
@@ -24,6 +30,8 @@ class JobItem(scrapy.Item):
     posted_date = scrapy.Field()
     scraped_date = scrapy.Field()
     source = scrapy.Field()
+    duplicate_of = scrapy.Field()
+    change_type = scrapy.Field()
     
     # Analysis
     keywords = scrapy.Field()
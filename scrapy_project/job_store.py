@@ -0,0 +1,260 @@
+"""
+Local SQLite job store, the system of record for scraped jobs.
+
+Every item is upserted into one WAL-mode table keyed by unique_id, in batched
+transactions. Google Sheets is a downstream copy kept up to date by
+scrapy_project.sheets_sync, and the auto-applier, monitor, reports and backups
+read from here with indexed queries instead of pulling the whole sheet.
+
+Application tracking columns (status, notes, applied date, next action) belong
+to the user and the auto-applier once a job has been acted on: re-scraping a
+posting refreshes its content but never resets them.
+
+Every write clears sheets_synced_at, so the partial jobs_unsynced index lists
+exactly the jobs the next Sheets sync has to look at. sheet_row and
+sheet_values remember where each job sits in the sheet and what was last
+written there, which lets the sync send only the cells that changed.
+
+Description text lives in the blob store (scrapy_project.blob_store); rows keep
+only its description_hash. Rows stored before that still carry the text.
+"""
+import json
+import sqlite3
+import threading
+import time
+
+from scrapy_project.paths import data_path
+
+# (column, SQLite type) for each stored item field, in JobItem order
+ITEM_COLUMNS = [
+    ('unique_id', 'TEXT PRIMARY KEY'), ('job_id', 'TEXT'), ('title', 'TEXT'), ('company', 'TEXT'),
+    ('location', 'TEXT'), ('salary', 'TEXT'), ('salary_min', 'REAL'), ('salary_max', 'REAL'),
+    ('salary_currency', 'TEXT'), ('salary_period', 'TEXT'), ('job_type', 'TEXT'),
+    ('job_url', 'TEXT'), ('apply_url', 'TEXT'), ('company_url', 'TEXT'),
+    ('description', 'TEXT'), ('description_hash', 'TEXT'),
+    ('requirements', 'TEXT'), ('responsibilities', 'TEXT'), ('benefits', 'TEXT'),
+    ('posted_date', 'TEXT'), ('scraped_date', 'TEXT'), ('source', 'TEXT'),
+    ('duplicate_of', 'TEXT'), ('change_type', 'TEXT'),
+    ('keywords', 'TEXT'), ('experience_level', 'TEXT'), ('remote_friendly', 'INTEGER'),
+    ('priority_score', 'INTEGER'), ('match_score', 'REAL'),
+    ('application_status', 'TEXT'), ('application_method', 'TEXT'), ('auto_apply_eligible', 'INTEGER'),
+    ('application_complexity', 'TEXT'), ('notes', 'TEXT'),
+    ('email_found', 'INTEGER'), ('contact_email', 'TEXT'), ('application_deadline', 'TEXT'),
+    ('easy_apply_available', 'INTEGER'),
+]
+# Columns only the store keeps
+STORE_COLUMNS = [
+    ('applied_date', 'TEXT'), ('next_action', 'TEXT'),
+    ('updated_at', 'REAL'), ('sheets_synced_at', 'REAL'), ('sheet_row', 'INTEGER'), ('sheet_values', 'TEXT'),
+]
+TRACKING_COLUMNS = ('application_status', 'notes')
+JSON_COLUMNS = ('keywords', 'sheet_values')
+BOOL_COLUMNS = ('remote_friendly', 'auto_apply_eligible', 'email_found', 'easy_apply_available')
+INDEXED_COLUMNS = ('company', 'source', 'posted_date', 'scraped_date', 'priority_score', 'application_status',
+                   'updated_at')
+
+_ITEM_NAMES = [name for name, _ in ITEM_COLUMNS]
+
+
+def _encode(name, value):
+    if value is None:
+        return None
+    if name in JSON_COLUMNS:
+        return json.dumps(list(value) if not isinstance(value, str) else [value])
+    if name in BOOL_COLUMNS:
+        return int(bool(value))
+    return value
+
+
+def _decode(row):
+    record = dict(row)
+    for name in JSON_COLUMNS:
+        if record.get(name):
+            record[name] = json.loads(record[name])
+    for name in BOOL_COLUMNS:
+        if record.get(name) is not None:
+            record[name] = bool(record[name])
+    return record
+
+
+class JobStore:
+    def __init__(self, path=None):
+        self.path = path or data_path('jobs.db')
+        self._lock = threading.RLock()
+        self.pending = []
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self._create_schema()
+
+        # Upsert that refreshes scraped fields but keeps tracking columns once acted on
+        updates = ', '.join(f'{name} = excluded.{name}' for name in _ITEM_NAMES[1:] if name not in TRACKING_COLUMNS)
+        keep = ', '.join(
+            f"{name} = CASE WHEN jobs.application_status IS NULL OR jobs.application_status = 'Not Applied' "
+            f"THEN excluded.{name} ELSE jobs.{name} END" for name in TRACKING_COLUMNS)
+        self.upsert_sql = f'''
+            INSERT INTO jobs ({', '.join(_ITEM_NAMES)}, updated_at)
+            VALUES ({', '.join('?' * len(_ITEM_NAMES))}, ?)
+            ON CONFLICT(unique_id) DO UPDATE SET {updates}, {keep}, updated_at = excluded.updated_at,
+                sheets_synced_at = NULL
+        '''
+
+    def _create_schema(self):
+        columns = ITEM_COLUMNS + STORE_COLUMNS
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS jobs ({', '.join(f'{n} {t}' for n, t in columns)})")
+        # Columns added to JobItem after the table was created
+        existing = {row['name'] for row in self.conn.execute('PRAGMA table_info(jobs)')}
+        for name, sql_type in columns:
+            if name not in existing:
+                self.conn.execute(f'ALTER TABLE jobs ADD COLUMN {name} {sql_type}')
+        for name in INDEXED_COLUMNS:
+            self.conn.execute(f'CREATE INDEX IF NOT EXISTS jobs_{name} ON jobs ({name})')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS jobs_unsynced ON jobs (sheets_synced_at) '
+                          'WHERE sheets_synced_at IS NULL')
+
+    def add(self, record):
+        """Queue an item (a mapping of JobItem fields) for the next flush"""
+        row = tuple(_encode(name, record.get(name)) for name in _ITEM_NAMES) + (time.time(),)
+        with self._lock:
+            self.pending.append(row)
+
+    def flush(self):
+        """Write queued items in one transaction; returns how many were written"""
+        with self._lock:
+            if not self.pending:
+                return 0
+            rows, self.pending = self.pending, []
+            with self.transaction():
+                self.conn.executemany(self.upsert_sql, rows)
+            return len(rows)
+
+    def transaction(self):
+        return _Transaction(self.conn)
+
+    def query(self, where='', params=(), order_by=None, limit=None, columns='*'):
+        """Decoded rows of jobs matching an SQL condition"""
+        sql = f'SELECT {columns} FROM jobs'
+        if where:
+            sql += f' WHERE {where}'
+        if order_by:
+            sql += f' ORDER BY {order_by}'
+        if limit is not None:
+            sql += f' LIMIT {int(limit)}'
+        with self._lock:
+            return [_decode(row) for row in self.conn.execute(sql, params)]
+
+    def jobs_to_apply(self, min_score, limit):
+        return self.query("auto_apply_eligible = 1 AND application_status = 'Not Applied' AND priority_score >= ?",
+                          (min_score,), order_by='priority_score DESC', limit=limit)
+
+    def status_counts(self):
+        """{application_status: number of jobs}"""
+        with self._lock:
+            return {row[0] or '': row[1] for row in self.conn.execute(
+                'SELECT application_status, COUNT(*) FROM jobs GROUP BY application_status')}
+
+    def update_status(self, unique_id, status, notes='', applied_date=None, next_action=None):
+        """Record an application outcome for a job"""
+        with self._lock, self.transaction():
+            self.conn.execute('''
+                UPDATE jobs SET application_status = ?, notes = ?,
+                    applied_date = COALESCE(?, applied_date), next_action = COALESCE(?, next_action),
+                    updated_at = ?, sheets_synced_at = NULL
+                WHERE unique_id = ?
+            ''', (status, notes, applied_date, next_action, time.time(), unique_id))
+
+    def update_scores(self, rows):
+        """Apply (unique_id, priority_score, match_score) triples; match_score None keeps the old one"""
+        now = time.time()
+        with self._lock, self.transaction():
+            self.conn.executemany('UPDATE jobs SET priority_score = ?, match_score = COALESCE(?, match_score), '
+                                  'updated_at = ?, sheets_synced_at = NULL WHERE unique_id = ?',
+                                  [(int(priority), match, now, unique_id) for unique_id, priority, match in rows])
+
+    def move_descriptions(self, rows):
+        """Replace stored description text with (unique_id, description_hash) pairs from the blob store"""
+        with self._lock, self.transaction():
+            self.conn.executemany('UPDATE jobs SET description = NULL, description_hash = ? WHERE unique_id = ?',
+                                  [(digest, unique_id) for unique_id, digest in rows])
+
+    def unsynced(self, limit=None):
+        """Jobs added or changed since their last push to Sheets, oldest first"""
+        return self.query('sheets_synced_at IS NULL', order_by='updated_at', limit=limit)
+
+    def mark_synced(self, rows):
+        """Record (unique_id, sheet row, values written, updated_at as read) tuples as pushed to Sheets.
+
+        A job written again since it was read stays unsynced, so the newer change goes next time.
+        """
+        now = time.time()
+        with self._lock, self.transaction():
+            self.conn.executemany('''
+                UPDATE jobs SET sheet_row = COALESCE(?, sheet_row), sheet_values = ?,
+                    sheets_synced_at = CASE WHEN updated_at = ? THEN ? ELSE NULL END
+                WHERE unique_id = ?
+            ''', [(row, json.dumps(values), updated_at, now, unique_id)
+                  for unique_id, row, values, updated_at in rows])
+
+    def reindex_sheet_rows(self, rows):
+        """Replace the unique_id -> sheet row index with {unique_id: row} read back from the sheet.
+
+        Jobs no longer in the sheet are queued to be appended again.
+        """
+        with self._lock, self.transaction():
+            self.conn.execute('CREATE TEMP TABLE IF NOT EXISTS sheet_index (unique_id TEXT PRIMARY KEY, row INTEGER)')
+            self.conn.execute('DELETE FROM sheet_index')
+            self.conn.executemany('INSERT OR REPLACE INTO sheet_index VALUES (?, ?)', rows.items())
+            self.conn.execute('''
+                UPDATE jobs SET sheet_row = (SELECT row FROM sheet_index WHERE sheet_index.unique_id = jobs.unique_id)
+                WHERE sheet_row IS NOT NULL OR unique_id IN (SELECT unique_id FROM sheet_index)
+            ''')
+            self.conn.execute('UPDATE jobs SET sheet_values = NULL, sheets_synced_at = NULL '
+                              'WHERE sheet_row IS NULL AND sheets_synced_at IS NOT NULL')
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+
+class _Transaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute('BEGIN IMMEDIATE')
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute('ROLLBACK' if exc_type else 'COMMIT')
+
+
+_open_stores = {}
+_registry_lock = threading.Lock()
+
+
+def open_job_store(path=None):
+    """Open (or share) the job store so every pipeline in the process uses one instance"""
+    path = path or data_path('jobs.db')
+    with _registry_lock:
+        entry = _open_stores.get(path)
+        if entry is None:
+            entry = _open_stores[path] = [JobStore(path), 0]
+        entry[1] += 1
+        return entry[0]
+
+
+def release_job_store(store):
+    """Drop a reference taken with open_job_store, closing the store with the last one"""
+    with _registry_lock:
+        entry = _open_stores.get(store.path)
+        if entry is None or entry[0] is not store:
+            store.close()
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del _open_stores[store.path]
+            store.close()
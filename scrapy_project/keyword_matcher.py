@@ -0,0 +1,189 @@
+"""
+Keyword matching for job postings.
+
+Every skill, synonym, soft skill, industry term and experience-level phrase in
+config/keywords.json is compiled once into an Aho-Corasick automaton over word
+tokens. A single pass over a description finds all of them, so the cost depends
+on the length of the text and not on the size of the vocabulary.
+
+Matching whole tokens also gives word boundaries for free: "R" no longer
+matches every word containing an r, and "Java" no longer matches "JavaScript".
+Punctuation inside a phrase is ignored, so "Node.js" matches "node js" and
+"real-time" matches "real time". A single letter glued to another word by
+punctuation ("R&D", "R's", "e.g.") is not a standalone token, so it never
+matches a one-letter skill like R.
+"""
+import json
+import re
+import string
+from collections import deque
+
+from scrapy_project.paths import config_path
+
+# Punctuation separates words, except '+' and '#', which carry meaning in skill
+# names (C++, C#, 5+ years) and become tokens of their own. str.translate plus
+# split is several times faster than a findall over the same text.
+_SEPARATORS = {ord(c): ' ' for c in string.punctuation + string.whitespace}
+_SEPARATORS.update({ord('+'): ' + ', ord('#'): ' # '})
+# Punctuation that joins the parts of one word (R&D, Node.js, real-time, R's)
+# rather than separating words. It is translated to _JOINER first so that glued
+# single letters can be told apart from standalone ones.
+_JOINER = '\x00'
+_JOINED = dict(_SEPARATORS)
+_JOINED.update({ord(c): _JOINER for c in "&.-'_@"})
+# _GLUED marks those letters, so they match no phrase token
+_GLUED = '\x01'
+_GLUED_AFTER = re.compile(r'\x00(?<=[^\s\x00]\x00)([a-z])(?![^\s\x00])')
+_GLUED_BEFORE = re.compile(r'\x00(?<=(?<![^\s\x00])[a-z]\x00)(?=[^\s\x00])')
+
+GROUPS = ('skills', 'soft_skills', 'industry', 'titles', 'levels')
+
+
+def tokenize(text):
+    text = text.lower().translate(_JOINED)
+    if _JOINER in text:
+        text = _GLUED_AFTER.sub(_JOINER + _GLUED + r'\1', text)
+        text = _GLUED_BEFORE.sub(_GLUED + _JOINER, text)
+        text = text.replace(_JOINER, ' ')
+    return text.split()
+
+
+class KeywordMatcher:
+    def __init__(self, terms):
+        """Build the automaton from (phrase, group, canonical name) triples"""
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]
+        self.names = {}
+
+        for phrase, group, name in terms:
+            names = self.names.setdefault(group, [])
+            if name not in names:
+                names.append(name)
+            tokens = tokenize(phrase)
+            if not tokens:
+                continue
+            state = 0
+            for token in tokens:
+                nxt = self.goto[state].get(token)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][token] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                state = nxt
+            if (group, name) not in self.output[state]:
+                self.output[state] += ((group, name),)
+
+        # Breadth-first pass to fill in failure links and merge outputs along them
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(token, 0)
+                self.fail[nxt] = target if target != nxt else 0
+                self.output[nxt] += tuple(o for o in self.output[self.fail[nxt]] if o not in self.output[nxt])
+
+    @classmethod
+    def from_config(cls, path=None):
+        with open(path or config_path('keywords.json'), 'r') as f:
+            config = json.load(f)
+
+        terms = []
+        synonyms = config.get('synonyms', {})
+
+        def add(group, name):
+            terms.append((name, group, name))
+            for synonym in synonyms.get(name, []):
+                terms.append((synonym, group, name))
+
+        for category in config.get('technical_skills', {}).values():
+            for name in category:
+                add('skills', name)
+        for name in config.get('soft_skills', []):
+            add('soft_skills', name)
+        for name in config.get('industry_keywords', []):
+            add('industry', name)
+        for name in config.get('job_titles', []):
+            add('titles', name)
+        for level, phrases in config.get('experience_levels', {}).items():
+            for phrase in phrases:
+                terms.append((phrase, 'levels', level))
+        return cls(terms)
+
+    def __len__(self):
+        return len(self.goto)
+
+    def scan(self, text):
+        """Return {group: [canonical names in order of first appearance]} for one pass over text"""
+        return self.scan_tokens(tokenize(text) if text else ())
+
+    def scan_tokens(self, tokens):
+        """Same as scan() for text that has already been tokenized"""
+        found = {group: [] for group in GROUPS}
+        seen = set()
+        goto, fail, output = self.goto, self.fail, self.output
+        root = goto[0]
+        state = 0
+        for token in tokens:
+            if state:
+                while state and token not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(token, 0)
+            else:
+                # Most words in a description start no phrase at all
+                state = root.get(token, 0)
+                if not state:
+                    continue
+            for match in output[state]:
+                if match not in seen:
+                    seen.add(match)
+                    found.setdefault(match[0], []).append(match[1])
+        return found
+
+    def count_tokens(self, tokens, groups=GROUPS):
+        """{(group, canonical name): occurrences} for the given groups, in one pass"""
+        counts = {}
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for token in tokens:
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for match in output[state]:
+                if match[0] in groups:
+                    counts[match] = counts.get(match, 0) + 1
+        return counts
+
+    def vocabulary(self, group='skills'):
+        """Canonical names of a group, in config order"""
+        return tuple(self.names.get(group, ()))
+
+    def keywords(self, text):
+        """Technical skills mentioned in text"""
+        return self.scan(text)['skills']
+
+    def experience_level(self, *levels):
+        """Collapse level matches (from one or more scans) into Senior, Junior or Mid-Level"""
+        matched = {level for found in levels for level in found}
+        if 'Senior' in matched:
+            return 'Senior'
+        if 'Junior' in matched:
+            return 'Junior'
+        return 'Mid-Level'
+
+
+_matcher = None
+
+
+def get_matcher():
+    """Shared matcher, built from config/keywords.json on first use"""
+    global _matcher
+    if _matcher is None:
+        _matcher = KeywordMatcher.from_config()
+    return _matcher
@@ -1,9 +1,12 @@
+from scrapy import Request, signals
+from scrapy.exceptions import NotConfigured
 from scrapy_selenium import SeleniumRequest, SeleniumMiddleware
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import time
 import random
+from scrapy_project.seen_store import open_seen_store, release_seen_store, unique_id_from_url
 
 class CustomSeleniumMiddleware(SeleniumMiddleware):
     
@@ -29,3 +32,95 @@ class AntiDetectionMiddleware:
         request.headers.setdefault('Upgrade-Insecure-Requests', '1')
         
         return None
+
+class SeenJobsMiddleware:
+    """Drop detail-page requests for jobs already in the persistent seen-ID store"""
+
+    def __init__(self, stats, refresh_hours=0, batch_size=50):
+        self.stats = stats
+        self.refresh_after = refresh_hours * 3600
+        self.batch_size = batch_size
+        self.store = None
+        self.skipped = 0
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool('SEEN_JOBS_SKIP_ENABLED', True):
+            raise NotConfigured
+        middleware = cls(crawler.stats, crawler.settings.getfloat('SEEN_JOBS_REFRESH_HOURS', 0),
+                         crawler.settings.getint('SEEN_JOBS_LOOKUP_BATCH', 50))
+        crawler.signals.connect(middleware.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    def spider_opened(self, spider):
+        self.store = open_seen_store()
+
+    def spider_closed(self, spider):
+        if self.skipped:
+            spider.logger.info(f"Skipped {self.skipped} detail requests for already-seen jobs")
+        release_seen_store(self.store)
+
+    def process_spider_output(self, response, result, spider):
+        # Hold requests back in small batches so the store answers one query per batch
+        pending = []
+        for request_or_item in result:
+            if isinstance(request_or_item, Request):
+                pending.append(request_or_item)
+                if len(pending) >= self.batch_size:
+                    yield from self.filter_seen(pending, spider)
+                    pending = []
+            else:
+                yield request_or_item
+        yield from self.filter_seen(pending, spider)
+
+    async def process_spider_output_async(self, response, result, spider):
+        # Same batching for async iterables: async-generator callbacks, or output an earlier
+        # middleware made async. Coroutine callbacks such as parse_job_detail_offloaded return
+        # a single JobItem, which Scrapy hands to process_spider_output
+        pending = []
+        async for request_or_item in result:
+            if isinstance(request_or_item, Request):
+                pending.append(request_or_item)
+                if len(pending) >= self.batch_size:
+                    for request in self.filter_seen(pending, spider):
+                        yield request
+                    pending = []
+            else:
+                yield request_or_item
+        for request in self.filter_seen(pending, spider):
+            yield request
+
+    def filter_seen(self, requests, spider):
+        candidates = {}
+        for request in requests:
+            if not request.meta.get('dont_skip_seen'):
+                unique_id = unique_id_from_url(request.url)
+                if unique_id:
+                    candidates[request] = unique_id
+        seen = self.store.lookup_many(candidates.values()) if candidates else {}
+
+        now = time.time()
+        skipped = []
+        for request in requests:
+            unique_id = candidates.get(request)
+            if self.is_fresh(seen.get(unique_id), now):
+                skipped.append(unique_id)
+                self.stats.inc_value('seen_jobs/requests_skipped', spider=spider)
+                continue
+            yield request
+        if skipped:
+            # Still listed on the site, so keep them from expiring
+            self.skipped += len(skipped)
+            self.store.touch_many(skipped)
+
+    def is_fresh(self, seen, now):
+        if not seen:
+            return False
+        if not self.refresh_after:
+            return True
+        # Re-fetch each known job once per refresh period, counted from its first sighting, so
+        # DuplicatesPipeline can notice edits. last_seen alone cannot tell: touching skipped
+        # jobs keeps it recent for as long as they stay listed.
+        period = (now - seen.first_seen) // self.refresh_after
+        return period == (seen.last_seen - seen.first_seen) // self.refresh_after
@@ -0,0 +1,163 @@
+"""
+Cross-source near-duplicate detection with MinHash signatures and an LSH index.
+
+Each posting is reduced to word shingles of its normalized title, company and
+description. A MinHash signature over those shingles is split into bands; every
+band is hashed to a bucket key and stored in SQLite. Two postings that share a
+bucket are candidates, and their signatures give an estimate of the Jaccard
+similarity. Lookups touch only the handful of rows in the matching buckets, so
+the cost per item stays flat no matter how many postings are stored.
+
+Location is left out of the shingles, where a few words would barely move the
+similarity; instead candidates must share the normalized location. The same
+text posted for several cities is one job per city, not a duplicate.
+"""
+import hashlib
+import re
+import sqlite3
+import zlib
+
+import numpy as np
+
+from scrapy_project.paths import data_path
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+SHIFT = np.uint64(32)
+
+# Fixed seed: signatures are persisted, so the hash functions must never change.
+# Multiply-shift hashing ((a * x + b) >> 32 with odd a) avoids a slow modulo.
+_rng = np.random.RandomState(1)
+_PERM_A = (_rng.randint(0, 1 << 63, size=NUM_PERM, dtype=np.uint64) << np.uint64(1)) | np.uint64(1)
+_PERM_B = _rng.randint(0, 1 << 63, size=NUM_PERM, dtype=np.uint64)
+_SHINGLE_MIX = (_rng.randint(0, 1 << 63, size=SHINGLE_SIZE, dtype=np.uint64) << np.uint64(1)) | np.uint64(1)
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+LOCATION_TOKEN_RE = re.compile(r'[a-z]+')
+
+
+def normalize_location(location):
+    """Lowercase words of a location, without punctuation or postcodes ("New York, NY 10001" -> "new york ny")"""
+    return ' '.join(LOCATION_TOKEN_RE.findall((location or '').lower()))
+
+
+def shingle_hashes(title, company, description):
+    """Distinct 32-bit hashes of the word shingles in the normalized posting text"""
+    tokens = TOKEN_RE.findall(f"{title or ''} {company or ''} {description or ''}".lower())
+    if not tokens:
+        return np.empty(0, dtype=np.uint64)
+    token_hashes = np.fromiter((zlib.crc32(t.encode('utf-8')) for t in tokens),
+                               dtype=np.uint64, count=len(tokens))
+    width = min(SHINGLE_SIZE, len(tokens))
+    count = len(tokens) - width + 1
+    mixed = np.zeros(count, dtype=np.uint64)
+    for offset in range(width):
+        mixed += token_hashes[offset:offset + count] * _SHINGLE_MIX[offset]
+    return np.unique(mixed >> SHIFT)
+
+
+def minhash(hashes):
+    """MinHash signature (uint32 array of NUM_PERM values) for an array of shingle hashes"""
+    if not len(hashes):
+        return np.full(NUM_PERM, 0xFFFFFFFF, dtype=np.uint32)
+    permuted = np.multiply.outer(_PERM_A, hashes)
+    permuted += _PERM_B[:, None]
+    permuted >>= SHIFT
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def band_keys(signature):
+    """One signed 64-bit bucket key per band"""
+    keys = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS:(band + 1) * ROWS].tobytes()
+        digest = hashlib.blake2b(bytes([band]) + chunk, digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'little', signed=True))
+    return keys
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.count_nonzero(sig_a == sig_b)) / NUM_PERM
+
+
+class NearDuplicateIndex:
+    def __init__(self, path=None, threshold=0.8):
+        self.path = path or data_path('near_duplicates.db')
+        self.threshold = threshold
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS postings (
+                id INTEGER PRIMARY KEY,
+                unique_id TEXT NOT NULL UNIQUE,
+                signature BLOB NOT NULL,
+                location TEXT
+            );
+            CREATE TABLE IF NOT EXISTS lsh_buckets (
+                bucket INTEGER NOT NULL,
+                posting_id INTEGER NOT NULL,
+                PRIMARY KEY (bucket, posting_id)
+            ) WITHOUT ROWID;
+        ''')
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(postings)')}
+        if 'location' not in columns:
+            # Postings indexed before locations were stored match any location
+            self.conn.execute('ALTER TABLE postings ADD COLUMN location TEXT')
+
+    def find(self, signature, keys=None, exclude=None, location=None):
+        """Return (unique_id, similarity) of the closest stored posting above the threshold.
+
+        With a location (normalized by normalize_location), only postings in the same location match.
+        """
+        keys = keys or band_keys(signature)
+        placeholders = ','.join('?' * len(keys))
+        rows = self.conn.execute(f'''
+            SELECT p.unique_id, p.signature, p.location FROM postings p
+            WHERE p.id IN (SELECT DISTINCT posting_id FROM lsh_buckets WHERE bucket IN ({placeholders}))
+        ''', keys).fetchall()
+
+        best = None
+        for unique_id, blob, stored_location in rows:
+            if unique_id == exclude:
+                continue
+            if location is not None and stored_location is not None and stored_location != location:
+                continue
+            score = similarity(signature, np.frombuffer(blob, dtype=np.uint32))
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (unique_id, score)
+        return best
+
+    def add(self, unique_id, signature, keys=None, location=None):
+        """Index a posting, replacing any earlier signature stored for the same unique_id"""
+        keys = keys or band_keys(signature)
+        existing = self.conn.execute('SELECT id FROM postings WHERE unique_id = ?', (unique_id,)).fetchone()
+        if existing:
+            self.conn.execute('DELETE FROM lsh_buckets WHERE posting_id = ? AND bucket IN (%s)'
+                              % ','.join('?' * BANDS),
+                              (existing[0], *band_keys(self.signature_of(existing[0]))))
+            self.conn.execute('UPDATE postings SET signature = ?, location = ? WHERE id = ?',
+                              (signature.tobytes(), location, existing[0]))
+            posting_id = existing[0]
+        else:
+            posting_id = self.conn.execute('INSERT INTO postings (unique_id, signature, location) VALUES (?, ?, ?)',
+                                           (unique_id, signature.tobytes(), location)).lastrowid
+        self.conn.executemany('INSERT OR IGNORE INTO lsh_buckets (bucket, posting_id) VALUES (?, ?)',
+                              [(key, posting_id) for key in keys])
+
+    def signature_of(self, posting_id):
+        blob = self.conn.execute('SELECT signature FROM postings WHERE id = ?', (posting_id,)).fetchone()[0]
+        return np.frombuffer(blob, dtype=np.uint32)
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM postings').fetchone()[0]
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
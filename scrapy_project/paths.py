@@ -0,0 +1,16 @@
+import os
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def data_path(*parts):
+    """Return a path inside the data directory (JOB_DATA_DIR overrides it), creating it if needed"""
+    base = os.path.abspath(os.getenv('JOB_DATA_DIR') or os.path.join(ROOT_DIR, 'data'))
+    os.makedirs(base, exist_ok=True)
+    return os.path.join(base, *parts)
+
+
+def config_path(name):
+    """Return the path of a file in the config directory (JOB_CONFIG_DIR overrides it)"""
+    base = os.getenv('JOB_CONFIG_DIR') or os.path.join(ROOT_DIR, 'config')
+    return os.path.join(base, name)
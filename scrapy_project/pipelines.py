@@ -1,62 +1,132 @@
 import re
 import os
 import json
+import time
 from datetime import datetime, timedelta
 from itemadapter import ItemAdapter
-from scrapy.exceptions import DropItem
+from scrapy.exceptions import DropItem, NotConfigured
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
-import pandas as pd
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from scrapy_project.seen_store import (CHANGED, UNCHANGED, build_unique_id, content_fingerprint,
+                                       open_seen_store, release_seen_store)
+from scrapy_project.near_duplicates import NearDuplicateIndex, band_keys, minhash, normalize_location, shingle_hashes
+from scrapy_project.analysis import find_emails
+from scrapy_project.filters import RULES, get_filter
+from scrapy_project.salary import extract_salary, format_salary
+from scrapy_project.scoring import get_scorer
+from scrapy_project.relevance import RelevanceIndex, job_text, profile_terms
+from scrapy_project.checkpoint import FlushSchedule, WriteAheadLog
+from scrapy_project.job_store import open_job_store, release_job_store
+from scrapy_project.sheets_sync import MeteredWriter, SheetsSync, SheetsWriter, get_writer, open_worksheet
+from scrapy_project.archive import ROW_GROUP_SIZE, ArchiveWriter
+from scrapy_project.search import SearchIndex
+from scrapy_project.blob_store import BlobStore
+from scrapy_project.shared import open_shared, release_shared
+from scrapy_project.paths import data_path
+
+# Fields whose cleaned content decides whether a known posting has changed
+FINGERPRINT_FIELDS = ['title', 'company', 'location', 'salary', 'job_type', 'description']
+
+def clean_text(value):
+    """Collapse whitespace and strip characters that break CSV/Sheets output"""
+    cleaned = re.sub(r'\s+', ' ', str(value)).strip()
+    cleaned = cleaned.replace('\n', ' ').replace('\r', ' ')
+    return cleaned.replace('"', "'")  # Prevent CSV issues
 
 class DuplicatesPipeline:
+    legacy_ids_file = 'processed_jobs.json'
+
     def __init__(self):
-        self.ids_seen = set()
-        self.load_existing_ids()
-    
-    def load_existing_ids(self):
-        """Load existing job IDs to avoid re-processing"""
-        try:
-            if os.path.exists('processed_jobs.json'):
-                with open('processed_jobs.json', 'r') as f:
-                    data = json.load(f)
-                    self.ids_seen = set(data.get('job_ids', []))
-        except Exception as e:
-            print(f"Error loading existing IDs: {e}")
-    
-    def save_job_ids(self):
-        """Save processed job IDs"""
+        self.store = None
+        self.schedule = FlushSchedule()
+
+    def open_spider(self, spider):
+        # The store's log is unbuffered, so IDs survive a killed process and are
+        # replayed on the next open; the periodic fsync covers power loss too
+        self.store = open_seen_store()
+        self.migrate_legacy_ids(spider)
+        if os.getenv('SEEN_TTL_DAYS'):
+            # Evict IDs older than the TTL window while the crawl gets going
+            self.store.compact_in_background()
+
+    def migrate_legacy_ids(self, spider):
+        """Import processed_jobs.json into an empty seen-ID store"""
+        if not self.store.is_empty() or not os.path.exists(self.legacy_ids_file):
+            return
         try:
-            with open('processed_jobs.json', 'w') as f:
-                json.dump({'job_ids': list(self.ids_seen)}, f)
+            added = self.store.import_json(self.legacy_ids_file)
+            spider.logger.info(f"Imported {added} job IDs from {self.legacy_ids_file}")
         except Exception as e:
-            print(f"Error saving job IDs: {e}")
-    
+            spider.logger.error(f"Error importing existing IDs: {e}")
+
     def process_item(self, item, spider):
         adapter = ItemAdapter(item)
-        
-        # Create unique identifier
-        job_id = adapter.get('job_id', '')
-        company = adapter.get('company', '').lower().replace(' ', '_')
-        title = adapter.get('title', '').lower().replace(' ', '_')
-        
-        if not job_id:
-            job_id = f"{company}_{title}"
-            job_id = re.sub(r'[^a-z0-9_]', '', job_id)
-        
-        unique_id = f"{job_id}_{adapter.get('source', '')}"
-        
-        if unique_id in self.ids_seen:
+
+        unique_id = build_unique_id(adapter.get('job_id', ''), adapter.get('company', ''),
+                                    adapter.get('title', ''), adapter.get('source', ''))
+
+        fingerprint = content_fingerprint(
+            clean_text(adapter.get(field) or '') for field in FINGERPRINT_FIELDS)
+        change = self.store.observe(unique_id, fingerprint)
+
+        if change == UNCHANGED:
             raise DropItem(f"Duplicate item found: {unique_id}")
-        else:
-            self.ids_seen.add(unique_id)
-            adapter['unique_id'] = unique_id
-            return item
-    
+        if change == CHANGED:
+            spider.crawler.stats.inc_value('seen_store/changed', spider=spider)
+        adapter['unique_id'] = unique_id
+        adapter['change_type'] = change
+        if self.schedule.tick():
+            self.checkpoint(spider)
+        return item
+
+    def checkpoint(self, spider):
+        started = time.perf_counter()
+        self.store.flush()
+        self.schedule.reset()
+        stats = spider.crawler.stats
+        stats.inc_value('checkpoint/seen_store_flush_count', spider=spider)
+        stats.max_value('checkpoint/seen_store_flush_ms_max',
+                        round((time.perf_counter() - started) * 1000, 2), spider=spider)
+
+    def close_spider(self, spider):
+        self.store.flush()
+        for key, value in self.store.stats().items():
+            spider.crawler.stats.set_value(f'seen_store/{key}', value, spider=spider)
+        release_seen_store(self.store)
+
+class JobFiltersPipeline:
+    """Drop jobs that fail job_filters.json or company_blacklist.json once the full posting is known"""
+
+    def __init__(self, stats):
+        self.stats = stats
+        self.filter = get_filter()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool('JOB_FILTERS_ENABLED', True):
+            raise NotConfigured
+        return cls(crawler.stats)
+
+    def process_item(self, item, spider):
+        adapter = ItemAdapter(item)
+        rule = self.filter.check_item(adapter)
+        if rule:
+            self.stats.inc_value(f'filters/item/{rule}', spider=spider)
+            raise DropItem(f"Filtered by {rule}: {adapter.get('company')} - {adapter.get('title')}")
+        return item
+
     def close_spider(self, spider):
-        self.save_job_ids()
+        counts = []
+        for rule in RULES:
+            dropped = sum(self.stats.get_value(f'filters/{stage}/{rule}', 0, spider=spider)
+                          for stage in ('list_page', 'item'))
+            if dropped:
+                counts.append(f"{rule}={dropped}")
+        if counts:
+            spider.logger.info(f"Filtered jobs by rule: {', '.join(counts)}")
 
 class DataCleaningPipeline:
     def process_item(self, item, spider):
@@ -67,20 +137,16 @@ class DataCleaningPipeline:
         for field in text_fields:
             value = adapter.get(field)
             if value:
-                # Remove extra whitespace and normalize
-                cleaned = re.sub(r'\s+', ' ', str(value)).strip()
-                # Remove problematic characters
-                cleaned = cleaned.replace('\n', ' ').replace('\r', ' ')
-                cleaned = cleaned.replace('"', "'")  # Prevent CSV issues
-                adapter[field] = cleaned
+                adapter[field] = clean_text(value)
         
-        # Standardize salary
-        salary = adapter.get('salary')
+        # Structured, annualized salary from the snippet (or failing that, the description)
+        salary = extract_salary(adapter.get('salary'), adapter.get('description'))
         if salary:
-            # Extract and format salary numbers
-            salary_numbers = re.findall(r'\$[\d,]+', salary)
-            if salary_numbers:
-                adapter['salary'] = ' - '.join(salary_numbers)
+            adapter['salary'] = format_salary(salary)
+            adapter['salary_min'] = salary.min
+            adapter['salary_max'] = salary.max
+            adapter['salary_currency'] = salary.currency
+            adapter['salary_period'] = salary.period
         
         # Set defaults
         adapter.setdefault('application_status', 'Not Applied')
@@ -91,6 +157,130 @@ class DataCleaningPipeline:
         
         return item
 
+class NearDuplicatesPipeline:
+    """Catch the same posting scraped from different sources (Indeed, LinkedIn, company pages)"""
+
+    def __init__(self):
+        self.action = os.getenv('NEAR_DUPLICATE_ACTION', 'link').lower()  # link or drop
+        self.threshold = float(os.getenv('NEAR_DUPLICATE_THRESHOLD', '0.8'))
+        self.commit_every = 50
+        self.index = None
+        self.pending = 0
+
+    def open_spider(self, spider):
+        self.index = open_shared(NearDuplicateIndex, threshold=self.threshold)
+
+    def process_item(self, item, spider):
+        adapter = ItemAdapter(item)
+        unique_id = adapter.get('unique_id')
+        signature = minhash(shingle_hashes(adapter.get('title'), adapter.get('company'),
+                                           adapter.get('description')))
+        keys = band_keys(signature)
+        # The same posting for another city is a separate job, so only the same location can match
+        location = normalize_location(adapter.get('location'))
+
+        match = self.index.find(signature, keys, exclude=unique_id, location=location)
+        if match:
+            original_id, score = match
+            if self.action == 'drop':
+                spider.crawler.stats.inc_value('near_duplicates/dropped', spider=spider)
+                raise DropItem(f"Near-duplicate of {original_id} ({score:.2f}): {unique_id}")
+            adapter['duplicate_of'] = original_id
+            spider.crawler.stats.inc_value('near_duplicates/linked', spider=spider)
+            return item
+
+        self.index.add(unique_id, signature, keys, location)
+        spider.crawler.stats.inc_value('near_duplicates/indexed', spider=spider)
+        self.pending += 1
+        if self.pending >= self.commit_every:
+            self.index.commit()
+            self.pending = 0
+        return item
+
+    def close_spider(self, spider):
+        release_shared(self.index)
+
+class RelevancePipeline:
+    """Fill match_score with the BM25 relevance of the posting to the keyword profile"""
+
+    def __init__(self):
+        self.commit_every = 50
+        self.index = None
+        self.pending = 0
+
+    def open_spider(self, spider):
+        self.index = open_shared(RelevanceIndex)
+
+    def process_item(self, item, spider):
+        adapter = ItemAdapter(item)
+        terms, length = profile_terms(job_text(adapter.get('title'), adapter.get('description')))
+        self.index.add(adapter.get('unique_id'), terms, length)
+        adapter['match_score'] = round(self.index.score(terms, length), 2)
+        self.pending += 1
+        if self.pending >= self.commit_every:
+            self.index.commit()
+            self.pending = 0
+        return item
+
+    def close_spider(self, spider):
+        spider.crawler.stats.set_value('relevance/documents', len(self.index), spider=spider)
+        release_shared(self.index)
+
+class PriorityScoringPipeline:
+    """Score items in micro-batches with the weights in config/scoring.json"""
+
+    def __init__(self, stats, batch_size=32, max_wait=0.5):
+        self.stats = stats
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.scorer = get_scorer()
+        self.pending = []
+        self.flush_call = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler.stats, crawler.settings.getint('SCORING_BATCH_SIZE', 32),
+                   crawler.settings.getfloat('SCORING_MAX_WAIT', 0.5))
+
+    def process_item(self, item, spider):
+        from twisted.internet import defer, reactor
+
+        # Hold the item until its batch is full or max_wait passes, whichever is first
+        d = defer.Deferred()
+        self.pending.append((item, d))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+        elif self.flush_call is None:
+            self.flush_call = reactor.callLater(self.max_wait, self.flush)
+        return d
+
+    def flush(self):
+        if self.flush_call is not None and self.flush_call.active():
+            self.flush_call.cancel()
+        self.flush_call = None
+        batch, self.pending = self.pending, []
+        if not batch:
+            return
+
+        adapters = [ItemAdapter(item) for item, _ in batch]
+        try:
+            scores = self.scorer.score_many(adapters)
+            allowed = self.scorer.auto_apply_allowed(adapters, scores)
+        except Exception as e:
+            for _, d in batch:
+                d.errback(e)
+            return
+        for (item, d), adapter, score, ok in zip(batch, adapters, scores, allowed):
+            adapter['priority_score'] = int(score)
+            if not ok:
+                adapter['auto_apply_eligible'] = False
+            d.callback(item)
+        self.stats.inc_value('scoring/batches')
+        self.stats.max_value('scoring/batch_size_max', len(batch))
+
+    def close_spider(self, spider):
+        self.flush()
+
 class AutoApplicationPipeline:
     def __init__(self):
         self.applications_today = 0
@@ -269,16 +459,15 @@ class AutoApplicationPipeline:
             return False
         
         try:
-            # Look for contact email in job description
-            description = adapter.get('description', '')
-            email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            emails = re.findall(email_pattern, description)
+            # Spiders extract the contact email while analyzing the description
+            if 'email_found' in adapter:
+                contact_email = adapter.get('contact_email')
+            else:
+                contact_email = next(iter(find_emails(adapter.get('description', ''))), None)
             
-            if not emails:
+            if not contact_email:
                 return False
             
-            contact_email = emails[0]  # Use first found email
-            
             # Create email content
             subject = f"Application for {adapter.get('title')} position"
             
@@ -352,13 +541,202 @@ Job Reference: {adapter.get('job_url')}
             print(f"Email sending failed: {e}")
             return False
 
-class GoogleSheetsPipeline:
+class JobStorePipeline:
+    """Write every item to the local SQLite job store in batched transactions"""
+
     def __init__(self):
-        self.items = []
+        self.store = None
+        self.schedule = FlushSchedule()
+        self.written = 0
+
+    def open_spider(self, spider):
+        self.store = open_job_store()
+
+    def process_item(self, item, spider):
+        self.store.add(ItemAdapter(item))
+        # Counted here: GoogleSheetsPipeline also flushes the shared store
+        self.written += 1
+        if self.schedule.tick():
+            self.flush(spider)
+        return item
+
+    def flush(self, spider):
+        started = time.perf_counter()
+        written = self.store.flush()
+        self.schedule.reset()
+        if written:
+            stats = spider.crawler.stats
+            stats.inc_value('job_store/flush_count', spider=spider)
+            stats.max_value('job_store/flush_ms_max',
+                            round((time.perf_counter() - started) * 1000, 2), spider=spider)
+
+    def close_spider(self, spider):
+        self.flush(spider)
+        spider.crawler.stats.set_value('job_store/items_written', self.written, spider=spider)
+        release_job_store(self.store)
+
+class SearchIndexPipeline:
+    """Add every posting to the full-text search index"""
+
+    def __init__(self):
+        self.commit_every = 50
+        self.index = None
+        self.pending = 0
+
+    def open_spider(self, spider):
+        self.index = open_shared(SearchIndex)
+
+    def process_item(self, item, spider):
+        self.index.add(ItemAdapter(item))
+        self.pending += 1
+        if self.pending >= self.commit_every:
+            self.index.commit()
+            self.pending = 0
+        return item
+
+    def close_spider(self, spider):
+        spider.crawler.stats.set_value('search/documents', len(self.index), spider=spider)
+        release_shared(self.index)
+
+class DescriptionBlobPipeline:
+    """Move description text into the blob store, leaving its content hash on the item"""
+
+    def __init__(self):
+        self.commit_every = 50
+        self.blobs = None
+        self.pending = 0
+        self.training = None
+
+    def open_spider(self, spider):
+        self.blobs = open_shared(BlobStore)
+
+    def process_item(self, item, spider):
+        adapter = ItemAdapter(item)
+        description = adapter.get('description')
+        if description:
+            adapter['description_hash'] = self.blobs.put(description, train=False)
+            del adapter['description']
+            self.pending += 1
+            if self.pending >= self.commit_every:
+                self.blobs.commit()
+                self.pending = 0
+            if self.training is None and self.blobs.needs_training:
+                self.start_training(spider)
+        return item
+
+    def start_training(self, spider):
+        """Train the dictionary and recompress in a worker thread; items keep flowing meanwhile"""
+        from twisted.internet import threads
+
+        spider.logger.info("Training the description compression dictionary")
+        self.training = threads.deferToThread(self.blobs.train)
+        self.training.addBoth(self.finish_training, spider)
+
+    def finish_training(self, result, spider):
+        from twisted.python.failure import Failure
+
+        self.training = None
+        if isinstance(result, Failure):
+            spider.logger.error(f"Failed to train the description dictionary: {result.value}")
+        elif result is None:
+            spider.logger.info("Too few distinct descriptions to train a dictionary yet")
+
+    def close_spider(self, spider):
+        if self.training is not None:
+            # Let the worker finish with the store before it is released
+            return self.training.addCallback(lambda _: self.close(spider))
+        self.close(spider)
+
+    def close(self, spider):
+        stats = spider.crawler.stats
+        stats.set_value('blobs/stored', self.blobs.stored, spider=spider)
+        stats.set_value('blobs/duplicates', self.blobs.duplicates, spider=spider)
+        stats.set_value('blobs/bytes_in', self.blobs.bytes_in, spider=spider)
+        stats.set_value('blobs/bytes_stored', self.blobs.bytes_stored, spider=spider)
+        release_shared(self.blobs)
+
+class ArchivePipeline:
+    """Stream every item into the partitioned Parquet archive"""
+
+    def __init__(self, row_group_size=ROW_GROUP_SIZE):
+        self.writer = ArchiveWriter(row_group_size=row_group_size)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler.settings.getint('ARCHIVE_ROW_GROUP_SIZE', ROW_GROUP_SIZE))
+
+    def process_item(self, item, spider):
+        if self.writer.add(ItemAdapter(item)):
+            self.record_stats(spider)
+        return item
+
+    def record_stats(self, spider):
+        stats = spider.crawler.stats
+        stats.set_value('archive/row_groups', self.writer.row_groups, spider=spider)
+        stats.set_value('archive/items_written', self.writer.rows_written, spider=spider)
+        stats.max_value('archive/write_ms_max', round(self.writer.last_write_ms, 2), spider=spider)
+
+    def close_spider(self, spider):
+        self.writer.close()
+        self.record_stats(spider)
+        if self.writer.rows_written:
+            spider.logger.info(f"Archived {self.writer.rows_written} jobs in {self.writer.row_groups} row groups "
+                               f"under {self.writer.root}")
+
+class GoogleSheetsPipeline:
+    """Stream items to Google Sheets in chunks of SHEETS_BUFFER_ROWS.
+
+    Items are logged to a write-ahead file as they arrive; every buffer_rows
+    items the job store is flushed, its unsynced rows are pushed to the sheet
+    and the log is cleared, so memory stays flat and the sheet fills in while
+    the crawl runs. buffer_rows = 0 keeps everything for close_spider.
+
+    A flush waits on the Sheets request budget and on retry backoff, so it runs
+    in a worker thread, one at a time. The item that triggered it is held until
+    it finishes, which lets Scrapy slow the crawl down when Sheets falls behind
+    instead of stalling the reactor. Items that arrive during a flush stay in
+    the log for the next one.
+    """
+
+    def __init__(self, buffer_rows=200, chunk_rows=500, writer=None):
+        self.buffer_rows = buffer_rows
+        self.chunk_rows = chunk_rows
+        self.writer = writer or SheetsWriter()
+        self.buffered = 0
+        self.unflushed = 0
+        self.lock = None
+        self.wal = None
+        self.store = None
+        self.client = None
+        self.worksheet = None
         self.sheet_id = os.getenv('GOOGLE_SHEETS_JOB_ID')
         self.credentials_path = os.getenv('GOOGLE_CREDENTIALS_PATH', 'google_credentials.json')
-        
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        # Shared, so spiders crawling in one process draw on one request quota; metered so
+        # each spider's stats count only its own requests
+        writer = MeteredWriter(get_writer(settings.getint('SHEETS_REQUESTS_PER_MINUTE', 60),
+                                          settings.getint('SHEETS_MAX_RETRIES', 5)))
+        return cls(settings.getint('SHEETS_BUFFER_ROWS', 200), settings.getint('SHEETS_CHUNK_ROWS', 500), writer)
+
     def open_spider(self, spider):
+        from twisted.internet import defer
+
+        self.lock = defer.DeferredLock()
+        self.store = open_job_store()
+        # Items accepted but not yet delivered are logged here until a flush succeeds
+        self.wal = WriteAheadLog(data_path(f'{spider.name}_pending_items.jsonl'))
+        recovered = self.wal.pending()
+        if recovered:
+            spider.logger.info(f"Recovered {len(recovered)} undelivered items from an interrupted run")
+            spider.crawler.stats.set_value('checkpoint/replayed_items', len(recovered), spider=spider)
+            # The interrupted run may have died before its job store batch was written
+            for row in recovered:
+                self.store.add(row)
+            self.buffered = self.unflushed = len(recovered)
+
         if not self.sheet_id:
             spider.logger.warning("Google Sheets ID not provided")
             return
@@ -377,92 +755,106 @@ class GoogleSheetsPipeline:
             self.client = None
     
     def process_item(self, item, spider):
-        self.items.append(ItemAdapter(item).asdict())
+        if self.wal.append(ItemAdapter(item).asdict()):
+            self.record_checkpoint(spider)
+        self.buffered += 1
+        self.unflushed += 1
+        if self.buffer_rows and self.unflushed >= self.buffer_rows:
+            return self.flush(spider).addCallback(lambda _: item)
         return item
-    
-    def close_spider(self, spider):
-        if not self.items:
-            return
-        
-        # Save to local backup
-        self.save_local_backup(spider)
-        
-        # Save to Google Sheets
+
+    def flush(self, spider):
+        """Deliver everything buffered so far; the Deferred fires with True if every sink took it"""
+        self.unflushed = 0
+        # Queued behind a flush in progress, starting from wherever that one ended
+        return self.lock.run(self.start_flush, spider)
+
+    def start_flush(self, spider):
+        from twisted.internet import threads
+
+        started = time.perf_counter()
+        # Undelivered items must survive a crash whatever the outcome
+        self.wal.sync()
+        logged, buffered = self.wal.tell(), self.buffered
+        usage = self.api_usage()
+        d = threads.deferToThread(self.deliver, spider)
+        d.addCallback(self.finish_flush, spider, started, logged, buffered, usage)
+        return d
+
+    def api_usage(self):
+        return self.writer.requests, self.writer.retries, self.writer.throttled_seconds
+
+    def deliver(self, spider):
+        """Write the job store and push it to the sheet; runs in a worker thread"""
+        # JobStorePipeline may still hold the latest items
+        self.store.flush()
         if self.client and self.sheet_id:
-            self.save_to_google_sheets(spider)
-    
-    def save_local_backup(self, spider):
-        """Save to local Excel file as backup"""
-        try:
-            df = pd.DataFrame(self.items)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"jobs_backup_{spider.name}_{timestamp}.xlsx"
-            df.to_excel(filename, index=False)
-            spider.logger.info(f"Saved {len(self.items)} jobs to {filename}")
-        except Exception as e:
-            spider.logger.error(f"Failed to save local backup: {e}")
+            return self.save_to_google_sheets(spider)
+        return True, None
+
+    def finish_flush(self, result, spider, started, logged, buffered, usage):
+        delivered, sync = result
+        if delivered:
+            self.wal.checkpoint(logged)
+            self.buffered -= buffered
+        self.record_checkpoint(spider)
+
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+        stats = spider.crawler.stats
+        if sync is not None:
+            stats.inc_value('sheets/rows_appended', sync.rows_appended, spider=spider)
+            stats.inc_value('sheets/rows_updated', sync.rows_updated, spider=spider)
+            stats.inc_value('sheets/cells_updated', sync.cells_updated, spider=spider)
+        if self.client and self.sheet_id:
+            # Only the requests this flush made
+            requests, retries, throttled = (now - before for now, before in zip(self.api_usage(), usage))
+            stats.inc_value('sheets/api_requests', requests, spider=spider)
+            stats.inc_value('sheets/api_retries', retries, spider=spider)
+            stats.inc_value('sheets/throttled_seconds', round(throttled, 2), spider=spider)
+        stats.inc_value('sheets/flush_count', spider=spider)
+        stats.set_value('sheets/flush_ms_last', elapsed_ms, spider=spider)
+        stats.max_value('sheets/flush_ms_max', elapsed_ms, spider=spider)
+        stats.inc_value('sheets/flush_ms_total', elapsed_ms, spider=spider)
+        if not delivered:
+            stats.inc_value('sheets/flush_failures', spider=spider)
+        return delivered
+
+    def record_checkpoint(self, spider):
+        stats = spider.crawler.stats
+        stats.set_value('checkpoint/flush_count', self.wal.flush_count, spider=spider)
+        stats.set_value('checkpoint/flush_ms_last', round(self.wal.last_flush_ms, 2), spider=spider)
+        stats.max_value('checkpoint/flush_ms_max', round(self.wal.last_flush_ms, 2), spider=spider)
+        stats.set_value('checkpoint/wal_bytes', self.wal.size, spider=spider)
     
+    def close_spider(self, spider):
+        # Runs even with nothing buffered, to retry jobs an earlier run failed to push
+        d = self.flush(spider)
+        d.addCallback(self.warn_undelivered, spider)
+        d.addBoth(self.release, spider)
+        return d
+
+    def warn_undelivered(self, delivered, spider):
+        if not delivered:
+            spider.logger.warning(f"Keeping {self.buffered} items in {self.wal.path} for the next run")
+
+    def release(self, result, spider):
+        self.wal.close()
+        release_job_store(self.store)
+        return result
+
     def save_to_google_sheets(self, spider):
-        """Save jobs to Google Sheets with proper formatting"""
+        """Push jobs from the job store that are not in the sheet yet; returns (delivered, SheetsSync)"""
+        sync = None
         try:
-            sheet = self.client.open_by_key(self.sheet_id)
-            
-            # Get or create worksheet
-            worksheet_name = "Job Pipeline"
-            try:
-                worksheet = sheet.worksheet(worksheet_name)
-            except gspread.WorksheetNotFound:
-                worksheet = sheet.add_worksheet(title=worksheet_name, rows=1000, cols=25)
-                
-                # Add headers
-                headers = [
-                    'Date', 'Priority', 'Status', 'Title', 'Company', 'Location',
-                    'Salary', 'Source', 'Keywords', 'Experience Level', 'Remote',
-                    'Priority Score', 'Job URL', 'Apply URL', 'Easy Apply',
-                    'Application Method', 'Auto Apply Eligible', 'Application Status',
-                    'Notes', 'Posted Date', 'Scraped Date', 'Follow Up Date',
-                    'Applied Date', 'Response Date', 'Next Action'
-                ]
-                
-                worksheet.insert_row(headers, 1)
-            
-            # Prepare data
-            data_rows = []
-            for item in self.items:
-                row = [
-                    datetime.now().strftime("%Y-%m-%d"),  # Date
-                    item.get('priority_score', 0),  # Priority
-                    item.get('application_status', 'Not Applied'),  # Status
-                    item.get('title', ''),  # Title
-                    item.get('company', ''),  # Company
-                    item.get('location', ''),  # Location
-                    item.get('salary', ''),  # Salary
-                    item.get('source', ''),  # Source
-                    ', '.join(item.get('keywords', [])),  # Keywords
-                    item.get('experience_level', ''),  # Experience Level
-                    'Yes' if item.get('remote_friendly') else 'No',  # Remote
-                    item.get('priority_score', 0),  # Priority Score
-                    item.get('job_url', ''),  # Job URL
-                    item.get('apply_url', ''),  # Apply URL
-                    'Yes' if item.get('easy_apply_available') else 'No',  # Easy Apply
-                    item.get('application_method', ''),  # Application Method
-                    'Yes' if item.get('auto_apply_eligible') else 'No',  # Auto Apply Eligible
-                    item.get('application_status', 'Not Applied'),  # Application Status
-                    item.get('notes', ''),  # Notes
-                    item.get('posted_date', ''),  # Posted Date
-                    item.get('scraped_date', ''),  # Scraped Date
-                    '',  # Follow Up Date
-                    '',  # Applied Date
-                    '',  # Response Date
-                    'Review & Apply' if item.get('priority_score', 0) >= 20 else 'Low Priority'  # Next Action
-                ]
-                data_rows.append(row)
-            
-            # Append data to sheet
-            if data_rows:
-                worksheet.append_rows(data_rows)
-                spider.logger.info(f"Added {len(data_rows)} jobs to Google Sheets")
-            
+            if self.worksheet is None:
+                self.worksheet = open_worksheet(self.client, self.sheet_id, self.writer)
+            sync = SheetsSync(self.store, self.worksheet, self.chunk_rows, self.writer)
+            sync.push()
+            if sync.rows_appended or sync.cells_updated:
+                spider.logger.info(f"Added {sync.rows_appended} jobs to Google Sheets and updated "
+                                   f"{sync.cells_updated} cells of {sync.rows_updated} changed jobs")
+            return True, sync
         except Exception as e:
+            # Unsent jobs stay unsynced in the job store and go with the next push
             spider.logger.error(f"Failed to save to Google Sheets: {e}")
-
+            return False, sync
@@ -0,0 +1,115 @@
+"""
+Compact in-memory form of a job item for buffers that hold many of them.
+
+A JobItem is a dict of 37 fields plus a list per item for its keywords. A
+JobRecord keeps the same fields in __slots__. Repeated strings (company,
+source, location, status...) are interned, so thousands of postings from the
+same company share one string. Keywords are stored as an integer bitmask over
+the skills vocabulary of config/keywords.json, and only skills outside the
+vocabulary are kept as a tuple.
+
+Records convert from a JobItem where a buffer takes it in and back with
+to_item() only where one has to leave as an item. Code that reads items with
+.get() (the job store, the scorer, the Sheets row builder, the archive writer)
+reads records the same way.
+"""
+import sys
+
+from scrapy_project.items import JobItem
+from scrapy_project.keyword_matcher import get_matcher
+
+ITEM_FIELDS = frozenset(JobItem.fields)
+# Low-cardinality text fields shared by many postings
+INTERNED_FIELDS = frozenset({'company', 'source', 'location', 'job_type', 'salary_currency', 'salary_period',
+                             'change_type', 'experience_level', 'application_status', 'application_method',
+                             'application_complexity'})
+_STORED_FIELDS = tuple(sorted(name for name in ITEM_FIELDS if name != 'keywords'))
+
+
+class KeywordVocabulary:
+    """Bit positions for keyword names"""
+
+    def __init__(self, names):
+        self.names = tuple(names)
+        self.bits = {name: 1 << i for i, name in enumerate(self.names)}
+
+    def encode(self, keywords):
+        """(bitmask of known keywords, tuple of the others)"""
+        mask = 0
+        extras = []
+        for keyword in keywords or ():
+            bit = self.bits.get(keyword)
+            if bit is None:
+                extras.append(sys.intern(str(keyword)))
+            else:
+                mask |= bit
+        return mask, tuple(extras)
+
+    def decode(self, mask, extras=()):
+        """Keyword names in vocabulary order, then the extras"""
+        names = []
+        i = 0
+        while mask:
+            if mask & 1:
+                names.append(self.names[i])
+            mask >>= 1
+            i += 1
+        names.extend(extras)
+        return names
+
+
+_vocabulary = None
+
+
+def get_vocabulary():
+    """Shared vocabulary of the skills the keyword matcher reports"""
+    global _vocabulary
+    if _vocabulary is None:
+        _vocabulary = KeywordVocabulary(get_matcher().vocabulary('skills'))
+    return _vocabulary
+
+
+class JobRecord:
+    __slots__ = _STORED_FIELDS + ('keyword_mask', 'extra_keywords')
+
+    def __init__(self, fields=None):
+        fields = fields or {}
+        for name in _STORED_FIELDS:
+            value = fields.get(name)
+            if name in INTERNED_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(self, name, value)
+        self.keyword_mask, self.extra_keywords = get_vocabulary().encode(fields.get('keywords'))
+
+    @classmethod
+    def from_item(cls, item):
+        """Record of a JobItem, dict or ItemAdapter"""
+        return cls(item)
+
+    @property
+    def keywords(self):
+        return get_vocabulary().decode(self.keyword_mask, self.extra_keywords)
+
+    def get(self, name, default=None):
+        """Field value, like dict.get on the item the record came from"""
+        if name == 'keywords':
+            return self.keywords
+        value = getattr(self, name, None) if name in ITEM_FIELDS else None
+        return default if value is None else value
+
+    def __getitem__(self, name):
+        if name not in ITEM_FIELDS:
+            raise KeyError(name)
+        return self.get(name)
+
+    def asdict(self):
+        """{field: value} for the fields that are set"""
+        fields = {name: getattr(self, name) for name in _STORED_FIELDS if getattr(self, name) is not None}
+        fields['keywords'] = self.keywords
+        return fields
+
+    def to_item(self):
+        return JobItem(**self.asdict())
+
+    def __repr__(self):
+        return f"JobRecord({self.unique_id!r}, {self.title!r}, {self.company!r})"
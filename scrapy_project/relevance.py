@@ -0,0 +1,122 @@
+"""
+BM25 relevance of job postings against the keyword profile.
+
+The profile is every job title, technical skill and soft skill in
+config/keywords.json (synonyms count as the skill they stand for). The keyword
+matcher counts profile terms in a posting's title and description in one pass,
+and BM25 weighs those counts by how rare each term is across the stored corpus.
+
+Document frequencies live in SQLite and are updated as each item is added.
+Only profile terms are counted, so the frequencies of the ~200 profile terms
+are cached in memory and scoring an item costs O(matched terms). Every
+posting's term counts are stored too, which lets rescore_all() rerank the
+whole corpus with up-to-date frequencies without re-reading any text.
+"""
+import json
+import math
+import sqlite3
+
+from scrapy_project.keyword_matcher import get_matcher, tokenize
+from scrapy_project.paths import data_path
+
+PROFILE_GROUPS = ('titles', 'skills', 'soft_skills')
+K1 = 1.2
+B = 0.75
+
+
+def profile_terms(text):
+    """({term: occurrences} of profile terms in text, document length in tokens)"""
+    tokens = tokenize(text) if text else []
+    counts = get_matcher().count_tokens(tokens, PROFILE_GROUPS)
+    return {f'{group}:{name}': count for (group, name), count in counts.items()}, len(tokens)
+
+
+def job_text(title, description):
+    return f"{title or ''} {description or ''}"
+
+
+class RelevanceIndex:
+    def __init__(self, path=None):
+        self.path = path or data_path('relevance.db')
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS documents (
+                unique_id TEXT PRIMARY KEY,
+                length INTEGER NOT NULL,
+                terms TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS doc_freq (
+                term TEXT PRIMARY KEY,
+                df INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS corpus (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            INSERT OR IGNORE INTO corpus VALUES ('doc_count', 0), ('total_length', 0);
+        ''')
+        self.conn.commit()
+        self.reload()
+
+    def reload(self):
+        """Refresh the cached corpus statistics (other processes may have added documents)"""
+        self.df = dict(self.conn.execute('SELECT term, df FROM doc_freq'))
+        totals = dict(self.conn.execute('SELECT key, value FROM corpus'))
+        self.doc_count = totals.get('doc_count', 0)
+        self.total_length = totals.get('total_length', 0)
+
+    def add(self, unique_id, terms, length):
+        """Count a document in the corpus, replacing any earlier version of the same unique_id"""
+        old = self.conn.execute('SELECT length, terms FROM documents WHERE unique_id = ?',
+                                (unique_id,)).fetchone()
+        doc_delta, length_delta = 1, length
+        df_delta = dict.fromkeys(terms, 1)
+        if old:
+            doc_delta, length_delta = 0, length - old[0]
+            for term in json.loads(old[1]):
+                df_delta[term] = df_delta.get(term, 0) - 1
+
+        self.conn.execute('INSERT OR REPLACE INTO documents (unique_id, length, terms) VALUES (?, ?, ?)',
+                          (unique_id, length, json.dumps(terms)))
+        changes = [(term, delta) for term, delta in df_delta.items() if delta]
+        self.conn.executemany('''
+            INSERT INTO doc_freq (term, df) VALUES (?1, ?2)
+            ON CONFLICT(term) DO UPDATE SET df = df + ?2
+        ''', changes)
+        self.conn.executemany('UPDATE corpus SET value = value + ? WHERE key = ?',
+                              [(doc_delta, 'doc_count'), (length_delta, 'total_length')])
+
+        for term, delta in changes:
+            self.df[term] = self.df.get(term, 0) + delta
+        self.doc_count += doc_delta
+        self.total_length += length_delta
+
+    def idf(self, term):
+        df = self.df.get(term, 0)
+        return math.log((self.doc_count - df + 0.5) / (df + 0.5) + 1)
+
+    def score(self, terms, length):
+        """BM25 of a document's profile-term counts against the cached corpus statistics"""
+        if not terms or not self.doc_count:
+            return 0.0
+        avg_length = self.total_length / self.doc_count or 1
+        norm = K1 * (1 - B + B * length / avg_length)
+        return sum(self.idf(term) * tf * (K1 + 1) / (tf + norm) for term, tf in terms.items())
+
+    def rescore_all(self):
+        """Yield (unique_id, score) for every stored document with current frequencies"""
+        self.reload()
+        for unique_id, length, terms in self.conn.execute('SELECT unique_id, length, terms FROM documents'):
+            yield unique_id, self.score(json.loads(terms), length)
+
+    def __len__(self):
+        return self.doc_count
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
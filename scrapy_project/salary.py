@@ -0,0 +1,104 @@
+"""
+Structured salary extraction.
+
+One compiled regex finds a pay figure or range ("$150K - $180K",
+"£45,000 to £55,000 per annum", "USD 60-70/hr") together with the pay period
+that follows it. Amounts are annualized, so items carry numeric salary_min and
+salary_max that filters and reports can compare directly. The salary snippet
+is searched first; the description only when the snippet has no figure, and
+there a lone amount must look like pay (a K suffix, a period or a yearly-sized
+number) so "$5 million in funding" is not read as a salary. In a snippet a lone
+amount with neither needs a pay word ("Salary: $95,000") or nothing else
+around it, and figures followed by "bonus", "stipend" and the like never
+count. Millions are never a salary.
+"""
+import re
+from collections import namedtuple
+
+Salary = namedtuple('Salary', 'min max currency period')
+
+CURRENCIES = {'$': 'USD', 'usd': 'USD', 'us$': 'USD', 'cad': 'CAD', 'c$': 'CAD',
+              '£': 'GBP', 'gbp': 'GBP', '€': 'EUR', 'eur': 'EUR'}
+# Multipliers that turn a quoted rate into a yearly figure
+PERIODS = {'hour': 2080, 'day': 260, 'week': 52, 'month': 12, 'year': 1}
+_PERIOD_WORDS = {
+    'hour': 'hour', 'hr': 'hour', 'hourly': 'hour', 'h': 'hour',
+    'day': 'day', 'daily': 'day',
+    'week': 'week', 'wk': 'week', 'weekly': 'week',
+    'month': 'month', 'mo': 'month', 'monthly': 'month',
+    'year': 'year', 'yr': 'year', 'annum': 'year', 'annually': 'year', 'annual': 'year', 'yearly': 'year',
+}
+_SYMBOLS = {'year': 'a year', 'hour': 'an hour', 'day': 'a day', 'week': 'a week', 'month': 'a month'}
+
+# Never a partial number: "$2.5M" must not match as "$2" and "$95,000" not as "$95"
+_AMOUNT = r'(\d{1,3}(?:,\d{3})+|\d+(?:\.\d+)?)(?![.,]?\d)(?:\s*([kK])\b)?'
+_CURRENCY = r'(US\$|C\$|USD|CAD|GBP|EUR|\$|£|€)'
+_SALARY_RE = re.compile(
+    _CURRENCY + r'\s*' + _AMOUNT +
+    r'(?:\s*(?:-|–|—|to)\s*' + _CURRENCY + r'?\s*' + _AMOUNT + r')?'
+    r'(?!\s*(?:million|billion|mm|bn|m\b|b\b))'
+    r'(?:\s*(?:/|an?|per)\s*(' + '|'.join(sorted(_PERIOD_WORDS, key=len, reverse=True)) + r')\b'
+    r'|\s+(hourly|daily|weekly|monthly|annually|yearly))?',
+    re.IGNORECASE)
+# Words that make a lone snippet figure a salary, and ones that make any figure something else
+_PAY_WORDS_RE = re.compile(r'\b(?:salary|salaries|pay|paid|compensation|base|wages?|rate|earn|up to|from|starting)\b',
+                           re.IGNORECASE)
+_NOT_PAY_RE = re.compile(r'\s*(?:(?:signing|sign-on|referral|relocation|retention|annual)\s+)?'
+                         r'(?:bonus|stipend|allowance|reimbursement|credit|gift card)', re.IGNORECASE)
+
+
+def _amount(number, thousands):
+    value = float(number.replace(',', ''))
+    return value * 1000 if thousands else value
+
+
+def _guess_period(value):
+    # Figures without a stated period: small ones are hourly rates
+    return 'hour' if value < 500 else 'year'
+
+
+def parse_salary(text, strict=False):
+    """Salary(min, max, currency, period) with annualized amounts, or None.
+
+    With strict=True (free text such as a description) a lone figure needs a K
+    suffix, a stated period or a yearly-sized value to count; otherwise one
+    without a K suffix or period needs a pay word or the text to itself.
+    """
+    if not text:
+        return None
+    for match in _SALARY_RE.finditer(text):
+        if _NOT_PAY_RE.match(text, match.end()):
+            continue
+        currency, low, low_k, _, high, high_k, period, trailing = match.groups()
+        if high is not None and high_k and not low_k:
+            low_k = high_k  # "$120-150K"
+        low_value = _amount(low, low_k)
+        high_value = _amount(high, high_k) if high is not None else low_value
+        period = _PERIOD_WORDS.get((period or trailing or '').lower())
+        if high is None and not (low_k or period):
+            if strict and low_value < 20000:
+                continue
+            if not strict and text.strip(' \t\n:;,.()') != match.group(0).strip() and not _PAY_WORDS_RE.search(text):
+                continue
+        if not low_value:
+            continue
+        period = period or _guess_period(max(low_value, high_value))
+        multiplier = PERIODS[period]
+        low_value, high_value = sorted((low_value * multiplier, high_value * multiplier))
+        return Salary(round(low_value), round(high_value), CURRENCIES[currency.lower()], period)
+    return None
+
+
+def extract_salary(snippet, description=None):
+    """parse_salary over the salary snippet, falling back to the description"""
+    return parse_salary(snippet) or parse_salary(description, strict=True)
+
+
+def format_salary(salary):
+    """Readable salary string such as "$50 - $60 an hour" in the quoted period"""
+    symbol = {'USD': '$', 'GBP': '£', 'EUR': '€'}.get(salary.currency, salary.currency + ' ')
+    multiplier = PERIODS[salary.period]
+    low, high = salary.min / multiplier, salary.max / multiplier
+    fmt = ',.2f' if low % 1 or high % 1 else ',.0f'
+    amount = f"{symbol}{low:{fmt}}" if low == high else f"{symbol}{low:{fmt}} - {symbol}{high:{fmt}}"
+    return f"{amount} {_SYMBOLS[salary.period]}"
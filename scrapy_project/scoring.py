@@ -0,0 +1,140 @@
+"""
+Priority scoring driven by config/scoring.json.
+
+Each job is reduced to a row of features (company tier from the company
+index, keyword hits, remote, salary listed, easy apply, recent posting) and
+its score is the dot product with the weight row for its source, capped at
+max_score. Scoring a batch is
+one NumPy matrix product, so PriorityScoringPipeline scores items in
+micro-batches and scripts/rescore_jobs.py can rescore the whole stored history
+after a weight change without touching the network.
+"""
+import json
+from datetime import datetime
+
+import numpy as np
+
+from scrapy_project.companies import get_company_index
+from scrapy_project.paths import config_path
+
+FEATURES = ('base', 'tier1_company', 'tier2_company', 'preferred_keyword', 'keyword',
+            'remote', 'salary_listed', 'easy_apply', 'recent_posting')
+_COLUMN = {name: i for i, name in enumerate(FEATURES)}
+
+
+def _keyword_list(value):
+    """Keywords as stored on an item (a list) or in a backup file (a string)"""
+    if isinstance(value, (list, tuple)):
+        return value
+    if not value or not isinstance(value, str):
+        return ()
+    return [k.strip(" '\"") for k in value.strip('[]').split(',') if k.strip(" '\"")]
+
+
+def _truthy(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ('true', 'yes', '1')
+    # NaN from a backup file counts as missing
+    return bool(value) and value == value
+
+
+class PriorityScorer:
+    def __init__(self, weights, sources=None, preferred_keywords=(), recent_days=2, max_score=50,
+                 auto_apply_min_score=None, company_index=None):
+        unknown = set(weights) - set(FEATURES)
+        if unknown:
+            raise ValueError(f"Unknown scoring features: {', '.join(sorted(unknown))}")
+        self.company_index = company_index or get_company_index()
+        self.preferred_keywords = frozenset(preferred_keywords)
+        self.recent_days = recent_days
+        self.max_score = max_score
+
+        # Row 0 holds the default weights; each configured source gets its own row
+        self.source_rows = {}
+        rows = [self._weight_row(weights, {})]
+        limits = [auto_apply_min_score]
+        for source, overrides in (sources or {}).items():
+            self.source_rows[source.lower()] = len(rows)
+            rows.append(self._weight_row(weights, overrides.get('weights', {})))
+            limits.append(overrides.get('auto_apply_min_score', auto_apply_min_score))
+        self.weights = np.array(rows, dtype=np.float64)
+        self.auto_apply_limits = np.array([-np.inf if l is None else l for l in limits], dtype=np.float64)
+
+    @staticmethod
+    def _weight_row(defaults, overrides):
+        merged = {**defaults, **overrides}
+        return [float(merged.get(name, 0)) for name in FEATURES]
+
+    @classmethod
+    def from_config(cls, path=None):
+        with open(path or config_path('scoring.json'), 'r') as f:
+            config = json.load(f)
+        return cls(
+            weights=config.get('weights', {}),
+            sources=config.get('sources'),
+            preferred_keywords=config.get('preferred_keywords', []),
+            recent_days=config.get('recent_days', 2),
+            max_score=config.get('max_score', 50),
+            auto_apply_min_score=config.get('auto_apply_min_score'),
+        )
+
+    def features(self, records, now=None):
+        """(len(records), len(FEATURES)) feature matrix for item-like mappings"""
+        now = now or datetime.now()
+        matrix = np.zeros((len(records), len(FEATURES)), dtype=np.float64)
+        matrix[:, _COLUMN['base']] = 1
+        for row, record in enumerate(records):
+            company = record.get('company')
+            tier = self.company_index.tier(company) if isinstance(company, str) else None
+            if tier == 1:
+                matrix[row, _COLUMN['tier1_company']] = 1
+            elif tier == 2:
+                matrix[row, _COLUMN['tier2_company']] = 1
+
+            keywords = _keyword_list(record.get('keywords'))
+            matrix[row, _COLUMN['keyword']] = len(keywords)
+            matrix[row, _COLUMN['preferred_keyword']] = sum(1 for k in keywords if k in self.preferred_keywords)
+
+            matrix[row, _COLUMN['remote']] = _truthy(record.get('remote_friendly'))
+            salary = record.get('salary')
+            matrix[row, _COLUMN['salary_listed']] = isinstance(salary, str) and bool(salary.strip())
+            matrix[row, _COLUMN['easy_apply']] = _truthy(record.get('easy_apply_available'))
+            matrix[row, _COLUMN['recent_posting']] = self.is_recent(record.get('posted_date'), now)
+        return matrix
+
+    def is_recent(self, posted_date, now):
+        if not posted_date or not isinstance(posted_date, str):
+            return False
+        try:
+            posted = datetime.fromisoformat(posted_date.replace('Z', '+00:00'))
+        except ValueError:
+            return False
+        return (now - posted.replace(tzinfo=None)).days <= self.recent_days
+
+    def source_index(self, records):
+        return np.fromiter((self.source_rows.get(str(r.get('source') or '').lower(), 0) for r in records),
+                           dtype=np.intp, count=len(records))
+
+    def score_many(self, records, now=None):
+        """Integer scores for a batch of records, one matrix product for the lot"""
+        rows = self.source_index(records)
+        scores = np.einsum('ij,ij->i', self.features(records, now), self.weights[rows])
+        return np.minimum(scores, self.max_score).astype(np.int64)
+
+    def auto_apply_allowed(self, records, scores):
+        """Boolean mask of records whose score clears their source's auto-apply minimum"""
+        return scores >= self.auto_apply_limits[self.source_index(records)]
+
+    def score_item(self, item):
+        return int(self.score_many([item])[0])
+
+
+_scorer = None
+
+
+def get_scorer():
+    """Shared scorer, built from config/scoring.json on first use"""
+    global _scorer
+    if _scorer is None:
+        _scorer = PriorityScorer.from_config()
+    return _scorer
@@ -0,0 +1,156 @@
+"""
+Full-text search over every posting ever scraped.
+
+Titles, companies and descriptions are indexed in an SQLite FTS5 table in
+data/search.db (porter-stemmed, so "pipelines" finds "pipeline"), with the
+columns used for filtering kept in an ordinary indexed table beside it. Hits
+are ranked by FTS5's BM25 with title matches weighted above company and
+description matches, and come back with a highlighted snippet of the
+description. A query touches only the posting lists of its terms, so searches
+stay in the milliseconds over hundreds of thousands of postings.
+
+Queries are plain words ("flink", "dbt and airflow", "kafka or pulsar",
+"spark not scala", '"data contracts"', "snow*"); every word must match unless
+OR is used.
+"""
+import re
+import sqlite3
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from scrapy_project.paths import data_path
+
+SearchHit = namedtuple('SearchHit', 'unique_id title company source location scraped_date job_url snippet score')
+
+# bm25() weights for the title, company and description columns
+COLUMN_WEIGHTS = (10.0, 5.0, 1.0)
+SNIPPET_TOKENS = 16
+
+_QUERY_TOKEN_RE = re.compile(r'"[^"]*"\*?|[()]|[^\s()"]+')
+_OPERATORS = {'and': 'AND', 'or': 'OR', 'not': 'NOT'}
+
+
+def match_query(text):
+    """FTS5 MATCH expression for a search box query; words are quoted so punctuation is literal"""
+    parts = []
+    for token in _QUERY_TOKEN_RE.findall(text or ''):
+        if token.lower() in _OPERATORS:
+            parts.append(_OPERATORS[token.lower()])
+        elif token in ('(', ')') or token.startswith('"'):
+            parts.append(token)
+        elif token.endswith('*') and len(token) > 1:
+            parts.append('"{}"*'.format(token[:-1].replace('"', '""')))
+        else:
+            parts.append('"{}"'.format(token.replace('"', '""')))
+    return ' '.join(parts)
+
+
+def cutoff(days):
+    """ISO timestamp `days` ago, comparable with scraped_date"""
+    return (datetime.now() - timedelta(days=days)).isoformat() if days else None
+
+
+class SearchIndex:
+    def __init__(self, path=None):
+        self.path = path or data_path('search.db')
+        self.conn = sqlite3.connect(self.path, timeout=30)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS postings (
+                id INTEGER PRIMARY KEY,
+                unique_id TEXT UNIQUE NOT NULL,
+                title TEXT,
+                company TEXT,
+                source TEXT,
+                location TEXT,
+                scraped_date TEXT,
+                job_url TEXT
+            );
+            CREATE INDEX IF NOT EXISTS postings_scraped_date ON postings (scraped_date);
+            CREATE VIRTUAL TABLE IF NOT EXISTS postings_fts USING fts5(
+                title, company, description,
+                tokenize = "porter unicode61 remove_diacritics 2 tokenchars '+#'"
+            );
+        ''')
+        self.conn.commit()
+
+    def add(self, record):
+        """Index a posting (a mapping of JobItem fields), replacing any earlier version"""
+        unique_id = record.get('unique_id')
+        if not unique_id:
+            return
+        row = (record.get('title'), record.get('company'), record.get('source'), record.get('location'),
+               record.get('scraped_date'), record.get('job_url'))
+        existing = self.conn.execute('SELECT id FROM postings WHERE unique_id = ?', (unique_id,)).fetchone()
+        if existing:
+            doc_id = existing[0]
+            self.conn.execute('UPDATE postings SET title = ?, company = ?, source = ?, location = ?, '
+                              'scraped_date = ?, job_url = ? WHERE id = ?', row + (doc_id,))
+            self.conn.execute('DELETE FROM postings_fts WHERE rowid = ?', (doc_id,))
+        else:
+            doc_id = self.conn.execute('INSERT INTO postings (unique_id, title, company, source, location, '
+                                       'scraped_date, job_url) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                       (unique_id,) + row).lastrowid
+        self.conn.execute('INSERT INTO postings_fts (rowid, title, company, description) VALUES (?, ?, ?, ?)',
+                          (doc_id, record.get('title') or '', record.get('company') or '',
+                           record.get('description') or ''))
+
+    def _where(self, query, days, sources):
+        where = ['postings_fts MATCH ?']
+        params = [match_query(query)]
+        if days:
+            where.append('p.scraped_date >= ?')
+            params.append(cutoff(days))
+        if sources:
+            where.append(f"p.source IN ({', '.join('?' * len(sources))})")
+            params.extend(sources)
+        return ' AND '.join(where), params
+
+    def search(self, query, days=None, sources=None, limit=20, highlight=('[', ']')):
+        """Best-matching postings first, as SearchHits with a highlighted description snippet"""
+        where, params = self._where(query, days, sources)
+        sql = f'''
+            SELECT p.unique_id, p.title, p.company, p.source, p.location, p.scraped_date, p.job_url,
+                   snippet(postings_fts, 2, ?, ?, '…', {SNIPPET_TOKENS}),
+                   -bm25(postings_fts, {', '.join(map(str, COLUMN_WEIGHTS))}) AS score
+            FROM postings_fts JOIN postings p ON p.id = postings_fts.rowid
+            WHERE {where}
+            ORDER BY score DESC
+            LIMIT ?
+        '''
+        try:
+            rows = self.conn.execute(sql, [*highlight, *params, limit]).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid search query {query!r}: {e}") from e
+        return [SearchHit(*row) for row in rows]
+
+    def companies(self, query, days=None, sources=None, limit=20):
+        """[(company, matching postings, latest scraped_date)] for companies whose postings match"""
+        where, params = self._where(query, days, sources)
+        try:
+            return self.conn.execute(f'''
+                SELECT p.company, COUNT(*) AS postings, MAX(p.scraped_date)
+                FROM postings_fts JOIN postings p ON p.id = postings_fts.rowid
+                WHERE {where}
+                GROUP BY p.company
+                ORDER BY postings DESC, p.company
+                LIMIT ?
+            ''', [*params, limit]).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid search query {query!r}: {e}") from e
+
+    def optimize(self):
+        """Merge the FTS segments written by incremental adds"""
+        self.conn.execute("INSERT INTO postings_fts (postings_fts) VALUES ('optimize')")
+        self.conn.commit()
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM postings').fetchone()[0]
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
@@ -0,0 +1,925 @@
+"""
+Append-only, memory-mapped store of job IDs that have already been scraped.
+
+Two files back the store:
+
+* ``<name>.log`` - append-only list of (ID hash, content fingerprint, first seen,
+  last seen) records.
+  This is the source of truth and survives a crawl that gets killed.
+* ``<name>.idx`` - open-addressing hash table over the same records. It is
+  memory mapped, so membership checks never load the whole set into Python.
+
+The index can always be rebuilt from the log. Compaction does exactly that,
+in a background thread, once the table gets too full. It also evicts IDs that
+have not been seen for longer than the configured TTL, so a job reposted after
+the window counts as new again.
+
+The content fingerprint lets the pipeline tell a repeat sighting of an
+unchanged posting from a known posting whose salary, description or location
+has changed.
+
+With more than one generation, IDs live in time-sliced segments instead. New
+IDs go into the hot segment; once a segment is older than the TTL it is
+deleted as a whole, which keeps both the hot set and eviction cheap.
+
+The memory-mapped files belong to a single process. When several spider
+processes (or containers on one volume) crawl at once, set
+SEEN_STORE_BACKEND=sqlite to share one SQLite database in WAL mode instead.
+"""
+import hashlib
+import json
+import logging
+import mmap
+import os
+import re
+import sqlite3
+import struct
+import threading
+import time
+from collections import namedtuple
+
+from scrapy_project.paths import data_path
+
+logger = logging.getLogger(__name__)
+
+INDEX_MAGIC = b'SEENIDX3'
+INDEX_VERSION = 3
+# magic, version, compacted_at, capacity, count, log_offset, evicted
+HEADER = struct.Struct('<8sIIQQQQ')
+HEADER_SIZE = 64
+SLOT_WORDS = 3   # key, fingerprint, first_seen | last_seen << 32
+
+LOG_MAGIC = b'SEENLOG3'
+LOG_HEADER = struct.Struct('<8s8x')
+RECORD = struct.Struct('<QQII')   # key, fingerprint, first_seen, last_seen
+# Older log formats, upgraded on open. Version 1 logs had no header at all.
+LEGACY_V1_RECORD = struct.Struct('<Q')
+LEGACY_V2_MAGIC = b'SEENLOG2'
+LEGACY_V2_RECORD = struct.Struct('<QII')
+READ_CHUNK = RECORD.size * 8192
+
+MIN_CAPACITY = 1 << 16
+COMPACT_LOAD = 0.5   # kick off a background rebuild
+MAX_LOAD = 0.85      # rebuild synchronously rather than probe a nearly full table
+TARGET_LOAD = 0.25   # load factor right after a rebuild
+TOUCH_INTERVAL = 3600  # only log a new last_seen once per hour per ID
+
+NEW = 'new'
+CHANGED = 'changed'
+UNCHANGED = 'unchanged'
+
+Sighting = namedtuple('Sighting', 'fingerprint first_seen last_seen')
+
+JOB_URL_KEYS = (
+    (re.compile(r'[?&]jk=([^&#]+)'), 'Indeed'),
+    (re.compile(r'/jobs/view/(\d+)'), 'LinkedIn'),
+)
+
+
+def build_unique_id(job_id, company, title, source):
+    """Build the identifier jobs are deduplicated on"""
+    if not job_id:
+        company = (company or '').lower().replace(' ', '_')
+        title = (title or '').lower().replace(' ', '_')
+        job_id = re.sub(r'[^a-z0-9_]', '', f"{company}_{title}")
+    return f"{job_id}_{source or ''}"
+
+
+def unique_id_from_url(url):
+    """Unique ID of the job a detail-page URL points at, or None if the URL carries no job key"""
+    for pattern, source in JOB_URL_KEYS:
+        match = pattern.search(url)
+        if match:
+            return build_unique_id(match.group(1), '', '', source)
+    return None
+
+
+def hash_id(unique_id):
+    """64-bit key stored for a unique ID (0 is reserved for empty slots)"""
+    digest = hashlib.blake2b(unique_id.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') or 1
+
+
+def content_fingerprint(values):
+    """64-bit BLAKE2 fingerprint of a posting's cleaned content fields (0 means unknown)"""
+    digest = hashlib.blake2b(digest_size=8)
+    for value in values:
+        digest.update(str(value or '').encode('utf-8'))
+        digest.update(b'\x1f')
+    return int.from_bytes(digest.digest(), 'little') or 1
+
+
+def _now():
+    return int(time.time())
+
+
+def _capacity_for(count, headroom=0):
+    """Smallest table holding count IDs at TARGET_LOAD, with room for headroom more below MAX_LOAD"""
+    capacity = MIN_CAPACITY
+    while count > capacity * TARGET_LOAD or count + headroom >= capacity * MAX_LOAD:
+        capacity <<= 1
+    return capacity
+
+
+def _iter_log(log_path, start, end):
+    """Yield (key, fingerprint, first_seen, last_seen) records between two log offsets"""
+    with open(log_path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = f.read(min(READ_CHUNK, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            usable = len(chunk) - len(chunk) % RECORD.size
+            yield from RECORD.iter_unpack(chunk[:usable])
+
+
+class _Table:
+    """Memory-mapped open-addressing hash table of (key, fingerprint, first_seen, last_seen) slots"""
+
+    def __init__(self, path, capacity=None):
+        self.path = path
+        if capacity is not None:
+            with open(path, 'w+b') as f:
+                f.truncate(HEADER_SIZE + capacity * SLOT_WORDS * 8)
+        with open(path, 'r+b') as f:
+            self.mm = mmap.mmap(f.fileno(), 0)
+        if capacity is not None:
+            self.capacity, self.count, self.log_offset, self.evicted, self.compacted_at = capacity, 0, 0, 0, 0
+            self.write_header()
+        else:
+            (_, _, self.compacted_at, self.capacity, self.count,
+             self.log_offset, self.evicted) = HEADER.unpack_from(self.mm, 0)
+        self.mask = self.capacity - 1
+        self.words = memoryview(self.mm)[HEADER_SIZE:].cast('Q')
+
+    @staticmethod
+    def is_valid(path, log_size):
+        try:
+            with open(path, 'rb') as f:
+                magic, version, _, capacity, _, log_offset, _ = HEADER.unpack(f.read(HEADER.size))
+            size = os.path.getsize(path)
+        except (OSError, struct.error):
+            return False
+        return (magic == INDEX_MAGIC and version == INDEX_VERSION and
+                size == HEADER_SIZE + capacity * SLOT_WORDS * 8 and
+                LOG_HEADER.size <= log_offset <= log_size)
+
+    def write_header(self):
+        HEADER.pack_into(self.mm, 0, INDEX_MAGIC, INDEX_VERSION, self.compacted_at,
+                         self.capacity, self.count, self.log_offset, self.evicted)
+
+    def probe(self, key):
+        """Return (slot, found) for key using linear probing"""
+        words = self.words
+        i = key & self.mask
+        while True:
+            current = words[i * SLOT_WORDS]
+            if current == key:
+                return i, True
+            if current == 0:
+                return i, False
+            i = (i + 1) & self.mask
+
+    def get(self, slot):
+        base = slot * SLOT_WORDS
+        stamps = self.words[base + 2]
+        return Sighting(self.words[base + 1], stamps & 0xFFFFFFFF, stamps >> 32)
+
+    def put(self, slot, key, fingerprint, first_seen, last_seen):
+        base = slot * SLOT_WORDS
+        self.words[base + 1] = fingerprint
+        self.words[base + 2] = first_seen | (last_seen << 32)
+        self.words[base] = key
+
+    def merge(self, key, fingerprint, first_seen, last_seen):
+        """Apply a log record; returns True if the key was not in the table yet"""
+        slot, found = self.probe(key)
+        if found:
+            seen = self.get(slot)
+            # Records are replayed in log order, so the latest known fingerprint wins
+            self.put(slot, key, fingerprint or seen.fingerprint,
+                     min(seen.first_seen, first_seen), max(seen.last_seen, last_seen))
+            return False
+        self.put(slot, key, fingerprint, first_seen, last_seen)
+        self.count += 1
+        return True
+
+    def items(self):
+        words = self.words
+        for slot in range(self.capacity):
+            key = words[slot * SLOT_WORDS]
+            if key:
+                yield (key, *self.get(slot))
+
+    def flush(self):
+        self.mm.flush()
+
+    def close(self):
+        self.words.release()
+        self.mm.flush()
+        self.mm.close()
+
+
+class SeenIdStore:
+    def __init__(self, path, ttl_days=0):
+        self.path = path
+        self.log_path = path + '.log'
+        self.index_path = path + '.idx'
+        self.ttl = int(ttl_days * 86400)
+        self.evicted = 0
+        self._lock = threading.RLock()
+        self._compact_lock = threading.Lock()
+        self._compactor = None
+        self._table = None
+
+        self._upgrade_legacy_log()
+        self._log = open(self.log_path, 'ab', buffering=0)
+        if self._log.tell() == 0:
+            self._log.write(LOG_HEADER.pack(LOG_MAGIC))
+        self._open_index()
+
+    # -- files ------------------------------------------------------------
+
+    def _upgrade_legacy_log(self):
+        """Convert logs written by older versions to the current record format"""
+        if not os.path.exists(self.log_path) or os.path.getsize(self.log_path) == 0:
+            return
+        with open(self.log_path, 'rb') as f:
+            magic = f.read(len(LOG_MAGIC))
+        if magic == LOG_MAGIC:
+            return
+
+        now = _now()
+        if magic == LEGACY_V2_MAGIC:
+            start, legacy = LOG_HEADER.size, LEGACY_V2_RECORD
+            convert = lambda key, first, last: RECORD.pack(key, 0, first, last)
+        else:
+            start, legacy = 0, LEGACY_V1_RECORD
+            convert = lambda key: RECORD.pack(key, 0, now, now)
+
+        logger.info(f"Upgrading {self.log_path} to the current record format")
+        tmp_path = self.log_path + '.upgrade'
+        with open(self.log_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+            src.seek(start)
+            dst.write(LOG_HEADER.pack(LOG_MAGIC))
+            while True:
+                chunk = src.read(legacy.size * 8192)
+                if not chunk:
+                    break
+                usable = len(chunk) - len(chunk) % legacy.size
+                dst.write(b''.join(convert(*record) for record in legacy.iter_unpack(chunk[:usable])))
+        os.replace(tmp_path, self.log_path)
+        if os.path.exists(self.index_path):
+            os.remove(self.index_path)
+
+    def _open_index(self):
+        log_size = os.path.getsize(self.log_path)
+        torn = (log_size - LOG_HEADER.size) % RECORD.size
+        if torn:
+            # Torn append from a killed process; drop the partial record
+            log_size -= torn
+            os.truncate(self.log_path, log_size)
+
+        if not _Table.is_valid(self.index_path, log_size):
+            logger.info(f"Rebuilding seen-ID index from {self.log_path}")
+            records = (log_size - LOG_HEADER.size) // RECORD.size
+            table = _Table(self.index_path + '.tmp', _capacity_for(records))
+            table.log_offset = LOG_HEADER.size
+            table.write_header()
+            table.close()
+            os.replace(self.index_path + '.tmp', self.index_path)
+        self._table = _Table(self.index_path)
+
+        # Replay records appended after the index header was last written
+        table = self._table
+        if table.log_offset < log_size:
+            for record in _iter_log(self.log_path, table.log_offset, log_size):
+                table.merge(*record)
+            table.log_offset = log_size
+            table.write_header()
+
+    def _cutoff(self, now):
+        return now - self.ttl if self.ttl else 0
+
+    def _write(self, slot, key, fingerprint, first_seen, last_seen):
+        # Log first: the index can be rebuilt from the log, not the other way round
+        self._log.write(RECORD.pack(key, fingerprint, first_seen, last_seen))
+        self._table.put(slot, key, fingerprint, first_seen, last_seen)
+        self._table.log_offset += RECORD.size
+        self._table.write_header()
+
+    # -- public API -------------------------------------------------------
+
+    def lookup(self, unique_id):
+        """Return the Sighting for a live ID, or None"""
+        key = hash_id(unique_id)
+        with self._lock:
+            slot, found = self._table.probe(key)
+            if not found:
+                return None
+            seen = self._table.get(slot)
+        return seen if seen.last_seen >= self._cutoff(_now()) else None
+
+    def lookup_many(self, unique_ids):
+        """Return {unique_id: Sighting} for the live IDs among unique_ids"""
+        found = {}
+        for unique_id in unique_ids:
+            seen = self.lookup(unique_id)
+            if seen:
+                found[unique_id] = seen
+        return found
+
+    def __contains__(self, unique_id):
+        return self.lookup(unique_id) is not None
+
+    def __len__(self):
+        return self._table.count
+
+    def is_empty(self):
+        return self._table.count == 0
+
+    def observe(self, unique_id, fingerprint=0, first_seen=None):
+        """Record a sighting of a unique ID and return NEW, CHANGED or UNCHANGED"""
+        key = hash_id(unique_id)
+        now = _now()
+        with self._lock:
+            slot, found = self._table.probe(key)
+            if found:
+                seen = self._table.get(slot)
+                if seen.last_seen >= self._cutoff(now):
+                    if fingerprint and seen.fingerprint and fingerprint != seen.fingerprint:
+                        self._write(slot, key, fingerprint, seen.first_seen, now)
+                        return CHANGED
+                    if (fingerprint and not seen.fingerprint) or now - seen.last_seen >= TOUCH_INTERVAL:
+                        self._write(slot, key, fingerprint or seen.fingerprint, seen.first_seen, now)
+                    return UNCHANGED
+            else:
+                self._table.count += 1
+            self._write(slot, key, fingerprint, first_seen or now, now)
+        # Outside the lock: a full table waits for the compactor, which needs the lock to finish
+        self._maybe_compact()
+        return NEW
+
+    def add(self, unique_id, first_seen=None):
+        """Record a sighting of a unique ID; returns False if it was already known and not expired"""
+        return self.observe(unique_id, first_seen=first_seen) == NEW
+
+    def touch_many(self, unique_ids):
+        """Refresh last_seen of the live IDs among unique_ids; unknown or expired IDs are left alone"""
+        now = _now()
+        with self._lock:
+            cutoff = self._cutoff(now)
+            for unique_id in unique_ids:
+                key = hash_id(unique_id)
+                slot, found = self._table.probe(key)
+                if not found:
+                    continue
+                seen = self._table.get(slot)
+                if seen.last_seen >= cutoff and now - seen.last_seen >= TOUCH_INTERVAL:
+                    self._write(slot, key, seen.fingerprint, seen.first_seen, now)
+
+    def _has_key(self, key):
+        with self._lock:
+            return self._table.probe(key)[1]
+
+    def flush(self):
+        """Force log and index to disk"""
+        with self._lock:
+            os.fsync(self._log.fileno())
+            self._table.flush()
+
+    def import_json(self, json_path):
+        """Import IDs from the legacy processed_jobs.json file; returns how many were new"""
+        with open(json_path, 'r') as f:
+            data = json.load(f)
+        added = 0
+        for unique_id in data.get('job_ids', []):
+            if self.add(unique_id):
+                added += 1
+        self.flush()
+        return added
+
+    def stats(self):
+        table = self._table
+        return {
+            'size': table.count,
+            'capacity': table.capacity,
+            'load_factor': round(table.count / table.capacity, 3),
+            'log_bytes': table.log_offset,
+            'evicted': self.evicted,
+            'evicted_total': table.evicted,
+        }
+
+    # -- compaction -------------------------------------------------------
+
+    def _maybe_compact(self):
+        if self.compacting:
+            if self._table.count < self._table.capacity * MAX_LOAD:
+                # The background rebuild swaps in a larger table when it finishes
+                return
+            # Inserting on could fill the old table before then
+            self._compactor.join()
+        load = self._table.count / self._table.capacity
+        if load >= MAX_LOAD:
+            self.compact()
+        elif load >= COMPACT_LOAD:
+            self.compact_in_background()
+
+    @property
+    def compacting(self):
+        return self._compactor is not None and self._compactor.is_alive()
+
+    def compact_in_background(self):
+        with self._lock:
+            if self.compacting:
+                return
+            self._compactor = threading.Thread(target=self._compact_quietly,
+                                               name='seen-store-compactor', daemon=True)
+            self._compactor.start()
+
+    def _compact_quietly(self):
+        try:
+            self.compact()
+        except Exception as e:
+            logger.error(f"Seen-ID store compaction failed: {e}")
+
+    def compact(self):
+        """Evict expired IDs, rewrite the log without superseded records and rebuild the index"""
+        with self._compact_lock:
+            now = _now()
+            cutoff = self._cutoff(now)
+            with self._lock:
+                snapshot = self._table.log_offset
+                table = self._table
+                # Writers wait for the rebuild once the old table reaches MAX_LOAD, so
+                # no more new IDs than this can arrive while it runs
+                headroom = max(int(table.capacity * MAX_LOAD) - table.count, 0)
+
+            # Scan the live table without the lock so crawling keeps going. Anything
+            # written meanwhile is also in the log tail, which is replayed below.
+            live = sum(1 for _, _, _, last in table.items() if last >= cutoff)
+
+            tmp_log_path = self.log_path + '.compact'
+            tmp_index_path = self.index_path + '.compact'
+            fresh = _Table(tmp_index_path, _capacity_for(live, headroom))
+            evicted = 0
+            with open(tmp_log_path, 'wb') as tmp_log:
+                tmp_log.write(LOG_HEADER.pack(LOG_MAGIC))
+                for key, fingerprint, first, last in table.items():
+                    if last < cutoff:
+                        evicted += 1
+                        continue
+                    fresh.merge(key, fingerprint, first, last)
+                    tmp_log.write(RECORD.pack(key, fingerprint, first, last))
+
+                with self._lock:
+                    # Catch up with records appended while we were rebuilding
+                    for record in _iter_log(self.log_path, snapshot, self._table.log_offset):
+                        fresh.merge(*record)
+                        tmp_log.write(RECORD.pack(*record))
+                    tmp_log.flush()
+                    os.fsync(tmp_log.fileno())
+
+                    fresh.log_offset = tmp_log.tell()
+                    fresh.evicted = self._table.evicted + evicted
+                    fresh.compacted_at = now
+                    fresh.write_header()
+                    fresh.close()
+
+                    self._table.close()
+                    self._log.close()
+                    os.replace(tmp_log_path, self.log_path)
+                    os.replace(tmp_index_path, self.index_path)
+                    self._log = open(self.log_path, 'ab', buffering=0)
+                    self._table = _Table(self.index_path)
+                    self.evicted += evicted
+
+            if evicted:
+                logger.info(f"Evicted {evicted} job IDs not seen for {self.ttl // 86400} days")
+            return evicted
+
+    def close(self):
+        if self.compacting and self._compactor is not threading.current_thread():
+            self._compactor.join()
+        with self._lock:
+            if self._table is None:
+                return
+            self.flush()
+            self._table.close()
+            self._table = None
+            self._log.close()
+
+
+class GenerationalSeenStore:
+    """Seen-ID store split into time-sliced segments that expire as a whole"""
+
+    def __init__(self, path, ttl_days, generations):
+        self.path = path
+        self.dir = path + '.gens'
+        self.ttl_days = ttl_days
+        self.ttl = int(ttl_days * 86400)
+        self.span = max(self.ttl // generations, 1)
+        self.evicted = 0
+        self._lock = threading.RLock()
+        self._compactor = None
+        os.makedirs(self.dir, exist_ok=True)
+
+        # Newest segment first; each segment is named after the start of its time slice
+        self.segments = []
+        for name in os.listdir(self.dir):
+            if name.endswith('.log') and name[:-4].isdigit():
+                start = int(name[:-4])
+                self.segments.append((start, SeenIdStore(os.path.join(self.dir, str(start)), ttl_days)))
+        self.segments.sort(key=lambda segment: segment[0], reverse=True)
+        # Distinct IDs across segments, counted once here and then kept up to date by observe and _rotate
+        self._size = sum(self._distinct_count(index) for index in range(len(self.segments)))
+        self._rotate(_now())
+
+    def _rotate(self, now):
+        """Open a new hot segment once the current slice is over and drop expired segments"""
+        if not self.segments or now >= self.segments[0][0] + self.span:
+            start = now - now % self.span
+            store = SeenIdStore(os.path.join(self.dir, str(start)), self.ttl_days)
+            self.segments.insert(0, (start, store))
+
+        for start, store in list(self.segments[1:]):
+            if start + self.span <= now - self.ttl:
+                dropped = self._distinct_count(self.segments.index((start, store)))
+                self._size -= dropped
+                self.evicted += dropped
+                store.close()
+                for suffix in ('.log', '.idx'):
+                    path = os.path.join(self.dir, f"{start}{suffix}")
+                    if os.path.exists(path):
+                        os.remove(path)
+                self.segments.remove((start, store))
+
+    @property
+    def hot(self):
+        return self.segments[0][1]
+
+    def _distinct_count(self, index):
+        """IDs of the segment at index that no newer segment holds as well"""
+        store = self.segments[index][1]
+        if index == 0:
+            return len(store)
+        newer = [newer_store for _, newer_store in self.segments[:index]]
+        # Only the hot segment is ever written or compacted, so older tables can be read directly
+        return sum(1 for key, *_ in store._table.items()
+                   if not any(newer_store._has_key(key) for newer_store in newer))
+
+    def lookup(self, unique_id):
+        with self._lock:
+            for _, store in self.segments:
+                seen = store.lookup(unique_id)
+                if seen:
+                    return seen
+            return None
+
+    def lookup_many(self, unique_ids):
+        unique_ids = list(unique_ids)
+        found = {}
+        with self._lock:
+            for _, store in reversed(self.segments):
+                # Oldest first, so a hit in a newer segment wins
+                found.update(store.lookup_many(unique_ids))
+        return found
+
+    def __contains__(self, unique_id):
+        return self.lookup(unique_id) is not None
+
+    def __len__(self):
+        """Distinct IDs; one promoted from an older segment to a newer one counts once"""
+        return self._size
+
+    def is_empty(self):
+        with self._lock:
+            return not any(len(store) for _, store in self.segments)
+
+    def observe(self, unique_id, fingerprint=0, first_seen=None):
+        with self._lock:
+            now = _now()
+            if now >= self.segments[0][0] + self.span:
+                self._rotate(now)
+            key = hash_id(unique_id)
+            known = any(store._has_key(key) for _, store in self.segments)
+            if unique_id not in self.hot:
+                for _, store in self.segments[1:]:
+                    seen = store.lookup(unique_id)
+                    if seen:
+                        # Promote so IDs that keep showing up stay in the hot segment
+                        self.hot.observe(unique_id, seen.fingerprint, seen.first_seen)
+                        break
+            result = self.hot.observe(unique_id, fingerprint, first_seen)
+            if not known:
+                self._size += 1
+            return result
+
+    def add(self, unique_id, first_seen=None):
+        return self.observe(unique_id, first_seen=first_seen) == NEW
+
+    def touch_many(self, unique_ids):
+        with self._lock:
+            for unique_id in unique_ids:
+                # observe() promotes IDs found in older segments and only writes once per TOUCH_INTERVAL
+                if self.lookup(unique_id):
+                    self.observe(unique_id)
+
+    def flush(self):
+        with self._lock:
+            for _, store in self.segments:
+                store.flush()
+
+    def import_json(self, json_path):
+        # Through observe, so the distinct count takes the imported IDs in
+        with open(json_path, 'r') as f:
+            data = json.load(f)
+        added = sum(1 for unique_id in data.get('job_ids', []) if self.add(unique_id))
+        self.flush()
+        return added
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self),
+                'hot_size': len(self.hot),
+                'generations': len(self.segments),
+                'evicted': self.evicted,
+            }
+
+    @property
+    def compacting(self):
+        return self._compactor is not None and self._compactor.is_alive()
+
+    def compact_in_background(self):
+        if self.compacting:
+            return
+        self._compactor = threading.Thread(target=self.compact, name='seen-store-compactor', daemon=True)
+        self._compactor.start()
+
+    def compact(self):
+        """Drop expired segments and compact the hot one"""
+        with self._lock:
+            before = self.evicted
+            self._rotate(_now())
+            hot = self.hot
+        hot.compact()
+        return self.evicted - before
+
+    def close(self):
+        if self.compacting and self._compactor is not threading.current_thread():
+            self._compactor.join()
+        with self._lock:
+            for _, store in self.segments:
+                store.close()
+
+
+def _signed(value):
+    # SQLite integers are signed 64-bit
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _unsigned(value):
+    return value + (1 << 64) if value < 0 else value
+
+
+class SqliteSeenStore:
+    """Seen-ID store in a SQLite database that many processes can share
+
+    WAL mode lets readers carry on while one writer commits, and the unique
+    index on unique_id makes concurrent inserts of the same job collapse into
+    one row. WAL relies on shared memory, so the database must sit on a local
+    filesystem or a volume shared by containers on the same host, not NFS.
+    """
+
+    BATCH_SIZE = 500   # stay well below SQLite's bound-parameter limit
+
+    def __init__(self, path, ttl_days=0):
+        self.path = path
+        self.db_path = path + '.db'
+        self.ttl = int(ttl_days * 86400)
+        self.evicted = 0
+        self._lock = threading.RLock()
+        self._compactor = None
+        self.conn = self._connect()
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS seen_ids (
+                unique_id TEXT NOT NULL,
+                fingerprint INTEGER NOT NULL DEFAULT 0,
+                first_seen INTEGER NOT NULL,
+                last_seen INTEGER NOT NULL
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS seen_ids_unique_id ON seen_ids (unique_id);
+            CREATE INDEX IF NOT EXISTS seen_ids_last_seen ON seen_ids (last_seen);
+        ''')
+
+    def _connect(self):
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _cutoff(self, now):
+        return now - self.ttl if self.ttl else 0
+
+    def _sighting(self, row):
+        fingerprint, first_seen, last_seen = row
+        return Sighting(_unsigned(fingerprint), first_seen, last_seen)
+
+    def lookup(self, unique_id):
+        """Return the Sighting for a live ID, or None"""
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT fingerprint, first_seen, last_seen FROM seen_ids WHERE unique_id = ? AND last_seen >= ?',
+                (unique_id, self._cutoff(_now()))).fetchone()
+        return self._sighting(row) if row else None
+
+    def lookup_many(self, unique_ids):
+        """Return {unique_id: Sighting} for the live IDs among unique_ids, one query per batch"""
+        unique_ids = list(dict.fromkeys(unique_ids))
+        cutoff = self._cutoff(_now())
+        found = {}
+        with self._lock:
+            for start in range(0, len(unique_ids), self.BATCH_SIZE):
+                batch = unique_ids[start:start + self.BATCH_SIZE]
+                rows = self.conn.execute(
+                    f'''SELECT unique_id, fingerprint, first_seen, last_seen FROM seen_ids
+                        WHERE unique_id IN ({','.join('?' * len(batch))}) AND last_seen >= ?''',
+                    (*batch, cutoff))
+                for unique_id, *sighting in rows:
+                    found[unique_id] = self._sighting(sighting)
+        return found
+
+    def __contains__(self, unique_id):
+        return self.lookup(unique_id) is not None
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute('SELECT COUNT(*) FROM seen_ids').fetchone()[0]
+
+    def is_empty(self):
+        with self._lock:
+            return self.conn.execute('SELECT 1 FROM seen_ids LIMIT 1').fetchone() is None
+
+    def observe(self, unique_id, fingerprint=0, first_seen=None):
+        """Record a sighting of a unique ID and return NEW, CHANGED or UNCHANGED"""
+        now = _now()
+        with self._lock:
+            # Repeat sightings of unchanged jobs are the common case and need no write lock
+            seen = self.lookup(unique_id)
+            if (seen and now - seen.last_seen < TOUCH_INTERVAL and
+                    (not fingerprint or fingerprint == seen.fingerprint)):
+                return UNCHANGED
+
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                # Another process may have written the row since the read above
+                row = self.conn.execute(
+                    'SELECT fingerprint, first_seen, last_seen FROM seen_ids WHERE unique_id = ?',
+                    (unique_id,)).fetchone()
+                seen = self._sighting(row) if row else None
+                if seen and seen.last_seen >= self._cutoff(now):
+                    if fingerprint and seen.fingerprint and fingerprint != seen.fingerprint:
+                        change = CHANGED
+                    else:
+                        change = UNCHANGED
+                        fingerprint = fingerprint or seen.fingerprint
+                    first_seen = seen.first_seen
+                else:
+                    change = NEW
+                    first_seen = first_seen or now
+                self.conn.execute('''
+                    INSERT INTO seen_ids (unique_id, fingerprint, first_seen, last_seen) VALUES (?, ?, ?, ?)
+                    ON CONFLICT (unique_id) DO UPDATE SET
+                        fingerprint = excluded.fingerprint,
+                        first_seen = excluded.first_seen,
+                        last_seen = excluded.last_seen
+                ''', (unique_id, _signed(fingerprint), first_seen, now))
+                self.conn.execute('COMMIT')
+            except BaseException:
+                self.conn.execute('ROLLBACK')
+                raise
+            return change
+
+    def add(self, unique_id, first_seen=None):
+        """Record a sighting of a unique ID; returns False if it was already known and not expired"""
+        return self.observe(unique_id, first_seen=first_seen) == NEW
+
+    def touch_many(self, unique_ids):
+        """Refresh last_seen of the live IDs among unique_ids, one UPDATE per batch"""
+        unique_ids = list(dict.fromkeys(unique_ids))
+        now = _now()
+        with self._lock:
+            for start in range(0, len(unique_ids), self.BATCH_SIZE):
+                batch = unique_ids[start:start + self.BATCH_SIZE]
+                self.conn.execute(
+                    f'''UPDATE seen_ids SET last_seen = ?
+                        WHERE unique_id IN ({','.join('?' * len(batch))}) AND last_seen >= ? AND last_seen <= ?''',
+                    (now, *batch, self._cutoff(now), now - TOUCH_INTERVAL))
+
+    def flush(self):
+        """Fold the WAL back into the main database file"""
+        with self._lock:
+            self.conn.execute('PRAGMA wal_checkpoint(PASSIVE)')
+
+    def import_json(self, json_path):
+        """Import IDs from the legacy processed_jobs.json file; returns how many were new"""
+        with open(json_path, 'r') as f:
+            data = json.load(f)
+        now = _now()
+        with self._lock:
+            before = len(self)
+            self.conn.execute('BEGIN IMMEDIATE')
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO seen_ids (unique_id, first_seen, last_seen) VALUES (?, ?, ?)',
+                ((unique_id, now, now) for unique_id in data.get('job_ids', [])))
+            self.conn.execute('COMMIT')
+            return len(self) - before
+
+    def stats(self):
+        return {
+            'size': len(self),
+            'db_bytes': os.path.getsize(self.db_path),
+            'evicted': self.evicted,
+        }
+
+    @property
+    def compacting(self):
+        return self._compactor is not None and self._compactor.is_alive()
+
+    def compact_in_background(self):
+        if self.compacting:
+            return
+        self._compactor = threading.Thread(target=self.compact, name='seen-store-compactor', daemon=True)
+        self._compactor.start()
+
+    def compact(self):
+        """Delete IDs not seen within the TTL window"""
+        if not self.ttl:
+            return 0
+        # Own connection, so crawling threads are not held up by the delete
+        conn = self._connect()
+        try:
+            evicted = conn.execute('DELETE FROM seen_ids WHERE last_seen < ?',
+                                   (self._cutoff(_now()),)).rowcount
+            conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        finally:
+            conn.close()
+        self.evicted += evicted
+        return evicted
+
+    def close(self):
+        if self.compacting and self._compactor is not threading.current_thread():
+            self._compactor.join()
+        with self._lock:
+            if self.conn is None:
+                return
+            self.conn.close()
+            self.conn = None
+
+
+_open_stores = {}
+_registry_lock = threading.Lock()
+
+
+def default_store_path():
+    return os.getenv('SEEN_STORE_PATH') or data_path('seen_ids')
+
+
+def create_seen_store(path=None):
+    """Build the store configured through SEEN_STORE_BACKEND, SEEN_TTL_DAYS and SEEN_GENERATIONS"""
+    path = path or default_store_path()
+    ttl_days = float(os.getenv('SEEN_TTL_DAYS', '0'))
+    generations = int(os.getenv('SEEN_GENERATIONS', '1'))
+    if os.getenv('SEEN_STORE_BACKEND', 'mmap').lower() == 'sqlite':
+        return SqliteSeenStore(path, ttl_days)
+    if ttl_days and generations > 1:
+        return GenerationalSeenStore(path, ttl_days, generations)
+    return SeenIdStore(path, ttl_days)
+
+
+def open_seen_store(path=None):
+    """Open (or share) the seen-ID store so middlewares and pipelines use one instance"""
+    path = path or default_store_path()
+    with _registry_lock:
+        entry = _open_stores.get(path)
+        if entry is None:
+            entry = _open_stores[path] = [create_seen_store(path), 0]
+        entry[1] += 1
+        return entry[0]
+
+
+def release_seen_store(store):
+    """Drop a reference taken with open_seen_store, closing the store with the last one"""
+    with _registry_lock:
+        entry = _open_stores.get(store.path)
+        if entry is None or entry[0] is not store:
+            store.close()
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del _open_stores[store.path]
+            store.close()
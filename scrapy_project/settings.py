@@ -30,11 +30,65 @@ DOWNLOADER_MIDDLEWARES = {
     'scrapy_project.middlewares.CustomSeleniumMiddleware': 800,
 }
 
+SPIDER_MIDDLEWARES = {
+    'scrapy_project.middlewares.SeenJobsMiddleware': 543,
+}
+
+# Skip detail pages for jobs already in the seen-ID store, but re-fetch each one
+# once every this many hours to pick up edited postings (0 = never). Skipped jobs
+# still count as seen, so SEEN_TTL_DAYS expires jobs no longer listed on the site.
+SEEN_JOBS_SKIP_ENABLED = True
+SEEN_JOBS_REFRESH_HOURS = 72
+# Detail requests checked against the store per query
+SEEN_JOBS_LOOKUP_BATCH = 50
+
+# Parse Indeed detail pages in this many worker processes instead of on the
+# reactor thread (0 = parse in-process); override with -s PARSE_WORKERS=4.
+# Capped at one less than the CPU count, so single-core hosts parse in-process.
+PARSE_WORKERS = 0
+
+# Apply config/job_filters.json and config/company_blacklist.json to search
+# cards before detail pages are requested and to full items in a pipeline
+JOB_FILTERS_ENABLED = True
+
+# PriorityScoringPipeline scores items in batches of this size, or whatever has
+# arrived after SCORING_MAX_WAIT seconds (weights live in config/scoring.json)
+SCORING_BATCH_SIZE = 32
+SCORING_MAX_WAIT = 0.5
+
+# ArchivePipeline writes each scrape date/source partition of data/archive in
+# Parquet row groups of this many items
+ARCHIVE_ROW_GROUP_SIZE = 1000
+
+# GoogleSheetsPipeline pushes new jobs to the sheet every this many items
+# instead of holding the whole crawl until it closes (0 = only at close)
+SHEETS_BUFFER_ROWS = 200
+
+# Sheets writes go out in append calls of SHEETS_CHUNK_ROWS rows, at most
+# SHEETS_REQUESTS_PER_MINUTE calls a minute (the API's per-user write quota is
+# 60); 429 and 5xx responses are retried up to SHEETS_MAX_RETRIES times
+SHEETS_CHUNK_ROWS = 500
+SHEETS_REQUESTS_PER_MINUTE = 60
+SHEETS_MAX_RETRIES = 5
+
 # Item pipelines
 ITEM_PIPELINES = {
     'scrapy_project.pipelines.DuplicatesPipeline': 200,
     'scrapy_project.pipelines.DataCleaningPipeline': 300,
+    # After DuplicatesPipeline, so filtered jobs are remembered and not fetched
+    # again, and after DataCleaningPipeline, which parses the salary
+    'scrapy_project.pipelines.JobFiltersPipeline': 310,
+    'scrapy_project.pipelines.NearDuplicatesPipeline': 320,
+    'scrapy_project.pipelines.RelevancePipeline': 325,
+    'scrapy_project.pipelines.PriorityScoringPipeline': 330,
     'scrapy_project.pipelines.AutoApplicationPipeline': 350,
+    # Indexed while the item still carries its description text
+    'scrapy_project.pipelines.SearchIndexPipeline': 360,
+    # Later pipelines and exports see only description_hash
+    'scrapy_project.pipelines.DescriptionBlobPipeline': 370,
+    # The job store is the system of record; GoogleSheetsPipeline syncs from it
+    'scrapy_project.pipelines.JobStorePipeline': 380,
+    'scrapy_project.pipelines.ArchivePipeline': 390,
     'scrapy_project.pipelines.GoogleSheetsPipeline': 400,
 }
 
@@ -0,0 +1,41 @@
+"""
+One shared instance per process of each SQLite index the pipelines write.
+
+When several spiders crawl concurrently in one process, every crawler builds
+its own pipelines. Two connections writing the same database from the reactor
+thread would deadlock: the second waits on the write transaction the first
+has open between commits, and the first cannot commit while the thread is
+blocked. Each spider would also miss the other's uncommitted rows, so
+cross-source near-duplicates would go unnoticed. Pipelines therefore open
+their indexes with open_shared, which hands every caller the same instance
+for a class and path and closes it when the last caller releases it. The job
+store and the seen-ID store have registries of their own for the same reason.
+"""
+import threading
+
+_open = {}
+_registry_lock = threading.Lock()
+
+
+def open_shared(factory, path=None, **kwargs):
+    """Open (or share) factory(path, **kwargs); kwargs only apply when it is first opened"""
+    key = (factory, path)
+    with _registry_lock:
+        entry = _open.get(key)
+        if entry is None:
+            entry = _open[key] = [factory(path, **kwargs), 0]
+        entry[1] += 1
+        return entry[0]
+
+
+def release_shared(instance):
+    """Drop a reference taken with open_shared, closing the instance with the last one"""
+    with _registry_lock:
+        for key, entry in _open.items():
+            if entry[0] is instance:
+                entry[1] -= 1
+                if entry[1] <= 0:
+                    del _open[key]
+                    instance.close()
+                return
+    instance.close()
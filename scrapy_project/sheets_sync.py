@@ -0,0 +1,364 @@
+"""
+Push jobs from the local job store to the "Job Pipeline" worksheet.
+
+The sheet is a downstream copy of scrapy_project.job_store, kept in step by
+unique_id. The store remembers which row each job sits on and the values last
+written there; a sync looks only at jobs added or changed since, appends the
+new ones and sends the changed cells of the rest as one values batchUpdate per
+chunk, so its cost follows the amount of change rather than the sheet size.
+
+Every API call goes through a SheetsWriter, which keeps within a
+requests-per-minute budget with a token bucket and retries 429 and 5xx
+responses with jittered exponential backoff. Appends are not idempotent and a
+5xx can arrive after Google wrote the rows, so before resending an append the
+sync reads the Unique ID column back and drops the jobs that already landed. A
+chunk that still fails stays unsynced in the job store and is sent again by
+the next push, in this run or the next.
+
+The writer waits by sleeping, for up to max_backoff seconds at a time, so
+inside a crawl it must be called from a worker thread (GoogleSheetsPipeline
+pushes through deferToThread) and refuses to run on the reactor thread. One
+writer can be shared by several threads; they draw on the same budget, and a
+MeteredWriter in front of it counts one caller's share of the requests.
+"""
+import logging
+import random
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+WORKSHEET_NAME = 'Job Pipeline'
+
+HEADERS = [
+    'Date', 'Priority', 'Status', 'Title', 'Company', 'Location',
+    'Salary', 'Source', 'Keywords', 'Experience Level', 'Remote',
+    'Priority Score', 'Job URL', 'Apply URL', 'Easy Apply',
+    'Application Method', 'Auto Apply Eligible', 'Application Status',
+    'Notes', 'Posted Date', 'Scraped Date', 'Follow Up Date',
+    'Applied Date', 'Response Date', 'Next Action', 'Unique ID'
+]
+
+_UNIQUE_ID = HEADERS.index('Unique ID')
+_RANGE_START_RE = re.compile(r'![A-Z]+(\d+)')
+
+# Responses worth retrying: quota exceeded and server-side errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def sheet_row(record):
+    """Worksheet row (in HEADERS order) for a job record"""
+    priority = record.get('priority_score') or 0
+    return [
+        (record.get('scraped_date') or datetime.now().isoformat())[:10],  # Date
+        priority,  # Priority
+        record.get('application_status') or 'Not Applied',  # Status
+        record.get('title') or '',  # Title
+        record.get('company') or '',  # Company
+        record.get('location') or '',  # Location
+        record.get('salary') or '',  # Salary
+        record.get('source') or '',  # Source
+        ', '.join(record.get('keywords') or []),  # Keywords
+        record.get('experience_level') or '',  # Experience Level
+        'Yes' if record.get('remote_friendly') else 'No',  # Remote
+        priority,  # Priority Score
+        record.get('job_url') or '',  # Job URL
+        record.get('apply_url') or '',  # Apply URL
+        'Yes' if record.get('easy_apply_available') else 'No',  # Easy Apply
+        record.get('application_method') or '',  # Application Method
+        'Yes' if record.get('auto_apply_eligible') else 'No',  # Auto Apply Eligible
+        record.get('application_status') or 'Not Applied',  # Application Status
+        record.get('notes') or '',  # Notes
+        record.get('posted_date') or '',  # Posted Date
+        record.get('scraped_date') or '',  # Scraped Date
+        '',  # Follow Up Date
+        record.get('applied_date') or '',  # Applied Date
+        '',  # Response Date
+        record.get('next_action') or ('Review & Apply' if priority >= 20 else 'Low Priority'),  # Next Action
+        record.get('unique_id') or '',  # Unique ID
+    ]
+
+
+def column_letter(number):
+    """A1 column letters for a 1-based column number"""
+    letters = ''
+    while number:
+        number, remainder = divmod(number - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def changed_ranges(row_number, old_values, new_values):
+    """batch_update ranges covering the cells of a sheet row that differ, one per run of adjacent cells"""
+    ranges = []
+    start = None
+    for i, value in enumerate(new_values + [None]):
+        changed = i < len(new_values) and (old_values is None or i >= len(old_values) or old_values[i] != value)
+        if changed and start is None:
+            start = i
+        elif not changed and start is not None:
+            ranges.append({'range': f'{column_letter(start + 1)}{row_number}:{column_letter(i)}{row_number}',
+                           'values': [new_values[start:i]]})
+            start = None
+    return ranges
+
+
+def sheet_record(record):
+    """A job record keyed by worksheet headers, as get_all_records() used to return it"""
+    row = dict(zip(HEADERS, sheet_row(record)))
+    row['unique_id'] = record.get('unique_id')
+    return row
+
+
+
+
+class TokenBucket:
+    """Allow at most rate_per_minute calls a minute, in bursts of up to burst calls"""
+
+    def __init__(self, rate_per_minute, burst=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst or max(1, int(rate_per_minute // 6))
+        self.tokens = float(self.capacity)
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until one is available; returns the seconds waited"""
+        with self._lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Reserve the token now and sleep outside the lock; later callers queue behind the debt
+            self.tokens -= 1
+            waited = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if waited:
+            self.sleep(waited)
+        return waited
+
+
+def _on_reactor_thread():
+    # Only a running reactor matters; scripts never import one
+    reactor = sys.modules.get('twisted.internet.reactor')
+    if reactor is None or not reactor.running:
+        return False
+    from twisted.python import threadable
+    return threadable.isInIOThread()
+
+
+def _status(error):
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None)
+
+
+class SheetsWriter:
+    """Make Sheets API calls within a request budget, retrying transient failures"""
+
+    def __init__(self, requests_per_minute=60, max_retries=5, backoff=1.0, max_backoff=60.0, burst=None,
+                 sleep=time.sleep):
+        self.bucket = TokenBucket(requests_per_minute, burst, sleep=sleep)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.sleep = sleep
+        self.requests = 0
+        self.retries = 0
+        self.throttled_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def call(self, method, *args, **kwargs):
+        """method(*args, **kwargs), retried on 429/5xx responses and dropped connections"""
+        return self.call_metered((self,), method, args, kwargs)
+
+    def call_rebuilt(self, rebuild, method, *args, **kwargs):
+        """call() for a method that is not idempotent, such as an append.
+
+        A request that timed out or got a 5xx may still have been applied, so before each retry
+        rebuild(args, kwargs) returns what is left to send, or None when nothing is.
+        """
+        return self.call_metered((self,), method, args, kwargs, rebuild)
+
+    def call_metered(self, meters, method, args, kwargs, rebuild=None):
+        """call(), counting requests, retries and waits on every meter given"""
+        import gspread
+        import requests
+
+        if _on_reactor_thread():
+            raise RuntimeError('SheetsWriter sleeps between calls; use it from a worker thread, not the reactor')
+        for attempt in range(self.max_retries + 1):
+            waited = self.bucket.acquire()
+            for meter in meters:
+                meter.count(requests=1, throttled_seconds=waited)
+            try:
+                return method(*args, **kwargs)
+            except (gspread.exceptions.APIError, requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries or (
+                        isinstance(e, gspread.exceptions.APIError) and _status(e) not in RETRY_STATUSES):
+                    raise
+                # Full jitter keeps concurrent crawls from retrying in lockstep
+                delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+                for meter in meters:
+                    meter.count(retries=1, throttled_seconds=delay)
+                self.sleep(delay)
+                # A 429 is refused before anything is written
+                if rebuild is not None and _status(e) != 429:
+                    rebuilt = rebuild(args, kwargs)
+                    if rebuilt is None:
+                        return None
+                    args, kwargs = rebuilt
+
+    def count(self, requests=0, retries=0, throttled_seconds=0.0):
+        with self._lock:
+            self.requests += requests
+            self.retries += retries
+            self.throttled_seconds += throttled_seconds
+
+
+class MeteredWriter:
+    """One caller's view of a shared SheetsWriter, counting only the calls made through it"""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.requests = 0
+        self.retries = 0
+        self.throttled_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def call(self, method, *args, **kwargs):
+        return self.writer.call_metered((self.writer, self), method, args, kwargs)
+
+    def call_rebuilt(self, rebuild, method, *args, **kwargs):
+        return self.writer.call_metered((self.writer, self), method, args, kwargs, rebuild)
+
+    def count(self, requests=0, retries=0, throttled_seconds=0.0):
+        with self._lock:
+            self.requests += requests
+            self.retries += retries
+            self.throttled_seconds += throttled_seconds
+
+
+_writers = {}
+
+
+def get_writer(requests_per_minute=60, max_retries=5):
+    """Shared SheetsWriter for a request budget, so every pipeline in the process stays within it"""
+    key = (requests_per_minute, max_retries)
+    if key not in _writers:
+        _writers[key] = SheetsWriter(requests_per_minute, max_retries)
+    return _writers[key]
+
+
+def open_worksheet(client, sheet_id, writer=None):
+    """The job worksheet, created with its header row if it does not exist yet"""
+    import gspread
+
+    writer = writer or SheetsWriter()
+    sheet = writer.call(client.open_by_key, sheet_id)
+    try:
+        worksheet = writer.call(sheet.worksheet, WORKSHEET_NAME)
+        # Sheets created before a column was added get the new header
+        if writer.call(worksheet.row_values, 1) != HEADERS:
+            writer.call(worksheet.batch_update, [{'range': 'A1', 'values': [HEADERS]}], value_input_option='RAW')
+        return worksheet
+    except gspread.WorksheetNotFound:
+        worksheet = writer.call(sheet.add_worksheet, title=WORKSHEET_NAME, rows=1000, cols=len(HEADERS))
+        writer.call(worksheet.insert_row, HEADERS, 1)
+        return worksheet
+
+
+class SheetsSync:
+    def __init__(self, store, worksheet, chunk_rows=500, writer=None):
+        self.store = store
+        self.worksheet = worksheet
+        self.chunk_rows = chunk_rows
+        self.writer = writer or SheetsWriter()
+        self.rows_appended = 0
+        self.rows_updated = 0
+        self.cells_updated = 0
+
+    def push(self):
+        """Send every job added or changed since the last sync; returns how many jobs were sent"""
+        sent = 0
+        attempted = set()
+        while True:
+            # Only one chunk of records is held at a time
+            records = self.store.unsynced(limit=self.chunk_rows)
+            if not records:
+                return sent
+            # A job sent this push that comes back unchanged was not recorded as landed; resending it
+            # could append it again and again, so leave it and the jobs behind it for the next push
+            stuck = [r['unique_id'] for r in records if (r['unique_id'], r['updated_at']) in attempted]
+            if stuck:
+                logger.warning(f"{len(stuck)} jobs sent to Google Sheets did not show up on the sheet "
+                               f"({', '.join(stuck[:5])}); leaving them for the next push")
+                return sent
+            attempted.update((r['unique_id'], r['updated_at']) for r in records)
+            new, updates, updated = [], [], []
+            for record in records:
+                values = sheet_row(record)
+                if record.get('sheet_row') is None:
+                    new.append((record, values))
+                    continue
+                updates.extend(changed_ranges(record['sheet_row'], record.get('sheet_values'), values))
+                updated.append((record['unique_id'], record['sheet_row'], values, record['updated_at']))
+
+            if updates:
+                self.writer.call(self.worksheet.batch_update, updates, value_input_option='RAW')
+                self.cells_updated += sum(len(r['values'][0]) for r in updates)
+            if updated:
+                self.store.mark_synced(updated)
+                self.rows_updated += len(updated)
+            if new:
+                rows = self.append([values for _, values in new])
+                landed = [(record['unique_id'], rows[record['unique_id']], values, record['updated_at'])
+                          for record, values in new if record['unique_id'] in rows]
+                self.store.mark_synced(landed)
+                self.rows_appended += len(landed)
+            sent += len(records)
+            if self.chunk_rows is None:
+                return sent
+
+    def append(self, new_rows):
+        """Append sheet rows of new jobs; returns {unique_id: sheet row}, covering at least those rows.
+
+        Retries resend only the jobs that did not land, so no job is appended twice.
+        """
+        retried = []
+
+        def unsent(args, kwargs):
+            retried.append(True)
+            landed = self.read_index()
+            remaining = [values for values in args[0] if values[_UNIQUE_ID] not in landed]
+            return ((remaining,) + args[1:], kwargs) if remaining else None
+
+        response = self.writer.call_rebuilt(unsent, self.worksheet.append_rows, new_rows)
+        first_row = self.first_row(response)
+        if first_row and not retried:
+            return {values[_UNIQUE_ID]: first_row + i for i, values in enumerate(new_rows)}
+        if not retried:
+            # Marked synced without a row, these jobs would be appended again on their next change
+            logger.warning(f"Append response had no usable updatedRange ({response!r}); "
+                           f"reading row numbers back from the sheet")
+        return self.read_index()
+
+    def reindex(self):
+        """Rebuild the unique_id -> row index from the sheet's Unique ID column (after rows were moved)"""
+        rows = self.read_index()
+        self.store.reindex_sheet_rows(rows)
+        return len(rows)
+
+    def read_index(self):
+        """{unique_id: sheet row} from the sheet's Unique ID column"""
+        column = self.writer.call(self.worksheet.col_values, _UNIQUE_ID + 1)
+        return {unique_id: number for number, unique_id in enumerate(column, start=1) if number > 1 and unique_id}
+
+    @staticmethod
+    def first_row(response):
+        """Sheet row of the first appended row, from the append response's updatedRange"""
+        updated_range = ((response or {}).get('updates') or {}).get('updatedRange', '')
+        match = _RANGE_START_RE.search(updated_range)
+        return int(match.group(1)) if match else None
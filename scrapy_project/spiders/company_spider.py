@@ -1,6 +1,7 @@
 import scrapy
 from scrapy import Request
 from scrapy_project.items import JobItem
+from scrapy_project.analysis import AnalyzedJob
 from datetime import datetime
 import re
 import json
@@ -49,10 +50,8 @@ class CompanySpider(scrapy.Spider):
                 item['scraped_date'] = datetime.now().isoformat()
                 
                 # Basic analysis
-                item['keywords'] = self.extract_keywords(item['description'])
-                item['experience_level'] = self.determine_experience_level(item['title'])
+                AnalyzedJob.from_item(item).apply_to(item)
                 item['remote_friendly'] = 'remote' in item['location'].lower()
-                item['priority_score'] = 20  # Company direct applications get bonus
                 item['application_status'] = 'Not Applied'
                 item['auto_apply_eligible'] = False
                 item['application_method'] = 'Company Website'
@@ -135,10 +134,8 @@ class CompanySpider(scrapy.Spider):
             item['posted_date'] = ''
             
             # Analysis
-            item['keywords'] = self.extract_keywords(item['description'])
-            item['experience_level'] = self.determine_experience_level(item['title'])
+            AnalyzedJob.from_item(item).apply_to(item)
             item['remote_friendly'] = 'remote' in item['location'].lower()
-            item['priority_score'] = 20
             item['application_status'] = 'Not Applied'
             item['auto_apply_eligible'] = False
             item['application_method'] = 'Company Website'
@@ -164,7 +161,7 @@ class CompanySpider(scrapy.Spider):
                 break
         
         # Update analysis with full description
-        item['keywords'] = self.extract_keywords(item['description'])
+        AnalyzedJob.from_item(item).apply_to(item)
         
         yield item
     
@@ -186,35 +183,3 @@ class CompanySpider(scrapy.Spider):
                 return match.group(1).title()
         
         return 'Unknown'
-    
-    def extract_keywords(self, text):
-        """Extract technical keywords from text"""
-        if not text:
-            return []
-        
-        keywords = [
-            'Python', 'Java', 'JavaScript', 'SQL', 'C++',
-            'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes',
-            'Machine Learning', 'AI', 'Data Science',
-            'React', 'Node.js', 'Django', 'Flask'
-        ]
-        
-        found = []
-        text_lower = text.lower()
-        
-        for keyword in keywords:
-            if keyword.lower() in text_lower:
-                found.append(keyword)
-        
-        return found
-    
-    def determine_experience_level(self, title):
-        """Determine experience level from job title"""
-        title_lower = title.lower()
-        
-        if any(word in title_lower for word in ['senior', 'lead', 'principal', 'staff']):
-            return 'Senior'
-        elif any(word in title_lower for word in ['junior', 'entry', 'associate']):
-            return 'Junior'
-        else:
-            return 'Mid-Level'
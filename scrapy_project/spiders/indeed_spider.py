@@ -1,6 +1,10 @@
 import scrapy
 from scrapy import Request
+from scrapy.http import HtmlResponse
 from scrapy_project.items import JobItem
+from scrapy_project.analysis import AnalyzedJob
+from scrapy_project.filters import get_filter
+from scrapy_project.offload import acquire_pool, pool_size, release_pool, run_in_pool
 from datetime import datetime, timedelta
 import re
 import urllib.parse
@@ -16,6 +20,31 @@ class IndeedJobsSpider(scrapy.Spider):
         'RANDOMIZE_DOWNLOAD_DELAY': True,
     }
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Lowercased once rather than for every item
+        self.required_keywords = [k.strip().lower() for k in os.getenv('JOB_KEYWORDS', '').split(',')]
+        self.parse_workers = None
+        self.parse_pool = None
+    
+    @property
+    def detail_callback(self):
+        """Parse detail pages in worker processes when PARSE_WORKERS is set and a spare core exists"""
+        if self.parse_workers is None and hasattr(self, 'settings'):
+            requested = self.settings.getint('PARSE_WORKERS', 0)
+            self.parse_workers = pool_size(requested)
+            if self.parse_workers:
+                self.parse_pool = acquire_pool(self.parse_workers)
+                self.logger.info(f"Parsing detail pages in {self.parse_workers} worker processes")
+            elif requested:
+                self.logger.warning("PARSE_WORKERS needs a spare CPU core; parsing detail pages in-process")
+        return self.parse_job_detail_offloaded if self.parse_pool else self.parse_job_detail
+    
+    def closed(self, reason):
+        if self.parse_pool is not None:
+            release_pool()
+            self.parse_pool = None
+    
     def start_requests(self):
         # Get search parameters from environment
         keywords = os.getenv('JOB_KEYWORDS', 'data engineer,machine learning engineer').split(',')
@@ -49,15 +78,23 @@ class IndeedJobsSpider(scrapy.Spider):
         job_cards = response.css('div[data-testid="job-result"]')
         self.logger.info(f"Found {len(job_cards)} jobs on page")
         
+        job_filter = get_filter() if self.settings.getbool('JOB_FILTERS_ENABLED', True) else None
+        
         for job_card in job_cards:
             job_link = job_card.css('h2 a::attr(href)').get()
             
             if job_link:
+                # Drop excluded and blacklisted jobs before paying for their detail page
+                rule = job_filter.check(**self.card_fields(job_card)) if job_filter else None
+                if rule:
+                    self.crawler.stats.inc_value(f'filters/list_page/{rule}', spider=self)
+                    continue
+                
                 full_url = response.urljoin(job_link)
                 
                 yield Request(
                     url=full_url,
-                    callback=self.parse_job_detail,
+                    callback=self.detail_callback,
                     meta={
                         'search_keyword': response.meta['search_keyword'],
                         'search_location': response.meta['search_location']
@@ -80,7 +117,30 @@ class IndeedJobsSpider(scrapy.Spider):
                     headers=self.get_headers()
                 )
     
+    def card_fields(self, job_card):
+        """The filterable fields a search-result card shows (missing ones are None)"""
+        salary = job_card.css('div[data-testid="attribute_snippet_testid"]::text, '
+                              'div.salary-snippet-container::text').getall()
+        posted = job_card.css('span[data-testid="myJobsStateDate"]::text, span.date::text').get()
+        return {
+            'title': job_card.css('h2 a span[title]::attr(title)').get() or job_card.css('h2 a span::text').get(),
+            'company': job_card.css('span[data-testid="company-name"]::text').get(),
+            'location': job_card.css('div[data-testid="text-location"]::text').get(),
+            'salary': ' '.join(salary).strip() or None,
+            'posted_date': self.parse_posted_date(posted) or None,
+            'description': ' '.join(job_card.css('div.job-snippet ::text').getall()).strip() or None,
+        }
+    
     def parse_job_detail(self, response):
+        yield self.build_job_item(response)
+    
+    async def parse_job_detail_offloaded(self, response):
+        """parse_job_detail in a worker process; the reactor only waits for the finished item"""
+        fields = await run_in_pool(self.parse_pool, parse_detail_page,
+                                   response.url, response.body, response.encoding)
+        return JobItem(fields)
+    
+    def build_job_item(self, response):
         item = JobItem()
         
         # Basic information
@@ -130,22 +190,22 @@ class IndeedJobsSpider(scrapy.Spider):
         item['source'] = 'Indeed'
         item['scraped_date'] = datetime.now().isoformat()
         
-        # Analysis
-        item['keywords'] = self.extract_keywords(item['description'])
-        item['experience_level'] = self.determine_experience_level(item['title'], item['description'])
-        item['remote_friendly'] = self.is_remote_job(item['location'], item['description'])
-        item['priority_score'] = self.calculate_priority_score(item)
+        # Analysis (the description is lowercased, tokenized and matched once)
+        job = AnalyzedJob.from_item(item)
+        job.apply_to(item)
+        item['remote_friendly'] = self.is_remote_job(job)
         
-        # Auto-application analysis
-        item['auto_apply_eligible'] = self.check_auto_apply_eligibility(item)
-        item['application_complexity'] = self.assess_application_complexity(item)
+        # Auto-application analysis (PriorityScoringPipeline scores the item and
+        # withdraws eligibility if the score is too low)
+        item['auto_apply_eligible'] = self.check_auto_apply_eligibility(item, job)
+        item['application_complexity'] = self.assess_application_complexity(item, job)
         item['application_method'] = self.determine_application_method(item)
         
         # Initialize application status
         item['application_status'] = 'Not Applied'
         item['notes'] = ''
         
-        yield item
+        return item
     
     def get_headers(self):
         return {
@@ -188,126 +248,39 @@ class IndeedJobsSpider(scrapy.Spider):
         
         return datetime.now().isoformat()
     
-    def extract_keywords(self, text):
-        if not text:
-            return []
-        
-        tech_keywords = [
-            'Python', 'SQL', 'Java', 'Scala', 'R', 'JavaScript',
-            'AWS', 'GCP', 'Azure', 'Docker', 'Kubernetes',
-            'TensorFlow', 'PyTorch', 'Spark', 'Hadoop', 'Airflow',
-            'dbt', 'Snowflake', 'BigQuery', 'Redshift', 'Databricks',
-            'Machine Learning', 'Deep Learning', 'MLOps', 'CI/CD',
-            'Git', 'Linux', 'NoSQL', 'MongoDB', 'Elasticsearch'
-        ]
-        
-        found_keywords = []
-        text_lower = text.lower()
+    def is_remote_job(self, job):
+        remote_indicators = ['remote', 'remotely', 'work from home', 'distributed', 'anywhere']
         
-        for keyword in tech_keywords:
-            if keyword.lower() in text_lower:
-                found_keywords.append(keyword)
-        
-        return found_keywords
+        return (any(indicator in job.location_lower for indicator in remote_indicators) or
+                job.mentions(*remote_indicators))
     
-    def determine_experience_level(self, title, description):
-        content = f"{title} {description}".lower()
-        
-        senior_patterns = ['senior', 'lead', 'principal', 'staff', '5+ years', '6+ years', 'expert']
-        junior_patterns = ['junior', 'entry', 'associate', 'new grad', '0-2 years', '1-3 years']
-        
-        if any(pattern in content for pattern in senior_patterns):
-            return 'Senior'
-        elif any(pattern in content for pattern in junior_patterns):
-            return 'Junior'
-        else:
-            return 'Mid-Level'
-    
-    def is_remote_job(self, location, description):
-        location_lower = location.lower() if location else ""
-        description_lower = description.lower() if description else ""
-        
-        remote_indicators = ['remote', 'work from home', 'distributed', 'anywhere']
-        
-        return any(indicator in location_lower or indicator in description_lower 
-                  for indicator in remote_indicators)
-    
-    def calculate_priority_score(self, item):
-        score = 0
-        
-        # Company tier
-        tier1_companies = ['Google', 'Apple', 'Microsoft', 'Amazon', 'Meta', 'Netflix']
-        tier2_companies = ['Uber', 'Airbnb', 'Stripe', 'Spotify', 'Twitter', 'Salesforce']
-        
-        company = item.get('company', '').lower()
-        if any(comp.lower() in company for comp in tier1_companies):
-            score += 25
-        elif any(comp.lower() in company for comp in tier2_companies):
-            score += 15
-        
-        # Keyword relevance
-        keywords = item.get('keywords', [])
-        preferred_keywords = ['Python', 'Machine Learning', 'AWS', 'Docker', 'TensorFlow']
-        matched_keywords = [k for k in keywords if k in preferred_keywords]
-        score += len(matched_keywords) * 3
-        
-        # Remote work
-        if item.get('remote_friendly'):
-            score += 8
-        
-        # Salary transparency
-        if item.get('salary') and item.get('salary').strip():
-            score += 5
-        
-        # Easy apply bonus
-        if item.get('easy_apply_available'):
-            score += 3
-        
-        # Recent posting
-        if item.get('posted_date'):
-            posted_date = datetime.fromisoformat(item['posted_date'].replace('Z', '+00:00'))
-            days_old = (datetime.now() - posted_date.replace(tzinfo=None)).days
-            if days_old <= 2:
-                score += 5
-        
-        return min(score, 50)
-    
-    def check_auto_apply_eligibility(self, item):
+    def check_auto_apply_eligibility(self, item, job):
         """Determine if job is eligible for auto-application"""
         
         # Must have easy apply
         if not item.get('easy_apply_available'):
             return False
         
-        # Must be high priority
-        if item.get('priority_score', 0) < 20:
-            return False
-        
         # Must not require complex application (portfolio, etc.)
-        description = item.get('description', '').lower()
-        complex_indicators = ['portfolio', 'cover letter required', 'writing sample', 'references']
-        if any(indicator in description for indicator in complex_indicators):
+        if job.mentions('portfolio', 'cover letter required', 'writing sample', 'references'):
             return False
         
         # Must match keywords
-        keywords = item.get('keywords', [])
-        required_keywords = os.getenv('JOB_KEYWORDS', '').split(',')
-        if not any(req.strip().lower() in ' '.join(keywords).lower() for req in required_keywords):
+        keywords_text = ' '.join(job.skills).lower()
+        if not any(req in keywords_text for req in self.required_keywords):
             return False
         
         return True
     
-    def assess_application_complexity(self, item):
+    def assess_application_complexity(self, item, job):
         """Assess how complex the application process is"""
         
         if item.get('easy_apply_available'):
             return 'Simple'
         
-        description = item.get('description', '').lower()
-        
-        if any(word in description for word in ['portfolio', 'cover letter', 'writing sample']):
+        if job.mentions('portfolio', 'cover letter', 'writing sample'):
             return 'Complex'
-        elif any(word in description for word in ['resume', 'cv', 'application']):
+        elif job.mentions('resume', 'cv', 'application'):
             return 'Medium'
         else:
             return 'Unknown'
@@ -321,3 +294,14 @@ class IndeedJobsSpider(scrapy.Spider):
             return 'External Website'
         else:
             return 'Manual Research Required'
+
+
+_worker_spider = None
+
+def parse_detail_page(url, body, encoding):
+    """Process-pool entry point: build the fields of a detail page's JobItem from the raw body"""
+    global _worker_spider
+    if _worker_spider is None:
+        _worker_spider = IndeedJobsSpider()
+    response = HtmlResponse(url=url, body=body, encoding=encoding)
+    return dict(_worker_spider.build_job_item(response))
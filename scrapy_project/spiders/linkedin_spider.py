@@ -9,6 +9,7 @@ import re
 import os
 from datetime import datetime, timedelta
 from scrapy_project.items import JobItem
+from scrapy_project.analysis import AnalyzedJob
 
 class LinkedInJobsSpider(scrapy.Spider):
     name = 'linkedin_jobs'
@@ -189,10 +190,8 @@ class LinkedInJobsSpider(scrapy.Spider):
             item['apply_url'] = response.url  # LinkedIn applies are done on the same page
             
             # Analysis
-            item['keywords'] = self.extract_keywords(item['description'])
-            item['experience_level'] = self.determine_experience_level(item['title'], item['description'])
+            AnalyzedJob.from_item(item).apply_to(item)
             item['remote_friendly'] = 'remote' in item['location'].lower() if item['location'] else False
-            item['priority_score'] = self.calculate_priority_score(item)
             
             # Auto-application analysis
             item['auto_apply_eligible'] = self.check_linkedin_auto_apply_eligibility(item)
@@ -221,61 +220,7 @@ class LinkedInJobsSpider(scrapy.Spider):
         match = re.search(r'/jobs/view/(\d+)', url)
         return match.group(1) if match else ""
     
-    def extract_keywords(self, text):
-        """Extract technical keywords from job description"""
-        if not text:
-            return []
-        
-        keywords = [
-            'Python', 'SQL', 'Machine Learning', 'AWS', 'Docker', 'Kubernetes',
-            'TensorFlow', 'PyTorch', 'Spark', 'Airflow', 'Git', 'Linux'
-        ]
-        
-        found = []
-        text_lower = text.lower()
-        for keyword in keywords:
-            if keyword.lower() in text_lower:
-                found.append(keyword)
-        
-        return found
-    
-    def determine_experience_level(self, title, description):
-        """Determine experience level from title and description"""
-        content = f"{title} {description}".lower()
-        
-        if any(word in content for word in ['senior', 'lead', 'principal', 'staff']):
-            return 'Senior'
-        elif any(word in content for word in ['junior', 'entry', 'associate', 'new grad']):
-            return 'Junior'
-        else:
-            return 'Mid-Level'
-    
-    def calculate_priority_score(self, item):
-        """Calculate priority score for LinkedIn jobs"""
-        score = 0
-        
-        # Company tier
-        company = item.get('company', '').lower()
-        tier1 = ['google', 'apple', 'microsoft', 'amazon', 'meta', 'netflix']
-        if any(comp in company for comp in tier1):
-            score += 30  # Higher score for LinkedIn jobs
-        
-        # Keywords
-        keywords = item.get('keywords', [])
-        score += len(keywords) * 4
-        
-        # Easy Apply bonus
-        if item.get('easy_apply_available'):
-            score += 10
-        
-        # Remote bonus
-        if item.get('remote_friendly'):
-            score += 8
-        
-        return min(score, 50)
-    
     def check_linkedin_auto_apply_eligibility(self, item):
         """Check if eligible for LinkedIn auto-apply"""
-        # LinkedIn Easy Apply + high priority
-        return (item.get('easy_apply_available', False) and 
-                item.get('priority_score', 0) >= 25)
+        # LinkedIn Easy Apply only; the priority minimum is applied when the item is scored
+        return item.get('easy_apply_available', False)
@@ -1,32 +1,32 @@
 #!/usr/bin/env python3
 import os
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+import sys
 import pandas as pd
 from datetime import datetime
 from dotenv import load_dotenv
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapy_project.blob_store import BlobStore
+from scrapy_project.job_store import JobStore
+
 load_dotenv()
 
-def backup_google_sheet():
-    print("💾 Starting Google Sheets backup...")
+def backup_job_store():
+    print("💾 Starting job store backup...")
     
     try:
-        scope = ['https://spreadsheets.google.com/feeds',
-                'https://www.googleapis.com/auth/drive']
-        
-        creds = ServiceAccountCredentials.from_json_keyfile_name(
-            'google_credentials.json', scope)
-        client = gspread.authorize(creds)
-        
-        sheet_id = os.getenv('GOOGLE_SHEETS_JOB_ID')
-        if not sheet_id:
-            print("❌ GOOGLE_SHEETS_JOB_ID not found in .env")
-            return
-        
-        sheet = client.open_by_key(sheet_id)
-        worksheet = sheet.get_worksheet(0)
-        data = worksheet.get_all_records()
+        # The local job store is the system of record; Google Sheets is a copy of it
+        store = JobStore()
+        blobs = BlobStore()
+        try:
+            data = store.query(order_by='scraped_date')
+            # Rows keep only description_hash; the text itself lives in the blob store
+            for record in data:
+                record['description'] = blobs.text(record)
+        finally:
+            blobs.close()
+            store.close()
         
         if not data:
             print("⚠️  No data found")
@@ -46,4 +46,4 @@ def backup_google_sheet():
         print(f"❌ Backup failed: {e}")
 
 if __name__ == "__main__":
-    backup_google_sheet()
+    backup_job_store()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# Micro-benchmark: per-item CPU of the Indeed heuristics, rescanning the description
+# in every heuristic (the old way) versus reading from one AnalyzedJob
+
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapy_project.analysis import AnalyzedJob
+from scrapy_project.keyword_matcher import get_matcher
+from scrapy_project.scoring import get_scorer
+from scrapy_project.spiders.indeed_spider import IndeedJobsSpider
+
+# Mostly ordinary prose with a sprinkling of skills, roughly like a real posting
+FILLER = ('we are looking for an engineer to join our team and help build scale reliable '
+          'platform that serves customers you will work with product design and partners '
+          'across the company to own production systems end to end our benefits include '
+          'health dental vision paid time off flexible hours and a learning budget the ideal '
+          'candidate has strong experience writing clean code reviewing designs and mentoring '
+          'others in a fast paced environment with a focus on quality').split()
+SKILLS = ('Python SQL AWS Docker Kubernetes Airflow Spark Snowflake dbt Kafka Git Linux '
+          'machine learning, data pipelines, CI/CD, PyTorch senior remote').split()
+
+LEGACY_KEYWORDS = [
+    'Python', 'SQL', 'Java', 'Scala', 'R', 'JavaScript',
+    'AWS', 'GCP', 'Azure', 'Docker', 'Kubernetes',
+    'TensorFlow', 'PyTorch', 'Spark', 'Hadoop', 'Airflow',
+    'dbt', 'Snowflake', 'BigQuery', 'Redshift', 'Databricks',
+    'Machine Learning', 'Deep Learning', 'MLOps', 'CI/CD',
+    'Git', 'Linux', 'NoSQL', 'MongoDB', 'Elasticsearch'
+]
+
+
+def legacy_priority_score(item):
+    """IndeedJobsSpider.calculate_priority_score as it was before config/scoring.json, frozen here"""
+    score = 0
+    company = item.get('company', '').lower()
+    if any(c.lower() in company for c in ['Google', 'Apple', 'Microsoft', 'Amazon', 'Meta', 'Netflix']):
+        score += 25
+    elif any(c.lower() in company for c in ['Uber', 'Airbnb', 'Stripe', 'Spotify', 'Twitter', 'Salesforce']):
+        score += 15
+    preferred = ['Python', 'Machine Learning', 'AWS', 'Docker', 'TensorFlow']
+    score += len([k for k in item.get('keywords', []) if k in preferred]) * 3
+    if item.get('remote_friendly'):
+        score += 8
+    if item.get('salary') and item.get('salary').strip():
+        score += 5
+    if item.get('easy_apply_available'):
+        score += 3
+    if item.get('posted_date'):
+        posted_date = datetime.fromisoformat(item['posted_date'].replace('Z', '+00:00'))
+        if (datetime.now() - posted_date.replace(tzinfo=None)).days <= 2:
+            score += 5
+    return min(score, 50)
+
+
+def make_items(count, words_per_description):
+    rng = random.Random(7)
+    items = []
+    for i in range(count):
+        description = ' '.join(rng.choice(SKILLS) if rng.random() < 0.05 else rng.choice(FILLER)
+                               for _ in range(words_per_description))
+        if i % 4 == 0:
+            description += f' Questions? Email jobs{i}@example.com.'
+        items.append({
+            'title': rng.choice(['Senior Data Engineer', 'Machine Learning Engineer', 'Junior Analyst']),
+            'company': 'Example Corp',
+            'location': rng.choice(['Remote', 'New York, NY']),
+            'description': description,
+            'salary': '$150,000',
+            'easy_apply_available': True,
+            'posted_date': '',
+        })
+    return items
+
+
+def legacy_analysis(spider, item):
+    """The pre-AnalyzedJob heuristics: every step lowercases and scans the description again"""
+    text_lower = item['description'].lower()
+    item['keywords'] = [k for k in LEGACY_KEYWORDS if k.lower() in text_lower]
+
+    content = f"{item['title']} {item['description']}".lower()
+    if any(p in content for p in ['senior', 'lead', 'principal', 'staff', '5+ years', '6+ years', 'expert']):
+        item['experience_level'] = 'Senior'
+    elif any(p in content for p in ['junior', 'entry', 'associate', 'new grad', '0-2 years', '1-3 years']):
+        item['experience_level'] = 'Junior'
+    else:
+        item['experience_level'] = 'Mid-Level'
+
+    location_lower = item['location'].lower()
+    description_lower = item['description'].lower()
+    item['remote_friendly'] = any(i in location_lower or i in description_lower
+                                  for i in ['remote', 'work from home', 'distributed', 'anywhere'])
+    item['priority_score'] = legacy_priority_score(item)
+
+    description = item['description'].lower()
+    eligible = not any(i in description for i in ['portfolio', 'cover letter required', 'writing sample', 'references'])
+    keywords_text = ' '.join(item['keywords']).lower()
+    item['auto_apply_eligible'] = eligible and any(r in keywords_text for r in spider.required_keywords)
+
+    description = item['description'].lower()
+    if any(w in description for w in ['portfolio', 'cover letter', 'writing sample']):
+        item['application_complexity'] = 'Complex'
+    else:
+        item['application_complexity'] = 'Medium'
+
+    # AutoApplicationPipeline.email_auto_apply
+    re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', item['description'])
+
+
+def analyzed_job(spider, item):
+    """The current spider path: one AnalyzedJob feeds every heuristic"""
+    job = AnalyzedJob.from_item(item)
+    job.apply_to(item)
+    item['remote_friendly'] = spider.is_remote_job(job)
+    item['priority_score'] = get_scorer().score_item(item)
+    item['auto_apply_eligible'] = spider.check_auto_apply_eligibility(item, job)
+    item['application_complexity'] = spider.assess_application_complexity(item, job)
+
+
+def bench(name, func, spider, items, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        batch = [dict(item) for item in items]
+        started = time.perf_counter()
+        for item in batch:
+            func(spider, item)
+        best = min(best, time.perf_counter() - started)
+    per_item = best / len(items) * 1e6
+    print(f"   {name:<14} {per_item:8.1f} µs/item")
+    return per_item
+
+
+def main(count, words, repeat):
+    spider = IndeedJobsSpider()
+    items = make_items(count, words)
+    print(f"⏱️  {count} items, ~{words} words per description, best of {repeat}")
+    legacy = bench('legacy', legacy_analysis, spider, items, repeat)
+    current = bench('AnalyzedJob', analyzed_job, spider, items, repeat)
+    print(f"📊 {legacy / current:.2f}x per-item speedup ({legacy - current:.1f} µs saved per item)")
+    print(f"   (the AnalyzedJob path matches {len(get_matcher())} trie states built from "
+          f"config/keywords.json; the legacy path checks {len(LEGACY_KEYWORDS)} hard-coded keywords)")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Benchmark per-item job analysis')
+    parser.add_argument('--items', type=int, default=500, help='Number of synthetic postings')
+    parser.add_argument('--words', type=int, default=600, help='Words per description')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per variant (best is reported)')
+    args = parser.parse_args()
+    main(args.items, args.words, args.repeat)
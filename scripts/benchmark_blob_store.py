@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# Benchmark: storage size and read latency of descriptions kept as plain text in
+# SQLite, zstd-compressed one by one, and in the content-addressed blob store
+# (deduplicated, zstd with a trained dictionary), over a synthetic corpus shaped
+# like real postings: company boilerplate, templated role text and reposts.
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import zstandard
+
+from scrapy_project.blob_store import COMPRESSION_LEVEL, BlobStore
+
+WORDS = ('data pipeline platform team build scale reliable customers product analytics cloud warehouse '
+         'streaming batch quality ownership mentor design review production services latency metrics '
+         'stakeholders roadmap models features experiment infrastructure security compliance growth').split()
+SKILLS = ['Python', 'SQL', 'Spark', 'Airflow', 'dbt', 'Kafka', 'Snowflake', 'AWS', 'GCP', 'Terraform',
+          'Kubernetes', 'Docker', 'Flink', 'Scala', 'Go', 'Postgres', 'BigQuery', 'Databricks']
+BENEFITS = ['Competitive salary and equity', 'Medical, dental and vision insurance', '401(k) with company match',
+            'Unlimited PTO', 'Remote-first culture', 'Annual learning stipend', 'Paid parental leave',
+            'Home office allowance', 'Wellness programs', 'Flexible working hours']
+EEO = ('{company} is an equal opportunity employer. We celebrate diversity and are committed to creating an '
+       'inclusive environment for all employees. All qualified applicants will receive consideration for '
+       'employment without regard to race, color, religion, sex, sexual orientation, gender identity, national '
+       'origin, disability, or veteran status.')
+
+
+def sentence(rng, words=14):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def make_corpus(count, companies=300, repost_rate=0.15, seed=7):
+    """Descriptions of count postings; repost_rate of them repeat an earlier one word for word"""
+    rng = random.Random(seed)
+    profiles = []
+    for i in range(companies):
+        name = f'Example Company {i}'
+        about = f'About {name}: ' + ' '.join(sentence(rng) for _ in range(rng.randint(3, 6)))
+        perks = 'Benefits:\n' + '\n'.join(f'- {b}' for b in rng.sample(BENEFITS, rng.randint(4, 8)))
+        profiles.append((name, about, perks))
+    descriptions = []
+    for i in range(count):
+        if descriptions and rng.random() < repost_rate:
+            descriptions.append(rng.choice(descriptions))
+            continue
+        name, about, perks = rng.choice(profiles)
+        skills = rng.sample(SKILLS, rng.randint(4, 8))
+        role = ' '.join(sentence(rng) for _ in range(rng.randint(4, 10)))
+        requirements = '\n'.join(f'- {rng.randint(2, 8)}+ years of experience with {skill}' for skill in skills)
+        descriptions.append(f'{about}\n\nThe role\n{role}\n\nRequirements\n{requirements}\n\n{perks}\n\n'
+                            f'{EEO.format(company=name)}')
+    return descriptions
+
+
+def file_size(path):
+    return sum(os.path.getsize(p) for p in (path, path + '-wal') if os.path.exists(p))
+
+
+def latency(read, keys, reads, rng):
+    """(p50, p99) microseconds of reading random keys"""
+    timings = []
+    for key in rng.choices(keys, k=reads):
+        started = time.perf_counter()
+        read(key)
+        timings.append((time.perf_counter() - started) * 1e6)
+    timings.sort()
+    return timings[len(timings) // 2], timings[int(len(timings) * 0.99)]
+
+
+def plain_table(path, descriptions, compress=None):
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('CREATE TABLE jobs (id INTEGER PRIMARY KEY, description BLOB)')
+    conn.executemany('INSERT INTO jobs (id, description) VALUES (?, ?)',
+                     [(i, compress(text.encode()) if compress else text) for i, text in enumerate(descriptions)])
+    conn.commit()
+    conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    return conn
+
+
+def report(label, size, raw, p50, p99):
+    print(f"{label:<26} {size / 1024 / 1024:8.1f} MB  {raw / size:5.1f}x   read p50 {p50:6.1f} µs  p99 {p99:6.1f} µs")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Compare description storage size and read latency')
+    parser.add_argument('--items', type=int, default=50000)
+    parser.add_argument('--reads', type=int, default=20000)
+    args = parser.parse_args()
+
+    descriptions = make_corpus(args.items)
+    raw = sum(len(text.encode()) for text in descriptions)
+    rng = random.Random(11)
+    ids = list(range(len(descriptions)))
+    print(f"📊 {len(descriptions)} descriptions, {len(set(descriptions))} distinct, "
+          f"{raw / 1024 / 1024:.1f} MB of text")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'plain.db')
+        conn = plain_table(path, descriptions)
+        select = 'SELECT description FROM jobs WHERE id = ?'
+        report('SQLite TEXT', file_size(path), raw,
+               *latency(lambda i: conn.execute(select, (i,)).fetchone()[0], ids, args.reads, rng))
+        conn.close()
+
+        path = os.path.join(tmp, 'zstd.db')
+        compressor = zstandard.ZstdCompressor(level=COMPRESSION_LEVEL)
+        decompressor = zstandard.ZstdDecompressor()
+        conn = plain_table(path, descriptions, compressor.compress)
+        report('zstd per item', file_size(path), raw,
+               *latency(lambda i: decompressor.decompress(conn.execute(select, (i,)).fetchone()[0]).decode(),
+                        ids, args.reads, rng))
+        conn.close()
+
+        path = os.path.join(tmp, 'blobs.db')
+        blobs = BlobStore(path)
+        started = time.perf_counter()
+        hashes = [blobs.put(text) for text in descriptions]
+        blobs.commit()
+        elapsed = time.perf_counter() - started
+        blobs.conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        report('blob store (dedup + dict)', file_size(path), raw, *latency(blobs.get, hashes, args.reads, rng))
+        count, size, stored = blobs.stats()
+        print(f"   {count} blobs, {blobs.duplicates} duplicates skipped, dictionary {blobs.dictionary_id}, "
+              f"compressed payload {size / stored:.1f}x; stored in {elapsed:.1f}s "
+              f"({len(descriptions) / elapsed:.0f}/s)")
+        assert all(blobs.get(digest) == text for digest, text in zip(hashes[:1000], descriptions[:1000]))
+        blobs.close()
+    print("✅ Every sampled description read back unchanged")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# Benchmark: Indeed detail pages parsed per second on the reactor thread versus
+# in a pool of N worker processes (the PARSE_WORKERS mode).
+#
+# Besides wall-clock rates it reports the CPU the crawling process itself spends
+# per offloaded page (pickling the body, unpickling the item, the pool's feeder
+# thread). That cost stays on the reactor's core however many workers there are,
+# so in-process parse time divided by it is the most the pool can ever gain, and
+# pages below the size where it drops under 1x should be parsed in-process.
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapy.http import HtmlResponse
+from twisted.internet import defer, reactor
+
+from scrapy_project.offload import acquire_pool, release_pool, run_in_pool
+from scrapy_project.spiders.indeed_spider import IndeedJobsSpider, parse_detail_page
+
+PARAGRAPH = ('<p>We are hiring a <b>Senior Data Engineer</b> to build reliable pipelines with Python, '
+             'SQL, Spark and Airflow on AWS. You will work remotely with a distributed team, own '
+             'Docker and Kubernetes deployments and mentor others. 5+ years of experience.</p>')
+
+
+def make_page(i, paragraphs):
+    url = f"https://www.indeed.com/viewjob?jk={i:016x}"
+    body = f"""<html><body>
+<h1><span title="Senior Data Engineer {i}">Senior Data Engineer {i}</span></h1>
+<div data-testid="inlineHeader-companyName"><a href="/cmp/example">Example Corp</a></div>
+<div data-testid="inlineHeader-companyLocation"><div>Remote</div></div>
+<span data-testid="attribute_snippet_testid">$150,000 - $180,000 a year</span>
+<span data-testid="attribute_snippet_testid">Full-time</span>
+<div data-testid="jobsearch-JobComponent-description">{PARAGRAPH * paragraphs}</div>
+<div data-testid="applyButtonLinkContainer"><a href="/apply?indeedApply=1">Apply</a></div>
+<span data-testid="myJobsStateDate">Posted 2 days ago</span>
+</body></html>""".encode('utf-8')
+    return url, body
+
+
+def bench_in_process(pages):
+    """(pages/s, CPU seconds per page) parsing on this thread"""
+    spider = IndeedJobsSpider()
+    started, cpu = time.perf_counter(), time.process_time()
+    for url, body in pages:
+        spider.build_job_item(HtmlResponse(url=url, body=body, encoding='utf-8'))
+    return len(pages) / (time.perf_counter() - started), (time.process_time() - cpu) / len(pages)
+
+
+@defer.inlineCallbacks
+def bench_pool(pages, workers):
+    """(pages/s, CPU seconds this process spends per page) with a pool of workers"""
+    pool = acquire_pool(workers)
+    try:
+        # Warm the workers up (imports, keyword automaton) before timing
+        yield defer.gatherResults([run_in_pool(pool, parse_detail_page, *pages[0], 'utf-8')
+                                   for _ in range(workers * 2)])
+        started, cpu = time.perf_counter(), time.process_time()
+        yield defer.gatherResults([run_in_pool(pool, parse_detail_page, url, body, 'utf-8')
+                                   for url, body in pages])
+        return len(pages) / (time.perf_counter() - started), (time.process_time() - cpu) / len(pages)
+    finally:
+        release_pool()
+
+
+@defer.inlineCallbacks
+def main(count, paragraphs, worker_counts):
+    pages = [make_page(i, paragraphs) for i in range(count)]
+    print(f"⏱️  {count} detail pages of ~{len(pages[0][1]) // 1024} KB, {os.cpu_count()} CPUs")
+    try:
+        baseline, parse_cpu = bench_in_process(pages)
+        print(f"   reactor thread  {baseline:8.1f} pages/s  {parse_cpu * 1000:6.2f} ms CPU per page")
+        for workers in worker_counts:
+            rate, dispatch_cpu = yield bench_pool(pages, workers)
+            print(f"   {workers:>2} workers      {rate:8.1f} pages/s  ({rate / baseline:.2f}x)  "
+                  f"{dispatch_cpu * 1000:6.2f} ms CPU per page in this process, "
+                  f"ceiling {parse_cpu / dispatch_cpu:.1f}x")
+    finally:
+        reactor.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Benchmark offloaded detail-page parsing')
+    parser.add_argument('--pages', type=int, default=400, help='Number of synthetic detail pages')
+    parser.add_argument('--paragraphs', type=int, default=40, help='Description paragraphs per page')
+    parser.add_argument('--workers', default='1,2,4', help='Comma-separated worker counts to try')
+    args = parser.parse_args()
+    reactor.callWhenRunning(main, args.pages, args.paragraphs, [int(w) for w in args.workers.split(',')])
+    reactor.run()
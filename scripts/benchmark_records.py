@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# Benchmark: peak memory of holding N scraped jobs as JobItems, as asdict() copies
+# (what GoogleSheetsPipeline used to buffer) and as compact JobRecords
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from itemadapter import ItemAdapter
+
+from scrapy_project.items import JobItem
+from scrapy_project.keyword_matcher import get_matcher
+from scrapy_project.records import JobRecord, get_vocabulary
+
+COMPANIES = [f'Example Company {i}' for i in range(500)]
+LOCATIONS = ['Remote', 'New York, NY', 'San Francisco, CA', 'Austin, TX', 'Seattle, WA', 'Chicago, IL']
+SOURCES = ['Indeed', 'LinkedIn', 'Company Career Page']
+
+
+def fresh(text):
+    # A new string object with the same value, like one sliced out of a response
+    return (text + ' ')[:-1]
+
+
+def make_items(count, description_chars):
+    """Yield items whose strings are fresh objects per item, as they are after parsing"""
+    rng = random.Random(7)
+    skills = get_matcher().vocabulary('skills')
+    for i in range(count):
+        yield JobItem(
+            unique_id=f'{i:032x}', job_id=f'{i:016x}', title=f'Senior Data Engineer {i % 97}',
+            company=fresh(rng.choice(COMPANIES)), location=fresh(rng.choice(LOCATIONS)),
+            source=fresh(rng.choice(SOURCES)), salary=fresh('$150,000 - $180,000 a year'),
+            salary_min=150000.0, salary_max=180000.0, salary_currency=fresh('USD'), salary_period=fresh('year'),
+            job_type=fresh('Full-time'), job_url=f'https://www.indeed.com/viewjob?jk={i:016x}',
+            apply_url=f'https://www.indeed.com/viewjob?jk={i:016x}&apply=1',
+            description=f'{i:08d}'.ljust(description_chars, '.') if description_chars else None,
+            posted_date=fresh('2026-01-01'), scraped_date=fresh('2026-01-02T10:00:00'),
+            keywords=rng.sample(skills, min(12, len(skills))),
+            experience_level=fresh('Senior'), remote_friendly=i % 2 == 0, priority_score=i % 50,
+            match_score=1.5, application_status=fresh('Not Applied'), application_method=fresh('Easy Apply'),
+            auto_apply_eligible=False, application_complexity=fresh('Low'), email_found=False,
+            easy_apply_available=True)
+
+
+def measure(label, convert, count, description_chars):
+    """Memory still held after buffering count items in the converted form"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    held = [convert(item) for item in make_items(count, description_chars)]
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<12} {current / 1024 / 1024:8.1f} MB  ({current / count:6.0f} B/item, "
+          f"buffered in {elapsed:.2f}s)")
+    del held
+    return current
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Compare memory of JobItem, dict and JobRecord buffers')
+    parser.add_argument('--items', type=int, default=100000)
+    parser.add_argument('--description-chars', type=int, default=0,
+                        help='Description length per item (0 leaves it out, measuring only the overhead)')
+    args = parser.parse_args()
+
+    get_vocabulary()
+    print(f"📊 {args.items} items, {args.description_chars}-char descriptions; memory held by the buffer")
+    as_items = measure('JobItem', lambda item: item, args.items, args.description_chars)
+    as_dicts = measure('asdict()', lambda item: ItemAdapter(item).asdict(), args.items, args.description_chars)
+    as_records = measure('JobRecord', JobRecord.from_item, args.items, args.description_chars)
+    print(f"✅ JobRecord holds {100 * (1 - as_records / as_items):.0f}% less than JobItem and "
+          f"{100 * (1 - as_records / as_dicts):.0f}% less than asdict() copies")
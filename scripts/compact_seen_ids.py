@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# Evict expired job IDs and compact the seen-ID store
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from scrapy_project.seen_store import create_seen_store
+
+def compact(store_path=None):
+    store = create_seen_store(store_path)
+    try:
+        before = store.stats()
+        evicted = store.compact()
+        after = store.stats()
+        print(f"🧹 Evicted {evicted} job IDs")
+        print(f"📊 Store size: {before['size']} → {after['size']}")
+        for key, value in after.items():
+            print(f"   {key}: {value}")
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Compact the seen-ID store (uses SEEN_TTL_DAYS / SEEN_GENERATIONS)')
+    parser.add_argument('--store', default=None, help='Store path prefix (default: data/seen_ids)')
+    args = parser.parse_args()
+    compact(args.store)
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# Export jobs from the job store to CSV, JSON lines or Parquet, streaming in chunks.
+#
+#   python scripts/export_jobs.py exports/jobs.parquet
+#   python scripts/export_jobs.py exports/recent.csv --since 2026-01-01 --source Indeed --min-score 30
+#   python scripts/export_jobs.py exports/jobs.jsonl --descriptions --resume   # continue an interrupted export
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapy_project.export import CHUNK_ROWS, EXPORT_FORMATS, export_jobs
+
+def report(progress):
+    rate = progress.rows / progress.seconds if progress.seconds else 0
+    percent = 100 * progress.rows / progress.total if progress.total else 100
+    print(f"\r📤 {progress.rows:,}/{progress.total:,} jobs ({percent:.0f}%)  {rate:,.0f} jobs/s", end='', flush=True)
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Stream jobs from the job store to CSV, JSON lines or Parquet')
+    parser.add_argument('output', help='Output file; the extension picks the format unless --format is given')
+    parser.add_argument('--format', choices=EXPORT_FORMATS, default=None)
+    parser.add_argument('--since', default=None, help='First scrape date to include (YYYY-MM-DD)')
+    parser.add_argument('--until', default=None, help='Last scrape date to include (YYYY-MM-DD)')
+    parser.add_argument('--source', action='append', help='Only this source (repeatable)')
+    parser.add_argument('--min-score', type=int, default=None, help='Only jobs with at least this priority score')
+    parser.add_argument('--descriptions', action='store_true', help='Include description text from the blob store')
+    parser.add_argument('--resume', action='store_true', help='Continue an interrupted export of the same jobs')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    parser.add_argument('--store', default=None, help='Job store (default: data/jobs.db)')
+    args = parser.parse_args()
+
+    if os.path.dirname(args.output):
+        os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    try:
+        result = export_jobs(args.output, args.format, args.since, args.until, args.source, args.min_score,
+                             args.descriptions, args.resume, args.chunk_rows, args.store, progress=report)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\n⏸️  Interrupted; run again with --resume to continue")
+        sys.exit(130)
+    rate = result.rows / result.seconds if result.seconds else 0
+    print(f"\n✅ Exported {result.rows:,} jobs to {args.output} in {result.seconds:.1f}s ({rate:,.0f} jobs/s)")
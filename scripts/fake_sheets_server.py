@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# Local stand-in for the parts of the Google Sheets v4 API the pipeline uses, so
+# Sheets syncing can be exercised offline. It can enforce a request quota per
+# window (429s) and fail a share of writes with 5xx to exercise retries. With
+# --lost-reply-rate a share of writes is applied and then answered with a 5xx,
+# as when a reply is lost after Google has written the rows.
+#
+#   python scripts/fake_sheets_server.py --port 8765 --quota 60 --fail-rate 0.1
+#
+# fake_client(url) returns a gspread client whose requests go to the server.
+
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SHEETS_API = 'https://sheets.googleapis.com'
+
+_CELLS_RE = re.compile(r'^([A-Z]+)?(\d+)?(?::([A-Z]+)?(\d+)?)?$')
+
+
+def column_number(letters):
+    number = 0
+    for letter in letters:
+        number = number * 26 + ord(letter) - 64
+    return number
+
+
+def column_letters(number):
+    letters = ''
+    while number:
+        number, remainder = divmod(number - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+class FakeSpreadsheet:
+    def __init__(self, spreadsheet_id, title='Job Tracker'):
+        self.id = spreadsheet_id
+        self.title = title
+        self.sheets = {}  # title -> {'id': int, 'rows': [[...], ...]}
+        self.lock = threading.Lock()
+
+    def metadata(self):
+        return {
+            'spreadsheetId': self.id,
+            'properties': {'title': self.title},
+            'sheets': [{'properties': {'sheetId': sheet['id'], 'title': title, 'index': i,
+                                       'gridProperties': {'rowCount': max(1000, len(sheet['rows'])),
+                                                          'columnCount': 26}}}
+                       for i, (title, sheet) in enumerate(self.sheets.items())],
+        }
+
+    def add_sheet(self, title):
+        self.sheets.setdefault(title, {'id': len(self.sheets), 'rows': []})
+        return self.sheets[title]
+
+    def parse_range(self, a1):
+        """(sheet rows, first row, first column, last row, last column), 1-based"""
+        a1 = unquote(a1)
+        title, _, cells = a1.rpartition('!')
+        if not title and not _CELLS_RE.match(cells):
+            title, cells = cells, ''  # A bare sheet title
+        title = title.strip("'") or next(iter(self.sheets))
+        col1, row1, col2, row2 = _CELLS_RE.match(cells).groups()
+        sheet = self.add_sheet(title)
+        return (sheet['rows'], int(row1 or 1), column_number(col1 or 'A'),
+                int(row2) if row2 else None, column_number(col2) if col2 else None, title)
+
+    def get(self, a1, major_dimension='ROWS'):
+        rows, row1, col1, row2, col2, title = self.parse_range(a1)
+        values = [row[col1 - 1:col2] for row in rows[row1 - 1:row2]]
+        if major_dimension == 'COLUMNS':
+            width = max((len(row) for row in values), default=0)
+            values = [[row[i] if i < len(row) else '' for row in values] for i in range(width)]
+        return {'range': a1, 'majorDimension': major_dimension, 'values': values}
+
+    def update(self, a1, values):
+        rows, row1, col1, _, _, title = self.parse_range(a1)
+        for offset, values_row in enumerate(values):
+            while len(rows) < row1 + offset:
+                rows.append([])
+            row = rows[row1 - 1 + offset]
+            while len(row) < col1 - 1 + len(values_row):
+                row.append('')
+            row[col1 - 1:col1 - 1 + len(values_row)] = values_row
+        last_col = column_letters(col1 + max((len(v) for v in values), default=1) - 1)
+        return {'updatedRange': f"'{title}'!{column_letters(col1)}{row1}:{last_col}{row1 + len(values) - 1}",
+                'updatedRows': len(values), 'updatedCells': sum(len(v) for v in values)}
+
+    def append(self, a1, values):
+        rows, _, col1, _, _, title = self.parse_range(a1)
+        first = len(rows) + 1
+        return {'updates': self.update(f"'{title}'!{column_letters(col1)}{first}", values)}
+
+
+class FakeSheetsServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, quota=0, fail_rate=0.0, latency=0.0, window=60.0, lost_reply_rate=0.0):
+        super().__init__(address, FakeSheetsHandler)
+        self.quota = quota
+        self.window = window
+        self.fail_rate = fail_rate
+        self.lost_reply_rate = lost_reply_rate
+        self.latency = latency
+        self.spreadsheets = {}
+        self.request_times = []
+        self.counts = {'requests': 0, 'throttled': 0, 'failed': 0, 'lost_replies': 0}
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def spreadsheet(self, spreadsheet_id):
+        with self.lock:
+            if spreadsheet_id not in self.spreadsheets:
+                spreadsheet = self.spreadsheets[spreadsheet_id] = FakeSpreadsheet(spreadsheet_id)
+                spreadsheet.add_sheet('Sheet1')
+            return self.spreadsheets[spreadsheet_id]
+
+    def admit(self, write):
+        """None to serve the request, or the error status to answer it with"""
+        with self.lock:
+            self.counts['requests'] += 1
+            now = time.monotonic()
+            if self.quota:
+                self.request_times = [t for t in self.request_times if now - t < self.window]
+                if len(self.request_times) >= self.quota:
+                    self.counts['throttled'] += 1
+                    return 429
+                self.request_times.append(now)
+            if write and random.random() < self.fail_rate:
+                self.counts['failed'] += 1
+                return random.choice((500, 503))
+        return None
+
+    def lose_reply(self, write):
+        """True to apply a write but answer it with a 5xx anyway"""
+        with self.lock:
+            if write and random.random() < self.lost_reply_rate:
+                self.counts['lost_replies'] += 1
+                return True
+        return False
+
+
+class FakeSheetsHandler(BaseHTTPRequestHandler):
+    lost = False
+
+    def log_message(self, format, *args):
+        pass
+
+    def reply(self, status, body):
+        if status == 200 and self.lost:
+            return self.error(503, 'Backend error')
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def error(self, status, message):
+        self.reply(status, {'error': {'code': status, 'message': message,
+                                      'status': 'RESOURCE_EXHAUSTED' if status == 429 else 'UNAVAILABLE'}})
+
+    def body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def handle_request(self, method):
+        server = self.server
+        path = urlsplit(self.path).path
+        match = re.match(r'^/v4/spreadsheets/([^/:]+)(.*)$', path)
+        if not match:
+            return self.error(404, f'Unknown endpoint {path}')
+        if server.latency:
+            time.sleep(server.latency)
+        status = server.admit(write=method != 'GET')
+        if status:
+            return self.error(status, 'Quota exceeded' if status == 429 else 'Backend error')
+        self.lost = server.lose_reply(write=method != 'GET')
+
+        spreadsheet = server.spreadsheet(match.group(1))
+        rest = match.group(2)
+        with spreadsheet.lock:
+            if method == 'GET' and rest == '':
+                return self.reply(200, spreadsheet.metadata())
+            if method == 'GET' and rest.startswith('/values/'):
+                query = parse_qs(urlsplit(self.path).query)
+                return self.reply(200, spreadsheet.get(rest[len('/values/'):],
+                                                       query.get('majorDimension', ['ROWS'])[0]))
+            if method == 'PUT' and rest.startswith('/values/'):
+                return self.reply(200, spreadsheet.update(rest[len('/values/'):], self.body().get('values', [])))
+            if method == 'POST' and rest.startswith('/values/') and rest.endswith(':append'):
+                a1 = rest[len('/values/'):-len(':append')]
+                return self.reply(200, spreadsheet.append(a1, self.body().get('values', [])))
+            if method == 'POST' and rest == '/values:batchUpdate':
+                responses = [spreadsheet.update(data['range'], data['values']) for data in self.body().get('data', [])]
+                return self.reply(200, {'spreadsheetId': spreadsheet.id, 'responses': responses,
+                                        'totalUpdatedCells': sum(r['updatedCells'] for r in responses)})
+            if method == 'POST' and rest == ':batchUpdate':
+                replies = []
+                for request in self.body().get('requests', []):
+                    if 'addSheet' in request:
+                        title = request['addSheet']['properties']['title']
+                        sheet = spreadsheet.add_sheet(title)
+                        replies.append({'addSheet': {'properties': {
+                            'sheetId': sheet['id'], 'title': title, 'index': len(spreadsheet.sheets) - 1,
+                            'gridProperties': {'rowCount': 1000, 'columnCount': 26}}}})
+                    else:
+                        replies.append({})
+                return self.reply(200, {'spreadsheetId': spreadsheet.id, 'replies': replies})
+        return self.error(404, f'Unsupported {method} {path}')
+
+    def do_GET(self):
+        self.handle_request('GET')
+
+    def do_POST(self):
+        self.handle_request('POST')
+
+    def do_PUT(self):
+        self.handle_request('PUT')
+
+
+def start_server(port=0, quota=0, fail_rate=0.0, latency=0.0, window=60.0, lost_reply_rate=0.0):
+    """Run a FakeSheetsServer on a background thread"""
+    server = FakeSheetsServer(('127.0.0.1', port), quota, fail_rate, latency, window, lost_reply_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def fake_client(url):
+    """gspread client that talks to the fake server at url instead of Google"""
+    import gspread
+    import requests
+
+    class RedirectSession(requests.Session):
+        def request(self, method, request_url, *args, **kwargs):
+            if request_url.startswith(SHEETS_API):
+                request_url = url + request_url[len(SHEETS_API):]
+            return super().request(method, request_url, *args, **kwargs)
+
+    return gspread.Client(None, session=RedirectSession())
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Serve a local fake of the Google Sheets API')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--quota', type=int, default=0, help='Requests per window before 429s (0 = unlimited)')
+    parser.add_argument('--window', type=float, default=60.0, help='Quota window in seconds')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='Share of writes answered with a 5xx')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every request')
+    parser.add_argument('--lost-reply-rate', type=float, default=0.0,
+                        help='Share of writes applied but answered with a 5xx')
+    args = parser.parse_args()
+    server = FakeSheetsServer(('127.0.0.1', args.port), args.quota, args.fail_rate, args.latency,
+                              args.window, args.lost_reply_rate)
+    print(f"🧪 Fake Sheets API listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n📊 {server.counts}")
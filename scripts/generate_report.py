@@ -1,15 +1,18 @@
 # Generate weekly/monthly job search reports
 
 import os
+import sys
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
 import pandas as pd
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 from dotenv import load_dotenv
 
-load_env()
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapy_project.job_store import JobStore
+
+load_dotenv()
 
 def generate_weekly_report():
     """Generate weekly job search report"""
@@ -30,24 +33,16 @@ def generate_weekly_report():
         'response_rate': 0
     }
     
-    # Get data from Google Sheets
+    # Get this week's jobs from the local job store (indexed on scraped_date)
     try:
-        scope = ['https://spreadsheets.google.com/feeds',
-                'https://www.googleapis.com/auth/drive']
-        creds = ServiceAccountCredentials.from_json_keyfile_name(
-            'google_credentials.json', scope)
-        client = gspread.authorize(creds)
-        
-        sheet_id = os.getenv('GOOGLE_SHEETS_JOB_ID')
-        sheet = client.open_by_key(sheet_id)
-        worksheet = sheet.worksheet("Job Pipeline")
-        
-        records = worksheet.get_all_records()
-        df = pd.DataFrame(records)
-        
-        # Filter by date
-        df['Scraped Date'] = pd.to_datetime(df['Scraped Date'])
-        weekly_data = df[df['Scraped Date'] >= start_date]
+        store = JobStore()
+        try:
+            weekly_data = pd.DataFrame(store.query('scraped_date >= ?', (start_date.isoformat(),),
+                                                   columns='company, application_status'),
+                                       columns=['company', 'application_status'])
+        finally:
+            store.close()
+        weekly_data = weekly_data.rename(columns={'company': 'Company', 'application_status': 'Application Status'})
         
         # Calculate stats
         report['jobs_scraped'] = len(weekly_data)
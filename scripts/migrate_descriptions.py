@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# Move description text already in the job store into the compressed blob store
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapy_project.blob_store import BlobStore
+from scrapy_project.job_store import JobStore
+
+def migrate(store_path=None, blobs_path=None, batch=1000, retrain=False):
+    store = JobStore(store_path)
+    blobs = BlobStore(blobs_path)
+    moved = 0
+    try:
+        while True:
+            records = store.query('description IS NOT NULL', columns='unique_id, description', limit=batch)
+            if not records:
+                break
+            store.move_descriptions([(record['unique_id'], blobs.put(record['description']))
+                                     for record in records])
+            blobs.commit()
+            moved += len(records)
+        if retrain and blobs.train() is None:
+            print("⚠️ Too few distinct descriptions to train a dictionary")
+        count, size, stored = blobs.stats()
+        print(f"✅ Moved {moved} descriptions into {blobs.path} ({blobs.duplicates} were duplicates)")
+        if count:
+            print(f"📊 {count} blobs, {size / 1024 / 1024:.1f} MB of text stored in {stored / 1024 / 1024:.1f} MB "
+                  f"({size / max(stored, 1):.1f}x)")
+    finally:
+        blobs.close()
+        store.close()
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Move job store descriptions into the blob store')
+    parser.add_argument('--store', default=None, help='Job store (default: data/jobs.db)')
+    parser.add_argument('--blobs', default=None, help='Blob store (default: data/blobs.db)')
+    parser.add_argument('--retrain', action='store_true',
+                        help='Train a new dictionary on the latest descriptions and recompress every blob')
+    args = parser.parse_args()
+    migrate(args.store, args.blobs, retrain=args.retrain)
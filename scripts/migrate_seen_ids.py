@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# Import processed_jobs.json into the memory-mapped seen-ID store
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapy_project.seen_store import SeenIdStore, default_store_path
+
+def migrate(json_path, store_path):
+    if not os.path.exists(json_path):
+        print(f"❌ {json_path} not found")
+        return
+
+    store = SeenIdStore(store_path)
+    try:
+        before = len(store)
+        added = store.import_json(json_path)
+        print(f"✅ Imported {added} new job IDs ({before} already stored)")
+        print(f"📊 Store now holds {len(store)} IDs at {store_path}")
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Migrate processed_jobs.json to the seen-ID store')
+    parser.add_argument('--json', default='processed_jobs.json')
+    parser.add_argument('--store', default=None, help='Store path prefix (default: data/seen_ids)')
+    args = parser.parse_args()
+    migrate(args.json, args.store or default_store_path())
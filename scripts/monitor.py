@@ -1,4 +1,5 @@
 import os
+import sys
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -6,6 +7,10 @@ import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 from dotenv import load_dotenv
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapy_project.job_store import JobStore
+
 load_dotenv()
 
 class JobScraperMonitor:
@@ -62,7 +67,7 @@ class JobScraperMonitor:
         return stats
     
     def get_application_stats(self):
-        """Get application statistics from Google Sheets"""
+        """Get application statistics from the local job store"""
         stats = {
             'total_applications': 0,
             'auto_applied': 0,
@@ -72,30 +77,28 @@ class JobScraperMonitor:
             'interview_count': 0
         }
         
-        if not self.client or not self.sheet_id:
-            return stats
-        
         try:
-            sheet = self.client.open_by_key(self.sheet_id)
-            worksheet = sheet.worksheet("Job Pipeline")
-            records = worksheet.get_all_records()
+            # One GROUP BY over the indexed status column instead of reading every row
+            store = JobStore()
+            try:
+                counts = store.status_counts()
+            finally:
+                store.close()
             
-            for record in records:
-                status = record.get('Application Status', '')
-                
+            for status, count in counts.items():
                 if 'Applied' in status:
-                    stats['total_applications'] += 1
+                    stats['total_applications'] += count
                     
                     if 'Auto' in status:
-                        stats['auto_applied'] += 1
+                        stats['auto_applied'] += count
                     else:
-                        stats['manual_applied'] += 1
+                        stats['manual_applied'] += count
                 
                 if status == 'Not Applied':
-                    stats['pending'] += 1
+                    stats['pending'] += count
                 
                 if 'Response' in status or 'Interview' in status:
-                    stats['interview_count'] += 1
+                    stats['interview_count'] += count
             
             # Calculate response rate
             if stats['total_applications'] > 0:
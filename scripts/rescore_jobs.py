@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# Rescore stored jobs with the current config/scoring.json weights and rerank their
+# match_score against the current relevance index, without re-scraping
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapy_project.job_store import JobStore
+from scrapy_project.relevance import RelevanceIndex
+from scrapy_project.scoring import PriorityScorer
+
+def load_match_scores(index_path=None):
+    index = RelevanceIndex(index_path)
+    try:
+        return {unique_id: round(score, 2) for unique_id, score in index.rescore_all()}
+    finally:
+        index.close()
+
+def rescore(store_path=None, config=None, index_path=None, dry_run=False):
+    scorer = PriorityScorer.from_config(config)
+    match_scores = load_match_scores(index_path)
+    store = JobStore(store_path)
+    try:
+        records = store.query()
+        if not records:
+            print(f"❌ No jobs in {store.path}")
+            return
+
+        started = time.perf_counter()
+        scores = scorer.score_many(records)
+        changes = []
+        for record, score in zip(records, scores):
+            match = match_scores.get(record['unique_id'])
+            if score != record.get('priority_score') or (match is not None and match != record.get('match_score')):
+                changes.append((record['unique_id'], score, match))
+        if changes and not dry_run:
+            store.update_scores(changes)
+    finally:
+        store.close()
+
+    elapsed = time.perf_counter() - started
+    action = 'Would change' if dry_run else 'Changed'
+    print(f"📊 Rescored {len(records)} jobs in {elapsed:.2f}s. {action} {len(changes)} scores")
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Rescore stored jobs after editing config/scoring.json')
+    parser.add_argument('--store', default=None, help='Job store (default: data/jobs.db)')
+    parser.add_argument('--config', default=None, help='Scoring config (default: config/scoring.json)')
+    parser.add_argument('--index', default=None, help='Relevance index (default: data/relevance.db)')
+    parser.add_argument('--dry-run', action='store_true', help='Report changes without saving them')
+    args = parser.parse_args()
+    rescore(args.store, args.config, args.index, args.dry_run)
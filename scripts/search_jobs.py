@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# Search every scraped posting by title, company and description.
+#
+#   python scripts/search_jobs.py flink
+#   python scripts/search_jobs.py "dbt and airflow" --days 30 --companies
+#   python scripts/search_jobs.py --rebuild        # index jobs already in data/jobs.db
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapy_project.blob_store import BlobStore
+from scrapy_project.job_store import JobStore
+from scrapy_project.search import SearchIndex
+
+BOLD, RESET = '\033[1m', '\033[0m'
+
+def rebuild(index, store_path=None, batch=1000):
+    """Index every job in the job store, reading it in unique_id order a batch at a time"""
+    store = JobStore(store_path)
+    blobs = BlobStore()
+    started = time.perf_counter()
+    total, last_id = 0, ''
+    try:
+        while True:
+            records = store.query('unique_id > ?', (last_id,), order_by='unique_id', limit=batch,
+                                  columns='unique_id, title, company, description, description_hash, source, '
+                                          'location, scraped_date, job_url')
+            if not records:
+                break
+            for record in records:
+                record['description'] = blobs.text(record)
+                index.add(record)
+            index.commit()
+            total += len(records)
+            last_id = records[-1]['unique_id']
+    finally:
+        blobs.close()
+        store.close()
+    index.optimize()
+    print(f"✅ Indexed {total} jobs in {time.perf_counter() - started:.1f}s")
+
+def search(index, query, days=None, sources=None, limit=20, companies=False):
+    highlight = (BOLD, RESET) if sys.stdout.isatty() else ('[', ']')
+    started = time.perf_counter()
+    try:
+        if companies:
+            results = index.companies(query, days, sources, limit)
+        else:
+            results = index.search(query, days, sources, limit, highlight)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    window = f" in the last {days} days" if days else ""
+    print(f"🔎 {len(results)} results for {query!r}{window} ({elapsed_ms:.1f} ms)\n")
+    if companies:
+        for company, postings, latest in results:
+            print(f"  {postings:>4}  {company or '(unknown)'}  (latest {(latest or '')[:10]})")
+        return
+    for hit in results:
+        print(f"  {hit.title} — {hit.company} ({hit.source}, {(hit.scraped_date or '')[:10]})  score {hit.score:.1f}")
+        if hit.snippet:
+            print(f"      {hit.snippet}")
+        if hit.job_url:
+            print(f"      {hit.job_url}")
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Full-text search over scraped job postings')
+    parser.add_argument('query', nargs='?', help='Words to find; "and", "or", "not", quotes and prefix* work')
+    parser.add_argument('--days', type=int, default=None, help='Only postings scraped in the last N days')
+    parser.add_argument('--source', action='append', help='Only this source (repeatable)')
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--companies', action='store_true', help='List matching companies instead of postings')
+    parser.add_argument('--rebuild', action='store_true', help='Index every job in the job store first')
+    parser.add_argument('--index', default=None, help='Search index (default: data/search.db)')
+    parser.add_argument('--store', default=None, help='Job store for --rebuild (default: data/jobs.db)')
+    args = parser.parse_args()
+
+    if not args.query and not args.rebuild:
+        parser.error('a query or --rebuild is required')
+    index = SearchIndex(args.index)
+    try:
+        if args.rebuild:
+            rebuild(index, args.store)
+        if args.query:
+            search(index, args.query, args.days, args.source, args.limit, args.companies)
+    finally:
+        index.close()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# Sync the job store to the Google Sheets "Job Pipeline" worksheet outside a crawl:
+# new jobs are appended and changed jobs get only their changed cells rewritten.
+# Use --reindex after sorting, filtering or deleting rows in the sheet by hand.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gspread
+from dotenv import load_dotenv
+from oauth2client.service_account import ServiceAccountCredentials
+
+from scrapy_project.job_store import JobStore
+from scrapy_project.sheets_sync import SheetsSync, SheetsWriter, open_worksheet
+
+load_dotenv()
+
+def sync_sheets(reindex=False, store_path=None, requests_per_minute=60):
+    sheet_id = os.getenv('GOOGLE_SHEETS_JOB_ID')
+    if not sheet_id:
+        print("❌ GOOGLE_SHEETS_JOB_ID is not set")
+        return
+
+    scope = ['https://spreadsheets.google.com/feeds',
+             'https://www.googleapis.com/auth/drive']
+    creds = ServiceAccountCredentials.from_json_keyfile_name(
+        os.getenv('GOOGLE_CREDENTIALS_PATH', 'google_credentials.json'), scope)
+    writer = SheetsWriter(requests_per_minute=requests_per_minute)
+    worksheet = open_worksheet(gspread.authorize(creds), sheet_id, writer)
+
+    store = JobStore(store_path)
+    try:
+        sync = SheetsSync(store, worksheet, writer=writer)
+        if reindex:
+            print(f"🔎 Found {sync.reindex()} jobs in the sheet")
+        sync.push()
+    finally:
+        store.close()
+    print(f"✅ Appended {sync.rows_appended} jobs, updated {sync.cells_updated} cells of "
+          f"{sync.rows_updated} changed jobs ({writer.requests} API requests)")
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Sync the job store to Google Sheets')
+    parser.add_argument('--reindex', action='store_true',
+                        help="Rebuild the job -> row index from the sheet's Unique ID column first")
+    parser.add_argument('--store', default=None, help='Job store (default: data/jobs.db)')
+    parser.add_argument('--rpm', type=int, default=60, help='Sheets API requests per minute')
+    args = parser.parse_args()
+    sync_sheets(args.reindex, args.store, args.rpm)
@@ -0,0 +1,33 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    """Point JOB_DATA_DIR at a fresh directory so no test touches ./data"""
+    path = tmp_path / 'data'
+    monkeypatch.setenv('JOB_DATA_DIR', str(path))
+    return path
+
+
+
+@pytest.fixture(scope='session', autouse=True)
+def session_data_dir(tmp_path_factory):
+    """Keep module fixtures, built before data_dir, and the company cache saved at exit out of ./data"""
+    from scrapy_project import companies
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv('JOB_DATA_DIR', str(tmp_path_factory.mktemp('data')))
+        patch.setattr(companies, 'atexit', SimpleNamespace(register=lambda func: func))
+        yield
+
+
+@pytest.fixture(autouse=True)
+def company_index(monkeypatch):
+    """Give each test a fresh shared company index"""
+    from scrapy_project import companies
+    monkeypatch.setattr(companies, '_index', None)
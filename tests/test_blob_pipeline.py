@@ -0,0 +1,63 @@
+import random
+import threading
+
+from scrapy import Spider
+from scrapy.utils.test import get_crawler
+from twisted.internet import defer
+from twisted.trial import unittest
+
+from scrapy_project.pipelines import DescriptionBlobPipeline
+
+WORDS = ('build', 'data', 'pipelines', 'python', 'sql', 'benefits', 'remote', 'team', 'equal', 'opportunity',
+         'employer', 'health', 'dental', 'vision', 'spark', 'airflow', 'cloud', 'platform', 'customers', 'growth')
+
+
+def description(n):
+    words = random.Random(n).choices(WORDS, k=120)
+    return f"Posting {n}. We are an equal opportunity employer. {' '.join(words)}"
+
+
+class DescriptionBlobPipelineTest(unittest.TestCase):
+    def setUp(self):
+        self.spider = Spider.from_crawler(get_crawler(Spider), name='test')
+        self.pipeline = DescriptionBlobPipeline()
+        self.pipeline.open_spider(self.spider)
+        self.blobs = self.pipeline.blobs
+        self.blobs.dictionary_samples = 100
+        self.blobs.dictionary_size = 2048
+
+    @defer.inlineCallbacks
+    def test_dictionary_is_trained_off_the_reactor(self):
+        blobs = self.blobs
+        train = blobs.train
+        trained_on = []
+
+        def recording_train():
+            trained_on.append(threading.get_ident())
+            return train()
+        blobs.train = recording_train
+
+        items = [self.pipeline.process_item({'description': description(n)}, self.spider) for n in range(100)]
+        assert all(isinstance(item, dict) for item in items)
+        training = self.pipeline.training
+        assert training is not None
+        # Items keep going into the store while the worker trains
+        extra = self.pipeline.process_item({'description': description(100)}, self.spider)
+        yield training
+
+        assert trained_on and trained_on[0] != threading.get_ident()
+        assert blobs.dictionary_id
+        assert blobs.conn.execute('SELECT COUNT(*) FROM blobs WHERE dictionary != ?',
+                                  (blobs.dictionary_id,)).fetchone()[0] == 0
+        assert blobs.get(items[0]['description_hash']) == description(0)
+        assert blobs.get(extra['description_hash']) == description(100)
+        yield self.pipeline.close_spider(self.spider)
+
+    @defer.inlineCallbacks
+    def test_close_waits_for_training(self):
+        for n in range(100):
+            self.pipeline.process_item({'description': description(n)}, self.spider)
+        assert self.pipeline.training is not None
+        yield self.pipeline.close_spider(self.spider)
+        assert self.pipeline.training is None
+        assert self.spider.crawler.stats.get_value('blobs/stored') == 100
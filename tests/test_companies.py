@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from scrapy_project.companies import CompanyIndex
+
+
+@pytest.fixture(scope='module')
+def index():
+    return CompanyIndex.from_config(cache_path='')
+
+
+def test_normalize_folds_case_accents_and_legal_suffixes(index):
+    assert index.normalize('Amazon.com, Inc.') == 'amazon com'
+    assert index.normalize('Société Générale S.A.') == 'societe generale'
+    assert index.normalize('Procter & Gamble Co.') == 'procter and gamble'
+    assert index.normalize('The Trade Desk') == 'trade desk'
+
+
+def test_aliases_resolve_to_the_configured_tier(index):
+    assert index.tier('Amazon Web Services') == 1
+    assert index.tier('FACEBOOK') == 1
+    assert index.tier('Slack Technologies, LLC') == 2
+    assert index.tier('Metadata Inc') is None
+
+
+def test_linkedin_is_not_tiered_as_microsoft(index):
+    assert index.tier('LinkedIn') is None
+
+
+def test_memo_is_least_recently_used():
+    index = CompanyIndex(memo_size=3)
+    for name in ['A Corp', 'B Corp', 'C Corp']:
+        index.normalize(name)
+    index.normalize('A Corp')
+    index.normalize('D Corp')
+    assert list(index.memo) == ['C Corp', 'A Corp', 'D Corp']
+
+
+def test_saved_cache_is_bounded_and_versioned(tmp_path):
+    cache = tmp_path / 'company_names.json'
+    cache.write_text(json.dumps({'version': 'v1', 'names': {f'Name {i}': f'name {i}' for i in range(10)}}))
+    index = CompanyIndex(cache_path=str(cache), version='v1', memo_size=4)
+    assert list(index.memo) == ['Name 6', 'Name 7', 'Name 8', 'Name 9']
+
+    index.normalize('New Name')
+    index.save()
+    assert len(json.loads(cache.read_text())['names']) == 4
+    assert CompanyIndex(cache_path=str(cache), version='v2').memo == {}
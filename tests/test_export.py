@@ -0,0 +1,127 @@
+import csv
+import json
+import os
+
+import pyarrow.parquet as pq
+import pytest
+
+from scrapy_project.blob_store import BlobStore
+from scrapy_project.export import cursor_path, export_format, export_jobs
+from scrapy_project.job_store import JobStore
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    store = JobStore(path)
+    for i in range(10):
+        store.add({'unique_id': f'job-{i}', 'title': f'Engineer {i}', 'source': 'Indeed' if i % 2 else 'LinkedIn',
+                   'priority_score': i, 'keywords': ['Python', 'SQL'],
+                   'scraped_date': f'2026-01-{i + 1:02d}T09:00:00'})
+    store.flush()
+    store.close()
+    return path
+
+
+def interrupt_after(chunks):
+    def progress(update):
+        progress.calls += 1
+        if progress.calls == chunks:
+            raise Interrupted
+    progress.calls = 0
+    return progress
+
+
+def exported_ids(path):
+    if path.endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as f:
+            return [row['unique_id'] for row in csv.DictReader(f)]
+    if path.endswith('.jsonl'):
+        with open(path, encoding='utf-8') as f:
+            return [json.loads(line)['unique_id'] for line in f]
+    return pq.read_table(path).column('unique_id').to_pylist()
+
+
+@pytest.mark.parametrize('name', ['jobs.csv', 'jobs.jsonl', 'jobs.parquet'])
+def test_interrupted_export_resumes_without_gaps_or_repeats(tmp_path, store_path, name):
+    path = str(tmp_path / name)
+    with pytest.raises(Interrupted):
+        export_jobs(path, chunk_rows=3, store_path=store_path, progress=interrupt_after(2))
+    with open(cursor_path(path), encoding='utf-8') as f:
+        assert json.load(f)['rows'] == 6
+    if not name.endswith('.parquet'):
+        # A chunk that was being written when the process died
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('partial,row')
+
+    result = export_jobs(path, chunk_rows=3, store_path=store_path, resume=True)
+    assert result.rows == result.total == 10
+    assert exported_ids(path) == [f'job-{i}' for i in range(10)]
+    assert not os.path.exists(cursor_path(path))
+
+
+def test_resume_keeps_date_order_and_filters(tmp_path, store_path):
+    path = str(tmp_path / 'jobs.jsonl')
+    options = dict(start='2026-01-02', end='2026-01-09', sources=['Indeed'], store_path=store_path, chunk_rows=1)
+    with pytest.raises(Interrupted):
+        export_jobs(path, progress=interrupt_after(2), **options)
+    export_jobs(path, resume=True, **options)
+    assert exported_ids(path) == ['job-1', 'job-3', 'job-5', 'job-7']
+
+
+def test_resume_rejects_a_cursor_for_a_different_export(tmp_path, store_path):
+    path = str(tmp_path / 'jobs.csv')
+    with pytest.raises(Interrupted):
+        export_jobs(path, chunk_rows=3, store_path=store_path, progress=interrupt_after(1))
+    with pytest.raises(ValueError, match='different export'):
+        export_jobs(path, chunk_rows=3, store_path=store_path, min_score=5, resume=True)
+
+
+def test_resume_rejects_a_rebuilt_store(tmp_path, store_path):
+    path = str(tmp_path / 'jobs.csv')
+    with pytest.raises(Interrupted):
+        export_jobs(path, chunk_rows=3, store_path=store_path, progress=interrupt_after(1))
+    store = JobStore(store_path)
+    store.conn.execute("DELETE FROM jobs WHERE unique_id = 'job-2'")
+    store.close()
+    with pytest.raises(ValueError, match='rebuilt'):
+        export_jobs(path, chunk_rows=3, store_path=store_path, resume=True)
+
+
+def test_parquet_without_a_footer_cannot_be_resumed(tmp_path, store_path):
+    path = str(tmp_path / 'jobs.parquet')
+    with pytest.raises(Interrupted):
+        export_jobs(path, chunk_rows=3, store_path=store_path, progress=interrupt_after(1))
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) - 8)
+    with pytest.raises(ValueError, match='not closed cleanly'):
+        export_jobs(path, chunk_rows=3, store_path=store_path, resume=True)
+
+
+def test_descriptions_come_from_the_blob_store(tmp_path, store_path):
+    blobs_path = str(tmp_path / 'blobs.db')
+    blobs = BlobStore(blobs_path)
+    digest = blobs.put('Build data pipelines.')
+    blobs.commit()
+    blobs.close()
+    store = JobStore(store_path)
+    store.move_descriptions([('job-0', digest)])
+    store.close()
+
+    path = str(tmp_path / 'jobs.jsonl')
+    export_jobs(path, store_path=store_path, blobs_path=blobs_path, descriptions=True)
+    with open(path, encoding='utf-8') as f:
+        first = json.loads(f.readline())
+    assert first['description'] == 'Build data pipelines.'
+    assert first['keywords'] == ['Python', 'SQL']
+
+
+def test_export_format_comes_from_the_extension():
+    assert export_format('out.ndjson') == 'jsonl'
+    assert export_format('out.txt', 'csv') == 'csv'
+    with pytest.raises(ValueError):
+        export_format('out.xlsx')
@@ -0,0 +1,80 @@
+import pytest
+
+from scrapy_project.job_store import JobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs.db'))
+    yield store
+    store.close()
+
+
+def job(**fields):
+    record = {'unique_id': '1_Indeed', 'title': 'Data Engineer', 'company': 'Acme', 'source': 'Indeed',
+              'application_status': 'Not Applied', 'notes': '', 'keywords': ['Python'], 'remote_friendly': True}
+    record.update(fields)
+    return record
+
+
+def stored(store, unique_id='1_Indeed'):
+    return store.query('unique_id = ?', (unique_id,))[0]
+
+
+def test_records_round_trip(store):
+    store.add(job())
+    assert store.flush() == 1
+    record = stored(store)
+    assert record['keywords'] == ['Python']
+    assert record['remote_friendly'] is True
+    assert len(store) == 1
+
+
+def test_rescrape_refreshes_content_but_keeps_tracking_columns(store):
+    store.add(job())
+    store.flush()
+    store.update_status('1_Indeed', 'Applied', notes='Referred by Sam', applied_date='2024-05-01',
+                        next_action='Follow up')
+
+    store.add(job(title='Senior Data Engineer', notes='scraped note'))
+    store.flush()
+    record = stored(store)
+    assert record['title'] == 'Senior Data Engineer'
+    assert record['application_status'] == 'Applied'
+    assert record['notes'] == 'Referred by Sam'
+    assert record['applied_date'] == '2024-05-01'
+    assert record['next_action'] == 'Follow up'
+
+
+def test_rescrape_updates_tracking_columns_until_acted_on(store):
+    store.add(job(notes='old'))
+    store.flush()
+    store.add(job(notes='new'))
+    store.flush()
+    assert stored(store)['notes'] == 'new'
+
+
+def test_every_write_queues_the_job_for_sync(store):
+    store.add(job())
+    store.flush()
+    record = stored(store)
+    store.mark_synced([('1_Indeed', 2, ['Data Engineer'], record['updated_at'])])
+    assert store.unsynced() == []
+
+    store.add(job())
+    store.flush()
+    assert [r['unique_id'] for r in store.unsynced()] == ['1_Indeed']
+    assert stored(store)['sheet_row'] == 2
+
+
+def test_reindex_requeues_jobs_missing_from_the_sheet(store):
+    for unique_id in ('1_Indeed', '2_Indeed'):
+        store.add(job(unique_id=unique_id))
+    store.flush()
+    store.mark_synced([(r['unique_id'], row, [], r['updated_at'])
+                       for row, r in enumerate(store.query(order_by='unique_id'), start=2)])
+
+    store.reindex_sheet_rows({'2_Indeed': 2})
+    assert stored(store, '2_Indeed')['sheet_row'] == 2
+    assert stored(store, '1_Indeed')['sheet_row'] is None
+    assert [r['unique_id'] for r in store.unsynced()] == ['1_Indeed']
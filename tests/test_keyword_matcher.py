@@ -0,0 +1,76 @@
+import pytest
+
+from scrapy_project.keyword_matcher import KeywordMatcher, get_matcher, tokenize
+
+
+@pytest.fixture(scope='module')
+def matcher():
+    return KeywordMatcher.from_config()
+
+
+def test_tokenize_keeps_skill_punctuation():
+    assert tokenize('C++, C# and 5+ years') == ['c', '+', '+', 'c', '#', 'and', '5', '+', 'years']
+    assert tokenize('Node.js / real-time') == ['node', 'js', 'real', 'time']
+
+
+def test_glued_single_letters_are_not_standalone_tokens():
+    assert 'r' not in tokenize("R&D, R's syntax, e.g. foo.R")
+    assert tokenize('Python, R. SQL')[:2] == ['python', 'r']
+    assert tokenize('(R)') == ['r']
+
+
+def test_single_letter_skill_needs_a_standalone_token(matcher):
+    assert 'R' in matcher.keywords('Statistics in R and Python')
+    assert 'R' in matcher.keywords('Python/R, SQL')
+    assert 'R' not in matcher.keywords('Join our R&D lab')
+    assert 'R' not in matcher.keywords("The team's roadmap, e.g. dashboards")
+
+
+def test_word_boundaries(matcher):
+    assert matcher.keywords('JavaScript and React') == ['JavaScript', 'React']
+    assert 'Java' not in matcher.keywords('JavaScript')
+    assert 'JavaScript' not in matcher.keywords('APIs in Node.js')
+    assert matcher.keywords('APIs in Node.js') == ['Node.js']
+    assert matcher.keywords('C++ and C#') == ['C++']
+
+
+def test_generic_prose_does_not_fire_skills(matcher):
+    found = matcher.scan('You will have a mentor, and we bash out ideas over lambda calculus and torch songs.')
+    assert found['skills'] == []
+    assert found['soft_skills'] == []
+
+
+def test_synonyms_map_to_the_canonical_skill(matcher):
+    assert matcher.keywords('pyspark, k8s and amazon web services') == ['Spark', 'Kubernetes', 'AWS']
+    assert matcher.scan('Mentoring junior engineers')['soft_skills'] == ['Leadership']
+
+
+def test_overlapping_phrases_are_all_found():
+    matcher = KeywordMatcher([('machine learning', 'skills', 'ML'),
+                              ('machine learning engineer', 'titles', 'MLE'),
+                              ('learning engineer', 'titles', 'LE'),
+                              ('engineer', 'titles', 'Engineer')])
+    found = matcher.scan('Senior machine learning engineer')
+    assert found['skills'] == ['ML']
+    assert found['titles'] == ['MLE', 'LE', 'Engineer']
+
+
+def test_failure_links_recover_after_a_partial_match():
+    matcher = KeywordMatcher([('data pipeline', 'industry', 'pipeline'), ('data', 'industry', 'data')])
+    assert matcher.scan('data data pipeline')['industry'] == ['data', 'pipeline']
+
+
+def test_scan_reports_first_appearance_and_count_tokens_counts_all(matcher):
+    tokens = tokenize('Python then SQL then Python again, pandas too')
+    assert matcher.scan_tokens(tokens)['skills'] == ['Python', 'SQL']
+    assert matcher.count_tokens(tokens, ('skills',)) == {('skills', 'Python'): 3, ('skills', 'SQL'): 1}
+
+
+def test_experience_level(matcher):
+    assert matcher.experience_level(matcher.scan('Senior Data Engineer')['levels']) == 'Senior'
+    assert matcher.experience_level(matcher.scan('Junior analyst, 1-3 years')['levels']) == 'Junior'
+    assert matcher.experience_level([]) == 'Mid-Level'
+
+
+def test_shared_matcher_is_built_once():
+    assert get_matcher() is get_matcher()
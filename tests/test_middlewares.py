@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip('scrapy_selenium')
+
+from scrapy import Request, Spider
+from scrapy.statscollectors import MemoryStatsCollector
+from scrapy.utils.test import get_crawler
+
+from scrapy_project.middlewares import SeenJobsMiddleware
+from scrapy_project.seen_store import SeenIdStore
+
+SEEN = 'https://www.indeed.com/viewjob?jk=seen1'
+UNSEEN = 'https://www.indeed.com/viewjob?jk=new1'
+
+
+@pytest.fixture
+def middleware(tmp_path):
+    spider = Spider('test')
+    middleware = SeenJobsMiddleware(MemoryStatsCollector(get_crawler()), batch_size=2)
+    middleware.store = SeenIdStore(str(tmp_path / 'seen'))
+    middleware.store.add('seen1_Indeed')
+    yield middleware, spider
+    middleware.store.close()
+
+
+def outputs():
+    return [Request(SEEN), {'title': 'item'}, Request(UNSEEN), Request(SEEN, meta={'dont_skip_seen': True})]
+
+
+def urls(results):
+    return [r.url if isinstance(r, Request) else r['title'] for r in results]
+
+
+def test_sync_output_drops_seen_detail_requests(middleware):
+    middleware, spider = middleware
+    results = list(middleware.process_spider_output(None, iter(outputs()), spider))
+    assert urls(results) == ['item', UNSEEN, SEEN]
+    assert middleware.skipped == 1
+
+
+def test_async_output_drops_seen_detail_requests(middleware):
+    middleware, spider = middleware
+
+    async def callback():
+        for result in outputs():
+            yield result
+
+    async def collect():
+        return [r async for r in middleware.process_spider_output_async(None, callback(), spider)]
+
+    assert urls(asyncio.run(collect())) == ['item', UNSEEN, SEEN]
+    assert middleware.skipped == 1
+
+
+def test_listed_jobs_are_touched_and_refetched_once_per_period(tmp_path, monkeypatch):
+    from scrapy_project import seen_store
+    now = [1_700_000_000]
+    monkeypatch.setattr(seen_store, '_now', lambda: now[0])
+    monkeypatch.setattr('scrapy_project.middlewares.time.time', lambda: now[0])
+    spider = Spider('test')
+    middleware = SeenJobsMiddleware(MemoryStatsCollector(get_crawler()), refresh_hours=72)
+    middleware.store = seen_store.SeenIdStore(str(tmp_path / 'seen'), ttl_days=30)
+    middleware.store.add('seen1_Indeed')
+
+    fetched = []
+    for _ in range(24):
+        now[0] += 6 * 3600
+        passed = list(middleware.process_spider_output(None, iter([Request(SEEN)]), spider))
+        if passed:
+            fetched.append(now[0])
+            middleware.store.observe('seen1_Indeed')   # DuplicatesPipeline sees the detail page
+    # Six days of listing crawls: one detail fetch per 72-hour period, and the job never expires
+    assert len(fetched) == 2
+    assert middleware.store.lookup('seen1_Indeed').last_seen == now[0]
+    middleware.store.close()
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from scrapy_project.near_duplicates import (NUM_PERM, NearDuplicateIndex, band_keys, minhash, normalize_location,
+                                            shingle_hashes, similarity)
+
+DESCRIPTION = ('We are hiring a senior data engineer to build and run streaming pipelines on Kafka and Spark. '
+               'You will own our warehouse models in dbt, mentor two engineers and work with analytics on '
+               'reliable, well tested data products. Remote within the US, competitive salary and equity.')
+
+
+def signature(title, company, description):
+    return minhash(shingle_hashes(title, company, description))
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = NearDuplicateIndex(str(tmp_path / 'near.db'), threshold=0.8)
+    yield index
+    index.close()
+
+
+def test_signature_is_deterministic_and_case_insensitive():
+    a = signature('Data Engineer', 'Acme', DESCRIPTION)
+    b = signature('data engineer', 'ACME', DESCRIPTION.upper())
+    assert a.dtype == np.uint32 and len(a) == NUM_PERM
+    assert np.array_equal(a, b)
+    assert band_keys(a) == band_keys(b)
+
+
+def test_similarity_estimates_jaccard():
+    words = [f'w{i}' for i in range(400)]
+    a = shingle_hashes('', '', ' '.join(words))
+    b = shingle_hashes('', '', ' '.join(words[:300] + [f'x{i}' for i in range(100)]))
+    jaccard = len(np.intersect1d(a, b)) / len(np.union1d(a, b))
+    assert similarity(minhash(a), minhash(b)) == pytest.approx(jaccard, abs=0.1)
+
+
+def test_empty_text_has_a_signature():
+    assert len(shingle_hashes('', None, '')) == 0
+    assert len(minhash(shingle_hashes('', None, ''))) == NUM_PERM
+
+
+def test_repost_on_another_source_is_found(index):
+    index.add('1_Indeed', signature('Senior Data Engineer', 'Acme', DESCRIPTION))
+    repost = signature('Senior Data Engineer', 'Acme Inc', DESCRIPTION.replace('two engineers', 'two people'))
+    match = index.find(repost)
+    assert match is not None
+    assert match[0] == '1_Indeed' and match[1] >= 0.8
+
+
+def test_unrelated_posting_is_not_found(index):
+    index.add('1_Indeed', signature('Senior Data Engineer', 'Acme', DESCRIPTION))
+    other = signature('Frontend Developer', 'Globex', 'React and TypeScript work on our design system, '
+                                                      'accessibility audits and a component library.')
+    assert index.find(other) is None
+
+
+def test_find_excludes_the_posting_itself(index):
+    sig = signature('Senior Data Engineer', 'Acme', DESCRIPTION)
+    index.add('1_Indeed', sig)
+    assert index.find(sig, exclude='1_Indeed') is None
+
+
+def test_re_adding_replaces_the_old_buckets(index):
+    old = signature('Senior Data Engineer', 'Acme', DESCRIPTION)
+    new = signature('Frontend Developer', 'Acme', 'Build the React design system and component library.')
+    index.add('1_Indeed', old)
+    index.add('1_Indeed', new)
+    assert len(index) == 1
+    assert index.find(old) is None
+    assert index.find(new)[0] == '1_Indeed'
+    buckets = index.conn.execute('SELECT COUNT(*) FROM lsh_buckets').fetchone()[0]
+    assert buckets == len(set(band_keys(new)))
+
+
+def test_same_text_in_another_location_is_not_a_duplicate(index):
+    sig = signature('Senior Data Engineer', 'Acme', DESCRIPTION)
+    index.add('1_Indeed', sig, location=normalize_location('Austin, TX'))
+    assert index.find(sig, location=normalize_location('Denver, CO')) is None
+    assert index.find(sig, location=normalize_location('Austin, TX 78701'))[0] == '1_Indeed'
+
+
+def test_postings_indexed_without_a_location_match_any(index):
+    sig = signature('Senior Data Engineer', 'Acme', DESCRIPTION)
+    index.add('1_Indeed', sig)
+    assert index.find(sig, location='austin tx')[0] == '1_Indeed'
+
+
+def test_normalize_location():
+    assert normalize_location('New York, NY 10001') == normalize_location('new york ny') == 'new york ny'
+    assert normalize_location(None) == ''
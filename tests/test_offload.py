@@ -0,0 +1,21 @@
+from scrapy.utils.test import get_crawler
+
+from scrapy_project import offload
+from scrapy_project.spiders.indeed_spider import IndeedJobsSpider
+
+
+def test_pool_leaves_the_reactor_a_core(monkeypatch):
+    monkeypatch.setattr(offload.os, 'cpu_count', lambda: 4)
+    assert offload.pool_size(8) == 3
+    assert offload.pool_size(2) == 2
+    assert offload.pool_size(0) == 0
+    monkeypatch.setattr(offload.os, 'cpu_count', lambda: 1)
+    assert offload.pool_size(4) == 0
+
+
+def test_single_core_hosts_parse_in_process(monkeypatch):
+    monkeypatch.setattr(offload.os, 'cpu_count', lambda: 1)
+    crawler = get_crawler(IndeedJobsSpider, {'PARSE_WORKERS': 4})
+    spider = IndeedJobsSpider.from_crawler(crawler)
+    assert spider.detail_callback == spider.parse_job_detail
+    assert spider.parse_pool is None
@@ -0,0 +1,55 @@
+import pytest
+from scrapy import Spider
+from scrapy.exceptions import DropItem
+from scrapy.utils.test import get_crawler
+
+from scrapy_project.pipelines import DuplicatesPipeline, NearDuplicatesPipeline
+from scrapy_project.seen_store import release_seen_store
+
+
+@pytest.fixture
+def spider(tmp_path, monkeypatch):
+    # DuplicatesPipeline imports processed_jobs.json from the working directory
+    monkeypatch.chdir(tmp_path)
+    return Spider.from_crawler(get_crawler(Spider), name='test')
+
+
+def posting(**changes):
+    item = {'job_id': 'abc123', 'title': 'Data Engineer', 'company': 'Acme', 'location': 'Remote',
+            'salary': '$120,000 - $150,000 a year', 'job_type': 'Full-time', 'source': 'Indeed',
+            'description': 'Build pipelines.'}
+    item.update(changes)
+    return item
+
+
+def test_duplicates_pipeline_re_emits_only_changed_postings(spider):
+    pipeline = DuplicatesPipeline()
+    pipeline.open_spider(spider)
+    try:
+        assert pipeline.process_item(posting(), spider)['change_type'] == 'new'
+        # Whitespace and quoting are cleaned before fingerprinting
+        with pytest.raises(DropItem):
+            pipeline.process_item(posting(description='  Build   pipelines. '), spider)
+        changed = pipeline.process_item(posting(salary='$130,000 - $160,000 a year'), spider)
+        assert changed['change_type'] == 'changed'
+        assert changed['unique_id'] == 'abc123_Indeed'
+        assert spider.crawler.stats.get_value('seen_store/changed') == 1
+    finally:
+        release_seen_store(pipeline.store)
+
+
+def test_near_duplicates_pipeline_keeps_each_location_of_a_posting(spider, monkeypatch):
+    monkeypatch.setenv('NEAR_DUPLICATE_ACTION', 'drop')
+    pipeline = NearDuplicatesPipeline()
+    pipeline.open_spider(spider)
+    try:
+        description = 'Build and run streaming pipelines on Kafka and Spark, and own our warehouse models. ' * 3
+        for n, location in enumerate(['Austin, TX', 'Denver, CO']):
+            item = pipeline.process_item(posting(unique_id=f'{n}_Indeed', location=location,
+                                                 description=description), spider)
+            assert 'duplicate_of' not in item
+        with pytest.raises(DropItem):
+            pipeline.process_item(posting(unique_id='2_LinkedIn', location='Austin, TX 78701',
+                                          description=description), spider)
+    finally:
+        pipeline.close_spider(spider)
@@ -0,0 +1,76 @@
+import pytest
+
+from scrapy_project.salary import Salary, extract_salary, format_salary, parse_salary
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('$150K - $180K', Salary(150000, 180000, 'USD', 'year')),
+    ('$120-150K a year', Salary(120000, 150000, 'USD', 'year')),
+    ('£45,000 to £55,000 per annum', Salary(45000, 55000, 'GBP', 'year')),
+    ('USD 60-70/hr', Salary(124800, 145600, 'USD', 'hour')),
+    ('$50 - $60 an hour', Salary(104000, 124800, 'USD', 'hour')),
+    ('€4,000 per month', Salary(48000, 48000, 'EUR', 'month')),
+    ('C$95,000 annually', Salary(95000, 95000, 'CAD', 'year')),
+    ('From $85,000 a year', Salary(85000, 85000, 'USD', 'year')),
+])
+def test_parse_salary(text, expected):
+    assert parse_salary(text) == expected
+
+
+def test_missing_period_is_guessed_from_size():
+    assert parse_salary('$45').period == 'hour'
+    assert parse_salary('$95,000').period == 'year'
+
+
+def test_reversed_range_is_sorted():
+    assert parse_salary('$180K - $150K')[:2] == (150000, 180000)
+
+
+def test_non_salary_text():
+    assert parse_salary('') is None
+    assert parse_salary('Competitive pay and benefits') is None
+    assert parse_salary('$0 - $0') is None
+
+
+@pytest.mark.parametrize('text', ['$2.5M', '$1.5M - $2M', '$3 million', 'USD 1.2m ARR'])
+def test_millions_are_not_read_as_part_of_the_figure(text):
+    assert parse_salary(text) is None
+    assert extract_salary(None, f'We raised {text} last year') is None
+
+
+def test_whole_figures_only():
+    assert parse_salary('$95,000.') == Salary(95000, 95000, 'USD', 'year')
+    assert parse_salary('$22.50/hr').min == 46800
+
+
+@pytest.mark.parametrize('text', ['$1,000 signing bonus', '$5,000 - $10,000 relocation allowance',
+                                  '$500 referral bonus', 'Includes $1,500 for equipment'])
+def test_snippet_figures_that_are_not_pay(text):
+    assert parse_salary(text) is None
+
+
+def test_lone_snippet_figure_needs_pay_context():
+    assert parse_salary('Salary: $95,000') == Salary(95000, 95000, 'USD', 'year')
+    assert parse_salary('Up to $140,000').max == 140000
+    assert extract_salary(None, 'Plus a $25,000 signing bonus and $150K base') == Salary(150000, 150000, 'USD', 'year')
+
+
+def test_description_needs_a_figure_that_looks_like_pay():
+    assert extract_salary('', 'We raised $5 million in funding and pay $140K a year') == \
+        Salary(140000, 140000, 'USD', 'year')
+    assert extract_salary(None, 'A $50 gift card for every referral') is None
+    assert extract_salary(None, 'Pay: $30 per hour') == Salary(62400, 62400, 'USD', 'hour')
+
+
+def test_snippet_wins_over_description():
+    assert extract_salary('$100K', 'Up to $200K a year').max == 100000
+
+
+@pytest.mark.parametrize('text, formatted', [
+    ('$50 - $60 an hour', '$50 - $60 an hour'),
+    ('$150K - $180K', '$150,000 - $180,000 a year'),
+    ('£22.50 per hour', '£22.50 an hour'),
+    ('C$95,000 annually', 'CAD 95,000 a year'),
+])
+def test_format_salary_round_trips_the_quoted_period(text, formatted):
+    assert format_salary(parse_salary(text)) == formatted
@@ -0,0 +1,110 @@
+import random
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from scrapy_project.scoring import PriorityScorer, get_scorer
+
+PREFERRED = ['Python', 'Machine Learning', 'AWS', 'Docker', 'TensorFlow']
+OTHER = ['SQL', 'Spark', 'Kafka', 'Airflow', 'Git']
+# Names the old substring checks and the company index both resolve the same way
+COMPANIES = ['Google', 'Microsoft', 'Netflix', 'Stripe', 'Spotify', 'Salesforce', 'Example Corp', '']
+
+
+def old_indeed_score(item):
+    """IndeedJobsSpider.calculate_priority_score before config/scoring.json"""
+    score = 0
+    company = item.get('company', '').lower()
+    if any(c.lower() in company for c in ['Google', 'Apple', 'Microsoft', 'Amazon', 'Meta', 'Netflix']):
+        score += 25
+    elif any(c.lower() in company for c in ['Uber', 'Airbnb', 'Stripe', 'Spotify', 'Twitter', 'Salesforce']):
+        score += 15
+    score += len([k for k in item.get('keywords', []) if k in PREFERRED]) * 3
+    if item.get('remote_friendly'):
+        score += 8
+    if item.get('salary') and item.get('salary').strip():
+        score += 5
+    if item.get('easy_apply_available'):
+        score += 3
+    if item.get('posted_date'):
+        posted = datetime.fromisoformat(item['posted_date'].replace('Z', '+00:00'))
+        if (datetime.now() - posted.replace(tzinfo=None)).days <= 2:
+            score += 5
+    return min(score, 50)
+
+
+def old_linkedin_score(item):
+    """LinkedInJobsSpider.calculate_priority_score before config/scoring.json"""
+    score = 0
+    company = item.get('company', '').lower()
+    if any(c in company for c in ['google', 'apple', 'microsoft', 'amazon', 'meta', 'netflix']):
+        score += 30
+    score += len(item.get('keywords', [])) * 4
+    if item.get('easy_apply_available'):
+        score += 10
+    if item.get('remote_friendly'):
+        score += 8
+    return min(score, 50)
+
+
+def random_items(source, count=300, seed=3):
+    rng = random.Random(seed)
+    items = []
+    for _ in range(count):
+        posted = datetime.now() - timedelta(days=rng.randint(0, 6), hours=rng.randint(0, 23))
+        items.append({
+            'source': source,
+            'company': rng.choice(COMPANIES),
+            'keywords': rng.sample(PREFERRED + OTHER, rng.randint(0, 8)),
+            'remote_friendly': rng.random() < 0.5,
+            'salary': rng.choice(['', '  ', '$120,000 a year']),
+            'easy_apply_available': rng.random() < 0.5,
+            'posted_date': rng.choice(['', posted.isoformat()]),
+        })
+    return items
+
+
+@pytest.fixture(scope='module')
+def scorer():
+    return PriorityScorer.from_config()
+
+
+def test_default_weights_match_the_old_indeed_formula(scorer):
+    items = random_items('Indeed')
+    assert list(scorer.score_many(items)) == [old_indeed_score(item) for item in items]
+
+
+def test_linkedin_weights_match_the_old_linkedin_formula(scorer):
+    items = random_items('LinkedIn')
+    assert list(scorer.score_many(items)) == [old_linkedin_score(item) for item in items]
+
+
+def test_company_career_pages_keep_their_flat_score(scorer):
+    assert scorer.score_item({'source': 'Company Career Page', 'company': 'Example Corp'}) == 20
+
+
+def test_scores_are_capped(scorer):
+    item = {'source': 'LinkedIn', 'company': 'Google', 'keywords': PREFERRED + OTHER,
+            'easy_apply_available': True, 'remote_friendly': True}
+    assert scorer.score_item(item) == 50
+
+
+def test_auto_apply_minimum_is_per_source(scorer):
+    items = [{'source': 'Indeed'}, {'source': 'LinkedIn'}]
+    assert list(scorer.auto_apply_allowed(items, np.array([22, 22]))) == [True, False]
+
+
+def test_backup_file_values_are_understood(scorer):
+    record = {'source': 'Indeed', 'company': 'Example Corp', 'keywords': "['Python', 'AWS']",
+              'remote_friendly': 'True', 'easy_apply_available': float('nan'), 'salary': float('nan')}
+    assert scorer.score_item(record) == 3 * 2 + 8
+
+
+def test_unknown_features_are_rejected():
+    with pytest.raises(ValueError):
+        PriorityScorer({'typo_feature': 1})
+
+
+def test_shared_scorer_is_built_once():
+    assert get_scorer() is get_scorer()
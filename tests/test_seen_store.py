@@ -0,0 +1,314 @@
+import json
+import os
+import threading
+
+import pytest
+
+from scrapy_project import seen_store
+from scrapy_project.seen_store import (LEGACY_V1_RECORD, LOG_HEADER, RECORD, GenerationalSeenStore, SeenIdStore,
+                                       hash_id)
+
+DAY = 86400
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_700_000_000]
+    monkeypatch.setattr(seen_store, '_now', lambda: now[0])
+    return now
+
+
+def test_add_reports_new_ids_once(tmp_path):
+    store = SeenIdStore(str(tmp_path / 'seen'))
+    assert store.add('123_Indeed')
+    assert not store.add('123_Indeed')
+    assert '123_Indeed' in store
+    assert '456_Indeed' not in store
+    assert len(store) == 1
+    store.close()
+
+
+def test_ids_survive_reopen_and_a_lost_index(tmp_path):
+    path = str(tmp_path / 'seen')
+    store = SeenIdStore(path)
+    for i in range(100):
+        store.add(f'{i}_Indeed')
+    store.close()
+
+    store = SeenIdStore(path)
+    assert all(f'{i}_Indeed' in store for i in range(100))
+    store.close()
+
+    os.remove(path + '.idx')
+    store = SeenIdStore(path)
+    assert len(store) == 100
+    assert '99_Indeed' in store
+    store.close()
+
+
+def test_torn_append_is_dropped(tmp_path):
+    path = str(tmp_path / 'seen')
+    store = SeenIdStore(path)
+    store.add('a_Indeed')
+    store.close()
+    with open(path + '.log', 'ab') as f:
+        f.write(b'\x01\x02\x03')
+
+    store = SeenIdStore(path)
+    assert os.path.getsize(path + '.log') == LOG_HEADER.size + RECORD.size
+    assert 'a_Indeed' in store
+    store.close()
+
+
+def test_index_replays_records_it_has_not_seen(tmp_path):
+    path = str(tmp_path / 'seen')
+    store = SeenIdStore(path)
+    store.add('a_Indeed')
+    store.close()
+    # Simulate a crash after the log append but before the index header was written
+    with open(path + '.log', 'ab') as f:
+        f.write(RECORD.pack(hash_id('b_Indeed'), 0, 1, 1))
+
+    store = SeenIdStore(path)
+    assert 'b_Indeed' in store
+    assert len(store) == 2
+    store.close()
+
+
+def test_import_json(tmp_path):
+    legacy = tmp_path / 'processed_jobs.json'
+    legacy.write_text(json.dumps({'job_ids': ['a_Indeed', 'b_Indeed', 'a_Indeed']}))
+    store = SeenIdStore(str(tmp_path / 'seen'))
+    assert store.import_json(str(legacy)) == 2
+    assert 'b_Indeed' in store
+    store.close()
+
+
+def test_table_grows_past_its_initial_capacity(tmp_path, monkeypatch):
+    monkeypatch.setattr(seen_store, 'MIN_CAPACITY', 64)
+    store = SeenIdStore(str(tmp_path / 'seen'))
+    for i in range(5000):
+        store.add(f'{i}_Indeed')
+    store.close()
+
+    store = SeenIdStore(str(tmp_path / 'seen'))
+    assert len(store) == 5000
+    assert store.stats()['load_factor'] < seen_store.MAX_LOAD
+    assert all(f'{i}_Indeed' in store for i in range(5000))
+    store.close()
+
+
+def test_full_table_waits_for_the_background_compactor(tmp_path, monkeypatch):
+    monkeypatch.setattr(seen_store, 'MIN_CAPACITY', 64)
+    store = SeenIdStore(str(tmp_path / 'seen'))
+    for i in range(30):
+        store.add(f'{i}_Indeed')
+
+    # Hold the compactor mid-rebuild while far more IDs than the old table holds arrive
+    proceed = threading.Event()
+    capacity_for = seen_store._capacity_for
+
+    def slow_capacity_for(*args):
+        if threading.current_thread().name == 'seen-store-compactor':
+            proceed.wait(10)
+        return capacity_for(*args)
+
+    monkeypatch.setattr(seen_store, '_capacity_for', slow_capacity_for)
+    store.compact_in_background()
+    writer = threading.Thread(target=lambda: [store.add(f'{i}_Indeed') for i in range(30, 400)], daemon=True)
+    writer.start()
+    writer.join(0.5)
+    assert writer.is_alive()
+    assert store._table.count <= store._table.capacity * seen_store.MAX_LOAD + 1
+    proceed.set()
+    writer.join(10)
+    assert not writer.is_alive()
+    assert len(store) == 400
+    store.close()
+
+
+def test_legacy_v1_log_is_upgraded(tmp_path, clock):
+    path = str(tmp_path / 'seen')
+    with open(path + '.log', 'wb') as f:
+        f.write(b''.join(LEGACY_V1_RECORD.pack(hash_id(f'{i}_Indeed')) for i in range(10)))
+
+    store = SeenIdStore(path)
+    assert len(store) == 10
+    assert store.lookup('3_Indeed').first_seen == clock[0]
+    store.close()
+    with open(path + '.log', 'rb') as f:
+        assert f.read(len(seen_store.LOG_MAGIC)) == seen_store.LOG_MAGIC
+
+
+def test_ids_expire_after_the_ttl(tmp_path, clock):
+    store = SeenIdStore(str(tmp_path / 'seen'), ttl_days=30)
+    store.add('old_Indeed')
+    clock[0] += 20 * DAY
+    store.add('recent_Indeed')
+    clock[0] += 15 * DAY
+    assert 'old_Indeed' not in store
+    assert 'recent_Indeed' in store
+    # A reposted job past the window is new again
+    assert store.add('old_Indeed')
+    store.close()
+
+
+def test_repeat_sightings_extend_the_ttl(tmp_path, clock):
+    store = SeenIdStore(str(tmp_path / 'seen'), ttl_days=30)
+    store.add('listed_Indeed')
+    for _ in range(3):
+        clock[0] += 20 * DAY
+        assert not store.add('listed_Indeed')
+    assert 'listed_Indeed' in store
+    store.close()
+
+
+def test_compaction_evicts_expired_ids(tmp_path, clock):
+    path = str(tmp_path / 'seen')
+    store = SeenIdStore(path, ttl_days=30)
+    for i in range(10):
+        store.add(f'old{i}_Indeed')
+    clock[0] += 40 * DAY
+    store.add('fresh_Indeed')
+    log_before = os.path.getsize(path + '.log')
+
+    assert store.compact() == 10
+    assert len(store) == 1
+    assert os.path.getsize(path + '.log') < log_before
+    store.close()
+
+    store = SeenIdStore(path, ttl_days=30)
+    assert 'fresh_Indeed' in store
+    assert store.stats()['evicted_total'] == 10
+    store.close()
+
+
+def test_generations_promote_and_expire_whole_segments(tmp_path, clock):
+    store = GenerationalSeenStore(str(tmp_path / 'seen'), ttl_days=30, generations=3)
+    store.add('kept_Indeed')
+    store.add('dropped_Indeed')
+    clock[0] += 15 * DAY
+    # Seen again in a new slice: promoted to the hot segment
+    assert not store.add('kept_Indeed')
+    assert store.stats()['generations'] >= 2
+    assert len(store) == 2
+
+    clock[0] += 30 * DAY
+    store.compact()
+    assert 'kept_Indeed' in store
+    assert 'dropped_Indeed' not in store
+    assert store.evicted == 1
+    assert len(store) == 1
+    store.close()
+
+
+def test_generation_size_is_kept_without_rescanning(tmp_path, clock):
+    path = str(tmp_path / 'seen')
+    store = GenerationalSeenStore(path, ttl_days=4, generations=4)
+    for day in range(6):
+        for i in range(day, day + 5):
+            store.add(f'{i}_Indeed')
+        clock[0] += DAY
+        assert len(store) == sum(store._distinct_count(index) for index in range(len(store.segments)))
+    store.compact()
+    assert store.evicted
+    size = len(store)
+    assert size == sum(store._distinct_count(index) for index in range(len(store.segments)))
+    store.close()
+
+    reopened = GenerationalSeenStore(path, ttl_days=4, generations=4)
+    assert len(reopened) == size
+    reopened.close()
+
+
+def test_generation_readers_survive_rotation(tmp_path, clock):
+    store = GenerationalSeenStore(str(tmp_path / 'seen'), ttl_days=1, generations=4)
+    stop = threading.Event()
+    errors = []
+
+    def read():
+        while not stop.is_set():
+            try:
+                store.lookup_many([f'{i}_Indeed' for i in range(20)])
+                len(store)
+            except Exception as e:
+                errors.append(e)
+                return
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for i in range(200):
+        clock[0] += 3 * 3600
+        store.add(f'{i % 20}_Indeed')
+    stop.set()
+    reader.join()
+    assert not errors
+    store.close()
+
+
+@pytest.fixture(params=['mmap', 'sqlite', 'generations'])
+def any_store(request, tmp_path, clock):
+    path = str(tmp_path / 'seen')
+    if request.param == 'sqlite':
+        store = seen_store.SqliteSeenStore(path, ttl_days=30)
+    elif request.param == 'generations':
+        store = GenerationalSeenStore(path, ttl_days=30, generations=3)
+    else:
+        store = SeenIdStore(path, ttl_days=30)
+    yield store
+    store.close()
+
+
+def test_fingerprint_tells_changed_postings_from_repeats(any_store, clock):
+    assert any_store.observe('a_Indeed', 111) == seen_store.NEW
+    assert any_store.observe('a_Indeed', 111) == seen_store.UNCHANGED
+    assert any_store.observe('a_Indeed', 222) == seen_store.CHANGED
+    assert any_store.observe('a_Indeed', 222) == seen_store.UNCHANGED
+    seen = any_store.lookup('a_Indeed')
+    assert seen.fingerprint == 222 and seen.first_seen == clock[0]
+
+
+def test_ids_without_a_fingerprint_adopt_the_first_one(any_store):
+    any_store.add('a_Indeed')
+    assert any_store.observe('a_Indeed', 111) == seen_store.UNCHANGED
+    assert any_store.observe('a_Indeed', 222) == seen_store.CHANGED
+
+
+def test_touch_many_refreshes_only_live_ids(any_store, clock):
+    any_store.observe('listed_Indeed', 111)
+    any_store.observe('gone_Indeed', 111)
+    first = clock[0]
+    for _ in range(3):
+        clock[0] += 20 * DAY
+        any_store.touch_many(['listed_Indeed', 'unknown_Indeed'])
+    seen = any_store.lookup('listed_Indeed')
+    assert seen == seen_store.Sighting(111, first, clock[0])
+    assert any_store.lookup('gone_Indeed') is None
+    assert any_store.lookup('unknown_Indeed') is None
+
+
+def test_is_empty(any_store):
+    assert any_store.is_empty()
+    any_store.add('1_Indeed')
+    assert not any_store.is_empty()
+
+
+def test_content_fingerprint_keeps_fields_apart():
+    fingerprint = seen_store.content_fingerprint
+    assert fingerprint(['Data Engineer', 'Acme']) == fingerprint(['Data Engineer', 'Acme'])
+    assert fingerprint(['Data Engineer', 'Acme']) != fingerprint(['Acme', 'Data Engineer'])
+    assert fingerprint(['ab', 'c']) != fingerprint(['a', 'bc'])
+    assert fingerprint([None, '']) == fingerprint(['', None])
+
+
+def test_legacy_v2_log_is_upgraded(tmp_path):
+    path = str(tmp_path / 'seen')
+    with open(path + '.log', 'wb') as f:
+        f.write(LOG_HEADER.pack(seen_store.LEGACY_V2_MAGIC))
+        f.write(seen_store.LEGACY_V2_RECORD.pack(hash_id('a_Indeed'), 100, 200))
+
+    store = SeenIdStore(path)
+    assert store.lookup('a_Indeed') == seen_store.Sighting(0, 100, 200)
+    # The first fingerprint seen after the upgrade is adopted
+    assert store.observe('a_Indeed', 111) == seen_store.UNCHANGED
+    store.close()
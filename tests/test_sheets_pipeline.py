@@ -0,0 +1,112 @@
+import threading
+
+from scrapy import Spider
+from scrapy.utils.test import get_crawler
+from twisted.internet import defer, reactor, task, threads
+from twisted.trial import unittest
+
+from scrapy_project.pipelines import GoogleSheetsPipeline
+from scrapy_project.sheets_sync import MeteredWriter, SheetsWriter, _on_reactor_thread
+
+
+def job(n):
+    return {'unique_id': f'{n}_Indeed', 'title': f'Job {n}', 'source': 'Indeed'}
+
+
+class BlockingSheetsPipeline(GoogleSheetsPipeline):
+    """Pipeline whose Sheets push waits until the test lets it go"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.sheet_id = 'sheet'
+        self.release_push = threading.Event()
+        self.push_threads = []
+        self.active = 0
+        self.max_active = 0
+        self.calls_per_push = 0
+
+    def save_to_google_sheets(self, spider):
+        self.push_threads.append(threading.get_ident())
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        self.release_push.wait(5)
+        for _ in range(self.calls_per_push):
+            self.writer.call(lambda: None)
+        self.active -= 1
+        return True, None
+
+
+class GoogleSheetsPipelineTest(unittest.TestCase):
+    def setUp(self):
+        self.spider = Spider.from_crawler(get_crawler(Spider), name='test')
+        self.pipeline = BlockingSheetsPipeline(buffer_rows=2)
+        self.pipeline.open_spider(self.spider)
+        self.pipeline.client = object()
+
+    def tearDown(self):
+        self.pipeline.release_push.set()
+        if not self.pipeline.wal._file.closed:
+            return self.pipeline.close_spider(self.spider)
+
+    @defer.inlineCallbacks
+    def test_flush_runs_off_the_reactor_and_holds_its_item(self):
+        pipeline = self.pipeline
+        assert pipeline.process_item(job(1), self.spider) == job(1)
+        d = pipeline.process_item(job(2), self.spider)
+        assert isinstance(d, defer.Deferred)
+        done = []
+        d.addCallback(lambda item: done.append(item) or item)
+        # The reactor keeps going: later items are accepted while the push is stuck
+        assert pipeline.process_item(job(3), self.spider) == job(3)
+        assert done == []
+
+        pipeline.release_push.set()
+        item = yield d
+        assert item == job(2)
+        assert pipeline.push_threads[0] != threading.get_ident()
+        # Only the items the flush covered leave the log
+        assert pipeline.wal.pending() == [job(3)]
+        assert pipeline.buffered == 1
+        assert self.spider.crawler.stats.get_value('sheets/flush_count') == 1
+
+    @defer.inlineCallbacks
+    def test_flushes_run_one_at_a_time(self):
+        pipeline = self.pipeline
+        held = [pipeline.process_item(job(n), self.spider) for n in range(6)]
+        held = [d for d in held if isinstance(d, defer.Deferred)]
+        assert len(held) == 3
+        pipeline.release_push.set()
+        yield defer.gatherResults(held)
+        assert pipeline.max_active == 1
+        assert pipeline.wal.pending() == []
+
+    @defer.inlineCallbacks
+    def test_close_delivers_the_rest(self):
+        pipeline = self.pipeline
+        pipeline.process_item(job(1), self.spider)
+        pipeline.release_push.set()
+        yield pipeline.close_spider(self.spider)
+        assert pipeline.push_threads
+        assert pipeline.buffered == 0
+        assert pipeline.wal.size == 0
+
+    @defer.inlineCallbacks
+    def test_writer_knows_when_it_would_block_the_reactor(self):
+        assert (yield task.deferLater(reactor, 0, _on_reactor_thread))
+        assert not (yield threads.deferToThread(_on_reactor_thread))
+
+    @defer.inlineCallbacks
+    def test_api_stats_count_only_this_spiders_requests(self):
+        shared = SheetsWriter(requests_per_minute=6000)
+        pipeline = self.pipeline
+        pipeline.writer = MeteredWriter(shared)
+        pipeline.calls_per_push = 2
+        pipeline.release_push.set()
+        # Another spider's pipeline drawing on the same budget
+        yield threads.deferToThread(MeteredWriter(shared).call, lambda: None)
+        for n in range(4):
+            yield defer.maybeDeferred(pipeline.process_item, job(n), self.spider)
+        stats = self.spider.crawler.stats
+        assert stats.get_value('sheets/api_requests') == 4
+        assert stats.get_value('sheets/api_retries') == 0
+        assert shared.requests == 5
@@ -0,0 +1,324 @@
+import threading
+import time
+
+import gspread
+import pytest
+
+from scrapy_project.job_store import JobStore
+from scrapy_project.sheets_sync import (WORKSHEET_NAME, MeteredWriter, SheetsSync, SheetsWriter, TokenBucket,
+                                        changed_ranges, open_worksheet, sheet_row)
+from scripts.fake_sheets_server import fake_client, start_server
+
+
+@pytest.fixture
+def server():
+    server = start_server(window=1.0)
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs.db'))
+    yield store
+    store.close()
+
+
+def add_jobs(store, count):
+    for i in range(count):
+        store.add({'unique_id': f'job-{i}', 'title': f'Data Engineer {i}', 'source': 'Indeed',
+                   'application_status': 'Not Applied', 'scraped_date': '2026-01-01T00:00:00'})
+    store.flush()
+
+
+def sheet_rows(server, spreadsheet_id='test'):
+    return server.spreadsheets[spreadsheet_id].sheets[WORKSHEET_NAME]['rows']
+
+
+def quota(server, requests):
+    """Start a fresh quota window of requests per second"""
+    server.request_times.clear()
+    server.quota = requests
+
+
+def fail_writes_after(server, allowed, status=503):
+    """Answer every write after the first allowed ones with status"""
+    admit = server.admit
+    writes = []
+
+    def failing_admit(write):
+        if write:
+            writes.append(write)
+            if len(writes) > allowed:
+                return status
+        return admit(write)
+    server.admit = failing_admit
+    return admit
+
+
+def test_token_bucket_allows_a_burst_then_the_rate():
+    now = [0.0]
+    slept = []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(60, burst=2, clock=lambda: now[0], sleep=sleep)
+    waits = [bucket.acquire() for _ in range(4)]
+    assert waits == [0.0, 0.0, 1.0, 1.0]
+    now[0] += 5
+    assert bucket.acquire() == 0.0
+    assert slept == [1.0, 1.0]
+
+
+def test_token_bucket_is_shared_fairly_between_threads():
+    bucket = TokenBucket(600, burst=1)
+    started = time.monotonic()
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # One token up front, then one every 0.1s however the threads interleave
+    assert time.monotonic() - started >= 0.45
+
+
+def test_budget_keeps_under_the_server_quota(server):
+    worksheet = fake_client(server.url).open_by_key('test').sheet1
+    quota(server, 6)
+    writer = SheetsWriter(requests_per_minute=240, max_retries=0, burst=1)
+    for _ in range(9):
+        writer.call(worksheet.row_values, 1)
+    assert server.counts['throttled'] == 0
+    assert writer.throttled_seconds >= 1.9
+
+
+def test_quota_errors_are_retried(server):
+    worksheet = fake_client(server.url).open_by_key('test').sheet1
+    quota(server, 1)
+    waits = []
+
+    def sleep(seconds):
+        waits.append(seconds)
+        server.request_times.clear()
+
+    writer = SheetsWriter(requests_per_minute=6000, backoff=0.5, max_backoff=0.8, sleep=sleep)
+    writer.call(worksheet.update, 'A1', [['ok']])
+    writer.call(worksheet.update, 'A2', [['ok']])
+    server.quota = 0
+    assert worksheet.col_values(1) == ['ok', 'ok']
+    assert server.counts['throttled'] >= 1
+    assert writer.retries == len(waits) >= 1
+    assert all(0 <= wait <= 0.8 for wait in waits)
+
+
+def test_server_errors_are_retried_until_they_clear(server):
+    worksheet = fake_client(server.url).open_by_key('test').sheet1
+    admit = fail_writes_after(server, 0, status=500)
+
+    def sleep(seconds):
+        server.admit = admit
+
+    writer = SheetsWriter(requests_per_minute=6000, sleep=sleep)
+    writer.call(worksheet.update, 'A1', [['ok']])
+    assert writer.requests == 2 and writer.retries == 1
+
+
+def test_writer_gives_up_after_max_retries(server):
+    worksheet = fake_client(server.url).open_by_key('test').sheet1
+    fail_writes_after(server, 0)
+    writer = SheetsWriter(requests_per_minute=6000, max_retries=2, sleep=lambda seconds: None)
+    with pytest.raises(gspread.exceptions.APIError):
+        writer.call(worksheet.update, 'A1', [['lost']])
+    assert writer.requests == 3 and writer.retries == 2
+
+
+def test_metered_writers_count_their_own_calls(server):
+    worksheet = fake_client(server.url).open_by_key('test').sheet1
+    shared = SheetsWriter(requests_per_minute=6000, sleep=lambda seconds: None)
+    first, second = MeteredWriter(shared), MeteredWriter(shared)
+    first.call(worksheet.update, 'A1', [['a']])
+    fail_writes_after(server, 0)
+    with pytest.raises(gspread.exceptions.APIError):
+        second.call(worksheet.update, 'A2', [['b']])
+    assert (first.requests, first.retries) == (1, 0)
+    assert (second.requests, second.retries) == (6, 5)
+    assert (shared.requests, shared.retries) == (7, 5)
+
+
+def test_client_errors_are_not_retried(server):
+    writer = SheetsWriter(requests_per_minute=6000, sleep=lambda seconds: None)
+    client = fake_client(server.url)
+    with pytest.raises(gspread.exceptions.APIError):
+        writer.call(client.request, 'get', 'https://sheets.googleapis.com/v4/unknown')
+    assert writer.requests == 1 and writer.retries == 0
+
+
+def test_failed_chunk_stays_unsynced_for_the_next_push(server, store):
+    add_jobs(store, 5)
+    writer = SheetsWriter(requests_per_minute=6000, max_retries=1, sleep=lambda seconds: None)
+    worksheet = open_worksheet(fake_client(server.url), 'test', writer)
+    sync = SheetsSync(store, worksheet, chunk_rows=2, writer=writer)
+
+    admit = fail_writes_after(server, 1)
+    with pytest.raises(gspread.exceptions.APIError):
+        sync.push()
+    assert sync.rows_appended == 2
+    assert len(store.unsynced()) == 3
+    assert [row[-1] for row in sheet_rows(server)[1:]] == ['job-0', 'job-1']
+
+    server.admit = admit
+    assert sync.push() == 3
+    assert store.unsynced() == []
+    assert [row[-1] for row in sheet_rows(server)[1:]] == [f'job-{i}' for i in range(5)]
+    assert [r['sheet_row'] for r in store.query(order_by='unique_id')] == [2, 3, 4, 5, 6]
+
+
+def lose_replies(server, count):
+    """Apply the next count writes but answer them with a 503"""
+    lost = []
+
+    def lose_reply(write):
+        if write and len(lost) < count:
+            lost.append(write)
+            return True
+        return False
+    server.lose_reply = lose_reply
+
+
+def test_retried_append_does_not_duplicate_rows_that_landed(server, store):
+    add_jobs(store, 3)
+    writer = SheetsWriter(requests_per_minute=6000, sleep=lambda seconds: None)
+    sync = SheetsSync(store, open_worksheet(fake_client(server.url), 'test', writer), writer=writer)
+    lose_replies(server, 1)
+    assert sync.push() == 3
+    assert writer.retries == 1
+    assert [row[-1] for row in sheet_rows(server)[1:]] == ['job-0', 'job-1', 'job-2']
+    assert store.unsynced() == []
+    assert [r['sheet_row'] for r in store.query(order_by='unique_id')] == [2, 3, 4]
+
+
+def test_retry_resends_only_rows_that_did_not_land(server, store):
+    add_jobs(store, 4)
+    writer = SheetsWriter(requests_per_minute=6000, sleep=lambda seconds: None)
+    worksheet = open_worksheet(fake_client(server.url), 'test', writer)
+    worksheet.append_rows([sheet_row(store.unsynced()[0])])
+    sync = SheetsSync(store, worksheet, writer=writer)
+    # job-0 is already on the sheet when the first attempt fails
+    admit = fail_writes_after(server, 0)
+    writer.sleep = lambda seconds: setattr(server, 'admit', admit)
+    assert sync.push() == 4
+    assert [row[-1] for row in sheet_rows(server)[1:]] == ['job-0', 'job-1', 'job-2', 'job-3']
+    assert [r['sheet_row'] for r in store.query(order_by='unique_id')] == [2, 3, 4, 5]
+
+
+def test_writer_refuses_to_block_the_reactor(monkeypatch):
+    monkeypatch.setattr('scrapy_project.sheets_sync._on_reactor_thread', lambda: True)
+    with pytest.raises(RuntimeError):
+        SheetsWriter().call(lambda: None)
+
+
+def test_changed_ranges_cover_runs_of_changed_cells():
+    assert changed_ranges(7, ['a', 'b', 'c', 'd'], ['a', 'x', 'y', 'd']) == [{'range': 'B7:C7', 'values': [['x', 'y']]}]
+    assert changed_ranges(7, ['a', 'b', 'c'], ['x', 'b', 'y']) == [{'range': 'A7:A7', 'values': [['x']]},
+                                                                   {'range': 'C7:C7', 'values': [['y']]}]
+    assert changed_ranges(7, ['a', 'b'], ['a', 'b']) == []
+
+
+def test_changed_ranges_without_old_values_rewrite_the_row():
+    assert changed_ranges(3, None, ['a', 'b']) == [{'range': 'A3:B3', 'values': [['a', 'b']]}]
+    # Rows written before a column was added get the new cells
+    assert changed_ranges(3, ['a'], ['a', 'b']) == [{'range': 'B3:B3', 'values': [['b']]}]
+
+
+def test_changed_ranges_use_multi_letter_columns():
+    old = ['x'] * 28
+    new = old[:26] + ['y', 'y']
+    assert changed_ranges(2, old, new) == [{'range': 'AA2:AB2', 'values': [['y', 'y']]}]
+
+
+def test_write_during_a_push_stays_unsynced(store):
+    add_jobs(store, 1)
+    record = store.unsynced()[0]
+    # The job is re-scraped after the push read it but before it was marked
+    add_jobs(store, 1)
+    store.mark_synced([(record['unique_id'], 2, sheet_row(record), record['updated_at'])])
+    again = store.unsynced()
+    assert [r['unique_id'] for r in again] == ['job-0']
+    assert again[0]['sheet_row'] == 2
+
+
+def test_changed_job_is_updated_in_place(server, store):
+    add_jobs(store, 2)
+    writer = SheetsWriter(requests_per_minute=6000)
+    sync = SheetsSync(store, open_worksheet(fake_client(server.url), 'test', writer), writer=writer)
+    sync.push()
+    store.update_status('job-1', 'Applied', notes='Phone screen booked')
+    assert sync.push() == 1
+    assert sync.rows_appended == 2 and sync.rows_updated == 1
+    rows = sheet_rows(server)
+    assert len(rows) == 3
+    assert rows[2][2] == 'Applied' and rows[2][-1] == 'job-1'
+
+
+class NoRangeWorksheet:
+    """Worksheet whose append responses say nothing about where the rows went"""
+
+    def __init__(self, worksheet):
+        self.worksheet = worksheet
+
+    def append_rows(self, values):
+        self.worksheet.append_rows(values)
+        return {}
+
+    def __getattr__(self, name):
+        return getattr(self.worksheet, name)
+
+
+def test_append_without_a_range_reads_rows_back(server, store, caplog):
+    add_jobs(store, 3)
+    writer = SheetsWriter(requests_per_minute=6000)
+    worksheet = NoRangeWorksheet(open_worksheet(fake_client(server.url), 'test', writer))
+    sync = SheetsSync(store, worksheet, writer=writer)
+    with caplog.at_level('WARNING'):
+        sync.push()
+    assert 'no usable updatedRange' in caplog.text
+    assert [r['sheet_row'] for r in store.query(order_by='unique_id')] == [2, 3, 4]
+
+    # A later change updates the row instead of appending a duplicate
+    store.update_status('job-0', 'Applied')
+    sync.push()
+    assert len(sheet_rows(server)) == 4
+    assert sheet_rows(server)[1][2] == 'Applied'
+
+
+class VanishingWorksheet(NoRangeWorksheet):
+    """Worksheet whose appends report success but never reach the sheet"""
+
+    def __init__(self, worksheet):
+        super().__init__(worksheet)
+        self.appends = 0
+
+    def append_rows(self, values):
+        self.appends += 1
+        return {}
+
+
+def test_push_stops_when_appended_jobs_never_show_up(server, store, caplog):
+    add_jobs(store, 3)
+    writer = SheetsWriter(requests_per_minute=6000)
+    worksheet = VanishingWorksheet(open_worksheet(fake_client(server.url), 'test', writer))
+    sync = SheetsSync(store, worksheet, chunk_rows=2, writer=writer)
+    with caplog.at_level('WARNING'):
+        assert sync.push() == 2
+    assert 'did not show up on the sheet' in caplog.text
+    assert worksheet.appends == 1
+    assert sync.rows_appended == 0
+    assert len(store.unsynced()) == 3
+
+
+def test_first_row_parses_the_append_range():
+    assert SheetsSync.first_row({'updates': {'updatedRange': "'Job Pipeline'!A12:Z14"}}) == 12
+    assert SheetsSync.first_row({'updates': {}}) is None
+    assert SheetsSync.first_row(None) is None